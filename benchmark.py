@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+'''
+Runs the Lox programs in "test/benchmark" against one or more execution engines and reports
+how long each one took. Every benchmark prints the elapsed "clock()" time as its very last line
+of output, which is what we measure (so scanning/parsing/resolving isn't counted). With "--memory"
+the peak memory of each run (as reported by "Lox.py --memory-stats") is compared instead.
+
+Usage:
+    python benchmark.py [--engine ENGINE ...] [--runs N] [--timeout SECONDS] [--memory] [benchmark ...]
+
+A benchmark is either a name from "test/benchmark" (e.g. "fib") or a path to any Lox program
+that follows the same convention. With no benchmarks given, all of "test/benchmark" is run.
+The first engine is the baseline that the others are compared against.
+
+With "--startup" no benchmark is run. Instead every engine runs an empty Lox file (with the cache of
+resolved programs turned off) to time how long PyLox takes to start up before it could run a first
+statement, and "python -X importtime" tells how much of that went into importing which modules.
+
+With "--scan" the engines don't matter either: the programs in "test/benchmark" are repeated into a
+source of "--size" MB and every scanner in "pylox/Lox.py" scans it in a process of its own, reporting MB/s,
+how long it took to get the first token (reading the file included) and the peak memory. "mmap" is the
+BytesScanner on the memory-mapped file that "Lox.py --mmap" uses.
+
+With "--ast" nothing runs either: "test/limit/loop_too_large.lox" and the programs in "test/benchmark"
+repeated into "--lines" lines are parsed and resolved, and the size of their AST is reported -> the # of
+nodes, the bytes a node takes on average and all of them together. A node's size is what "tracemalloc"
+sees a thousand new nodes of its class allocate (the node and wherever its attributes are kept, but not
+the tokens, lists... they point to).
+'''
+
+import argparse
+from os import listdir
+from os.path import dirname, isfile, join, realpath, splitext
+import re
+from subprocess import PIPE, Popen, TimeoutExpired
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_DIR = dirname(realpath(__file__))
+BENCHMARK_DIR = join(REPO_DIR, "test", "benchmark")
+IMPORT_TIME = re.compile(r"import time:\s*(\d+) \|\s*\d+ \| (\s*)(\S+)")
+
+def benchmark_path(name):
+    if isfile(name):
+        return name
+    return join(BENCHMARK_DIR, name + ".lox")
+
+def run_benchmark(path, options, timeout, memory=False):
+    '''
+    Returns the elapsed time the Lox program reported (or its peak memory in
+    MB) or None if it failed or didn't finish within the timeout
+    '''
+    if memory:
+        options = options + ["--memory-stats"]
+    args = [sys.executable, join(REPO_DIR, "Lox.py")] + options + [path]
+    proc = Popen(args, stdout=PIPE, stderr=PIPE, cwd=REPO_DIR)
+    try:
+        out, err = proc.communicate(timeout=timeout)
+    except TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        return None
+    if memory:
+        match = re.search(r"peak memory: (\d+) KB", err.decode("utf-8"))
+        return int(match.group(1)) / 1024 if match else None
+    lines = out.decode("utf-8").strip().split("\n")
+    try:
+        return float(lines[-1])
+    except ValueError:
+        return None
+
+def run_startup(path, options, timeout, importtime=False):
+    '''
+    Returns the wall time of running the (empty) Lox program or None if it failed. 
+    With "importtime", returns how many seconds each module took to import instead
+    '''
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + [join(REPO_DIR, "Lox.py")] + options + ["--no-cache", path]
+    start = time.perf_counter()
+    proc = Popen(args, stdout=PIPE, stderr=PIPE, cwd=REPO_DIR)
+    try:
+        out, err = proc.communicate(timeout=timeout)
+    except TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        return None
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        return None
+    if not importtime:
+        return elapsed
+    imports = {}
+    for line in err.decode("utf-8").split("\n"):
+        match = IMPORT_TIME.match(line)
+        if match:
+            imports[match.group(3)] = int(match.group(1)) / 1e6     ## its own time, without what it imported
+    return imports
+
+def startup(engines, runs, timeout, slowest=10):
+    with tempfile.TemporaryDirectory() as directory:
+        path = join(directory, "empty.lox")
+        open(path, "w").close()
+        rows = {"startup": [], "imports": [], "pylox imports": []}
+        slowest_imports = None
+        for engine in engines:
+            options = ["--engine=" + engine]
+            times = [run_startup(path, options, timeout) for _ in range(runs)]
+            times = [elapsed for elapsed in times if elapsed is not None]
+            imports = run_startup(path, options, timeout, importtime=True)
+            rows["startup"].append(min(times) if times else None)
+            rows["imports"].append(sum(imports.values()) if imports else None)
+            rows["pylox imports"].append(sum(seconds for name, seconds in imports.items() if name.startswith("pylox")) if imports else None)
+            if slowest_imports is None and imports:
+                slowest_imports = sorted(imports.items(), key=lambda item: -item[1])[:slowest]
+    print("{:<24}".format("time to first statement") + "".join("{:>14}".format(engine) for engine in engines))
+    for name, results in rows.items():
+        print("{:<24}".format(name) + "".join("{:>14}".format("failed" if result is None else "{:.3f}s".format(result)) for result in results))
+    if slowest_imports:
+        print("\nslowest imports ({}):".format(engines[0]))
+        for name, seconds in slowest_imports:
+            print("{:<38}{:>8.1f}ms".format(name, seconds * 1000))
+
+## scans the file argv[2] with the scanner argv[1] ("mmap" maps it for the BytesScanner, the others read it
+## into a str like a run does), in a process of its own so the peak memory is the scanner's. Prints the seconds
+## to the first token and to the last one, the # of tokens and the peak memory in KB
+SCAN = """
+import sys, time, resource
+sys.path.insert(0, sys.argv[3])
+from pylox.Lox import SCANNERS, load
+from pylox.BytesScanner import BytesScanner, map_file
+start = time.perf_counter()
+if sys.argv[1] == "mmap":
+    tokens = BytesScanner(map_file(open(sys.argv[2], "rb"))).stream()
+else:
+    tokens = load(SCANNERS, sys.argv[1])(open(sys.argv[2]).read()).stream()
+next(tokens)
+first = time.perf_counter() - start
+count = 1 + sum(1 for _ in tokens)
+print(first, time.perf_counter() - start, count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def scan(runs, size):
+    sys.path.insert(0, REPO_DIR)
+    from pylox.Lox import SCANNERS
+    programs = "".join(open(join(BENCHMARK_DIR, name)).read() for name in sorted(listdir(BENCHMARK_DIR)) if name.endswith(".lox"))
+    source = programs * max(1, int(size * 1e6 / len(programs)))
+    megabytes = len(source.encode("utf-8")) / 1e6
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = join(directory, "scan.lox")
+        with open(path, "w") as f:
+            f.write(source)
+        for name in list(SCANNERS) + ["mmap"]:
+            measures = []
+            for _ in range(runs):
+                proc = Popen([sys.executable, "-c", SCAN, name, path, REPO_DIR], stdout=PIPE)
+                out, _ = proc.communicate()
+                first, total, tokens, peak = out.split()
+                measures.append((float(total), float(first), int(peak) / 1024, int(tokens)))
+            results[name] = [min(measure[index] for measure in measures) for index in range(4)]
+    reference = results["char"][0]      ## the original, character at a time, Scanner
+    print("{:<24}{:>14}{:>14}{:>14}{:>14}{:>14}".format("scanner ({:.1f} MB)".format(megabytes), "seconds", "MB/s",
+            "first token", "peak memory", "tokens"))
+    for name, (best, first, peak, tokens) in results.items():
+        print("{:<24}{:>14}{:>14}{:>14}{:>14}{:>14}".format(name, "{:.3f}s".format(best),
+                "{:.2f} {:.1f}x".format(megabytes / best, reference / best), "{:.3f}s".format(first),
+                "{:.1f}MB".format(peak), tokens))
+
+def ast_nodes(statements):
+    '''
+    Every Expr/Stmt node of a resolved program once (a counted loop's increment is 
+    also kept in its For_Statement) 
+    '''
+    from pylox.Expr import Expr
+    from pylox.Stmt import Stmt
+    seen = set()
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, (Expr, Stmt)) and id(node) not in seen:
+            seen.add(id(node))
+            yield node
+            stack.extend(getattr(node, name) for cls in type(node).__mro__ for name in getattr(cls, "__slots__", ()))
+
+def node_size(cls, count=1000):
+    '''
+    Bytes allocated per node of class "cls", with every constructor argument None 
+    '''
+    arguments = [None] * (cls.__init__.__code__.co_argcount - 1)
+    nodes = [None] * count
+    tracemalloc.start()
+    for index in range(count):
+        nodes[index] = cls(*arguments)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / count
+
+def ast(lines):
+    sys.path.insert(0, REPO_DIR)
+    from pylox import ASTCache
+    programs = "".join(open(join(BENCHMARK_DIR, name)).read() for name in sorted(listdir(BENCHMARK_DIR)) if name.endswith(".lox"))
+    sources = {
+        "loop_too_large": open(join(REPO_DIR, "test", "limit", "loop_too_large.lox")).read(),
+        "benchmarks": programs * max(1, -(-lines // programs.count("\n"))),
+    }
+    print("{:<24}{:>14}{:>14}{:>14}{:>14}".format("program", "lines", "nodes", "bytes/node", "all nodes"))
+    sizes = {}
+    for name, source in sources.items():
+        nodes = list(ast_nodes(ASTCache.resolve(source)))
+        size = 0
+        for node in nodes:
+            cls = type(node)
+            if cls not in sizes:
+                sizes[cls] = node_size(cls)
+            size += sizes[cls]
+        print("{:<24}{:>14}{:>14}{:>14}{:>14}".format(name, source.count("\n"), len(nodes),
+                "{:.1f}".format(size / len(nodes)), "{:.1f}MB".format(size / 1e6)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the Lox benchmark programs.")
+    parser.add_argument("benchmarks", nargs="*")
+    parser.add_argument("--engine", action="append", dest="engines",
+            help="engine to benchmark, may be repeated (default: tree, closure, vm and python)")
+    parser.add_argument("--runs", type=int, default=3, help="runs per benchmark, the best one is reported")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds before a single run is abandoned")
+    parser.add_argument("--memory", action="store_true", help="compare peak memory instead of time")
+    parser.add_argument("--startup", action="store_true", help="time starting up on an empty file and its imports instead")
+    parser.add_argument("--scan", action="store_true", help="time the scanners on a large generated source instead")
+    parser.add_argument("--size", type=float, default=4, help="MB of source to scan with --scan (default: 4)")
+    parser.add_argument("--ast", action="store_true", help="report the size of the AST of a few programs instead")
+    parser.add_argument("--lines", type=int, default=100000, help="lines of the generated program for --ast (default: 100000)")
+    args = parser.parse_args()
+
+    engines = args.engines or ["tree", "closure", "vm", "python"]
+    if args.startup:
+        return startup(engines, args.runs, args.timeout)
+    if args.scan:
+        return scan(args.runs, args.size)
+    if args.ast:
+        return ast(args.lines)
+    benchmarks = args.benchmarks or sorted(splitext(name)[0] for name in listdir(BENCHMARK_DIR) if name.endswith(".lox"))
+
+    unit = "MB" if args.memory else "s"
+    print("{:<24}".format("benchmark") + "".join("{:>14}".format(engine) for engine in engines))
+    for name in benchmarks:
+        path = benchmark_path(name)
+        results = []
+        for engine in engines:
+            times = [run_benchmark(path, ["--engine=" + engine], args.timeout, args.memory) for _ in range(args.runs)]
+            times = [time for time in times if time is not None]
+            results.append(min(times) if times else None)
+
+        row = "{:<24}".format(splitext(name.split("/")[-1])[0])
+        baseline = results[0]
+        for index, result in enumerate(results):
+            if result is None:
+                cell = "failed"
+            elif index == 0 or not baseline:
+                cell = "{:.3f}{}".format(result, unit)
+            else:
+                cell = "{:.3f}{} {:.1f}x".format(result, unit, baseline / result)
+            row += "{:>14}".format(cell)
+        print(row)
+
+if __name__ == "__main__":
+    main()
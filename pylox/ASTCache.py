@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+
+'''
+An on-disk cache of parsed and resolved programs, much like Python's own "__pycache__".
+
+Scanning, parsing and resolving a script is most of what a short run of "python Lox.py [script]" does
+before the program itself starts. So once a script has been resolved without errors, its tree of Stmt/Expr
+nodes (along with everything the Resolver wrote on them: the (depth, slot) of locals, scope sizes, tail
+calls, counted loops...) is pickled into "__loxcache__/<name>.loxc" next to the script. The next run that
+finds an entry for the exact same source loads the tree from it and goes straight to running it.
+
+Every entry starts with a header and a MAC:
+
+    b"LOXC" | version (16 bytes) | hash of the source (16 bytes) | MAC (32 bytes) | pickled statements
+
+The version is a hash of this cache's format, of the Python version (the pickle holds Python ints, floats
+and strings) and of the source of every module that decides what the resolved tree looks like (Scanner,
+Parser, Resolver, the AST nodes...). An entry whose version or source hash doesn't match is stale: the
+script is resolved again and the entry rewritten, so neither editing a script nor changing the front end
+ever needs the cache to be cleared by hand. Scripts with errors are never cached, so their errors are
+reported on every run.
+
+Unpickling runs whatever code the pickle asks for, and "__loxcache__" sits next to scripts that may live
+in a shared or downloaded directory. So the MAC is a keyed hash of the header and the pickle, keyed by a
+random secret only the user can read ("~/.cache/pylox/key", created on first use), and an entry is only
+unpickled once its MAC checks out. An entry someone else wrote (or one written by another user) is
+treated like a stale one, and without a usable secret nothing is read from or written to the cache.
+
+"python Lox.py compile <dir>" warms the cache for every script under a directory, resolving them in
+parallel, and "--no-cache" runs a script without reading or writing an entry.
+'''
+
+import sys
+import os
+import pickle
+import hashlib
+import hmac
+from . import Lox
+
+CACHE_DIR = "__loxcache__"
+SUFFIX = ".loxc"
+MAGIC = b"LOXC"
+FORMAT = 2              ## bump when the layout of an entry changes
+HASH_SIZE = 16
+MAC_SIZE = 32
+KEY_SIZE = 32
+## the modules that decide what a resolved tree looks like. A run that finds its entry 
+## never imports the Scanner, the Parser or the Resolver, so they're hashed from their files 
+FRONT_END = ("Scanner", "RegexScanner", "BytesScanner", "Token", "TokenBuffer", "TokenType", "Expr", "Stmt", "Parser", "Resolver")
+
+_version = None
+_secret = None
+
+def version():
+    '''
+    Hash of everything besides the script itself that the cached tree depends on
+    '''
+    global _version
+    if _version is None:
+        digest = hashlib.blake2b(digest_size=HASH_SIZE)
+        digest.update(f"{FORMAT} {sys.version_info[0]}.{sys.version_info[1]}".encode())
+        for module in FRONT_END:
+            with open(os.path.join(os.path.dirname(__file__), module + ".py"), "rb") as f:
+                digest.update(f.read())
+        _version = digest.digest()
+    return _version
+
+def source_hash(source):
+    '''
+    "source" is the script's str or its bytes (e.g. mapped with "--mmap"), which hash the same
+    '''
+    data = source.encode() if isinstance(source, str) else source
+    return hashlib.blake2b(data, digest_size=HASH_SIZE).digest()
+
+def key_path():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pylox", "key")
+
+def read_secret(path: str):
+    '''
+    The key in "path" or None if it's missing or anyone but its owner could read or replace it
+    '''
+    try:
+        with open(path, "rb") as f:
+            status = os.fstat(f.fileno())
+            key = f.read()
+    except OSError:
+        return None
+    if hasattr(os, "getuid") and (status.st_uid != os.getuid() or status.st_mode & 0o077):
+        return None
+    return key if len(key) == KEY_SIZE else None
+
+def secret():
+    '''
+    The per-user key entries are signed with, created the first time it's needed.
+    None if it can't be read or created, which turns the cache off
+    '''
+    global _secret
+    if _secret is None:
+        path = key_path()
+        key = read_secret(path)
+        if key is None and not os.path.exists(path):
+            try:
+                os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+                ## written in full before it's linked in place, so a concurrent run 
+                ## (e.g. another "compile" worker) never reads half a key
+                temporary = f"{path}.{os.getpid()}.tmp"
+                fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(os.urandom(KEY_SIZE))
+                    os.link(temporary, path)           ## fails if another run got there first
+                except FileExistsError:
+                    pass
+                finally:
+                    os.unlink(temporary)
+            except OSError:
+                return None
+            key = read_secret(path)
+        _secret = key
+    return _secret
+
+def sign(key: bytes, head: bytes, pickled):
+    mac = hashlib.blake2b(head, key=key, digest_size=MAC_SIZE)
+    mac.update(pickled)
+    return mac.digest()
+
+def cache_path(path: str):
+    '''
+    "dir/script.lox" -> "dir/__loxcache__/script.loxc"
+    '''
+    directory, name = os.path.split(path)
+    return os.path.join(directory, CACHE_DIR, os.path.splitext(name)[0] + SUFFIX)
+
+def header(source: str):
+    return MAGIC + version() + source_hash(source)
+
+def load(path: str, source: str):
+    '''
+    The cached statements of the script or None if there's no up to date entry
+    signed with this user's key
+    '''
+    key = secret()
+    if key is None:
+        return None
+    try:
+        with open(cache_path(path), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    expected = header(source)
+    if not data.startswith(expected):
+        return None                     ## stale
+    data = memoryview(data)
+    mac, pickled = data[len(expected):len(expected) + MAC_SIZE], data[len(expected) + MAC_SIZE:]
+    if not hmac.compare_digest(mac, sign(key, expected, pickled)):
+        return None                     ## not written by this user, never unpickled
+    try:
+        return pickle.loads(pickled)
+    except Exception:
+        return None                     ## truncated or otherwise unreadable, treat it like a stale one
+
+def store(path: str, source: str, statements):
+    '''
+    Writes the entry of a freshly resolved script. Failing to (e.g. in a read-only
+    directory, on a tree too deep to pickle or without a key) only means the next run resolves it again
+    '''
+    key = secret()
+    if key is None:
+        return False
+    target = cache_path(path)
+    try:
+        expected = header(source)
+        pickled = pickle.dumps(statements, protocol=pickle.HIGHEST_PROTOCOL)
+        data = expected + sign(key, expected, pickled) + pickled
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        ## written to a temporary file first so a concurrent run never reads half an entry
+        temporary = f"{target}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, target)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+    except (OSError, RecursionError, pickle.PicklingError):
+        return False
+    return True
+
+def resolve(source: str, interpreter=None, scanner=None):
+    '''
+    Scans (with the RegexScanner unless another "scanner" class is given, e.g. the
+    BytesScanner for a mapped script), parses and resolves a script. Returns its
+    statements or None if any of those reported an error
+    '''
+    from .RegexScanner import RegexScanner
+    from .Parser import Parser
+    from .Resolver import Resolver
+    Lox.Lox.had_error = False
+    tokens = (scanner or RegexScanner)(source).stream()      ## parsed as they're scanned
+    statements = Parser(tokens).parse()
+    if Lox.Lox.had_error:
+        return None
+    Resolver(interpreter).resolve(statements)
+    if Lox.Lox.had_error:
+        return None
+    return statements
+
+def compile_file(path: str):
+    '''
+    Brings the entry of one script up to date. Returns "cached" if it already
+    was, "compiled", "error" if the script doesn't resolve or "failed" if
+    its entry couldn't be written
+    '''
+    with open(path, "r") as f:
+        source = f.read()
+    if load(path, source) is not None:
+        return "cached"
+    try:
+        statements = resolve(source)
+    except Exception as e:              ## one script crashing the front end shouldn't stop the others
+        print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+        return "error"
+    if statements is None:
+        return "error"
+    return "compiled" if store(path, source, statements) else "failed"
+
+def scripts(directory: str):
+    for root, directories, files in os.walk(directory):
+        directories[:] = sorted(d for d in directories if d != CACHE_DIR)
+        for name in sorted(files):
+            if name.endswith(".lox"):
+                yield os.path.join(root, name)
+
+def compile_directory(directory: str, jobs=None):
+    '''
+    Warms the cache for every ".lox" script under "directory", "jobs" at a time
+    (default: one per CPU). Returns how many scripts ended up in each state
+    '''
+    paths = list(scripts(directory))
+    counts = {"compiled": 0, "cached": 0, "error": 0, "failed": 0}
+    if jobs == 1 or len(paths) < 2:
+        results = [compile_file(path) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor      ## only "compile" needs it, see "Lox.py" 
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(compile_file, paths, chunksize=8))
+    for path, result in zip(paths, results):
+        counts[result] += 1
+        if result in ("error", "failed"):
+            print(f"{path}: {'not cached, it has errors' if result == 'error' else 'could not write its cache entry'}",
+                    file=sys.stderr)
+    return counts
@@ -1,11 +1,8 @@
 #!/usr/bin/env python
 
-import sys 
-sys.path.insert(1, "tool/") 
-sys.path.insert(1, "../scanner") 
-import Expr 
-from Token import Token 
-from TokenType import TokenType 
+from . import Expr 
+from .Token import Token 
+from .TokenType import TokenType 
 
 '''
 
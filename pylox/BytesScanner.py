@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+
+'''
+A Scanner for "python Lox.py --mmap [script]" that scans the raw bytes of a memory-mapped script instead
+of a str, and produces the same Tokens and errors as the other two.
+
+Reading a script the usual way copies the whole file into memory and decodes all of it into a str before
+the first token can be scanned, and the RegexScanner's "findall" then turns that entire source into lexeme
+strs in one go. Here the file is mapped into memory instead, so the OS only pages it in as it's read and
+nothing gets copied or decoded up front. It's scanned a window of WINDOW bytes (rounded up to a whole line)
+at a time: the first tokens come out right away and only one window's lexemes are around at any point.
+
+A window that's plain ASCII with "\\n" line breaks, which machine-generated scripts are all the way through,
+is matched as bytes with the RegexScanner's own regex and only the parts that end up in Tokens become strs:
+
+    operators       -> their str comes from a table
+    identifiers     -> decoded once per distinct name, later ones are looked up along with their type
+    numbers         -> "int()"/"float()" take the bytes as they are, only the lexeme gets decoded
+    strings         -> decoded like the rest of them
+
+Any other window (e.g. one with a non-ASCII identifier, a UTF-8 string or "\\r\\n"s) is decoded the way
+reading a text file would have and handed over to the RegexScanner, which knows all of Unicode's letters
+and digits. A string that's still open at the end of a window makes the next window start at its opening
+quote and go on past its closing one.
+'''
+
+import mmap
+import os
+import re
+import sys
+from .Token import Token
+from .TokenType import TokenType, RESERVED_KEYWORD_TOKENS
+from . import RegexScanner
+from . import Lox
+
+## bytes of the script scanned at a time (rounded up to a whole line)
+WINDOW = 1 << 16
+
+## the same lexemes as the RegexScanner's, only as bytes (so ASCII-only)
+MASTER = re.compile(RegexScanner.MASTER.pattern.encode(), re.VERBOSE)
+
+## operator -> (its type, its lexeme)
+OPERATORS = {lexeme.encode(): (token_type, lexeme) for lexeme, token_type in RegexScanner.OPERATORS.items()}
+
+## what kind of lexeme one starting with a given byte is, see "RegexScanner.py"
+SKIP, NUMBER, IDENTIFIER, STRING, OTHER = range(5)
+KINDS = [OTHER] * 128
+for c in b"_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ":
+    KINDS[c] = IDENTIFIER
+for c in b"0123456789":
+    KINDS[c] = NUMBER
+KINDS[ord("\n")] = KINDS[ord("/")] = SKIP
+KINDS[ord('"')] = STRING
+
+def map_file(f):
+    '''
+    The contents of the file "f" (opened in binary mode) mapped into memory, read-only.
+    An empty file can't be mapped so it's just b""
+    '''
+    if os.fstat(f.fileno()).st_size == 0:
+        return b""
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def decode(data: bytes):
+    '''
+    "data" as reading it from a text file would have given it -> "\\r\\n" and "\\r" are line breaks too
+    '''
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+class BytesScanner:
+
+    def __init__(self, source):
+        self.source = source            ## bytes, or an mmap of the script
+        self.tokens = []
+        self.line = 1
+        self.names = {}                 ## identifier -> (its type, its interned str)
+        self.text = RegexScanner.RegexScanner("")       ## scans the windows that aren't plain ASCII
+
+    def scan_tokens(self):
+        self.tokens = list(self.stream())
+        return self.tokens
+
+    def stream(self):
+        """
+        Yields the tokens one at a time as they're scanned, the EOF token last
+        """
+        source = self.source
+        size = len(source)
+        start = 0
+        reach = 0                       ## where the window has to go on to at least
+        while start < size:
+            end = source.find(b"\n", max(start + WINDOW, reach))
+            end = size if end == -1 else end + 1
+            window = source[start:end]
+            if window.isascii() and b"\r" not in window:
+                opened = yield from self.scan(window)
+            else:
+                opened = yield from self.scan_text(decode(window))
+            if not opened:
+                start = end
+                continue
+            quote = start + window.rindex(b'"')     ## no closing quote, so it's the last one in the window
+            reach = source.find(b'"', quote + 1)
+            if reach == -1:
+                self.line += decode(source[quote:]).count("\n")
+                Lox.Lox.error(self.line, "Unterminated string.")
+                break
+            start = quote               ## scanned again from the string on, up to past its closing quote
+        yield Token(TokenType.EOF, "", self.line)
+
+    def scan(self, window: bytes):
+        """
+        Yields the tokens of an ASCII window. Returns True if it ends inside a string
+        """
+        operators = OPERATORS
+        kinds = KINDS
+        names = self.names
+        keywords = RESERVED_KEYWORD_TOKENS
+        intern = sys.intern
+        line = self.line
+        for lexeme in MASTER.findall(window):
+            operator = operators.get(lexeme)
+            if operator is not None:
+                yield Token(operator[0], operator[1], line)
+                continue
+            kind = kinds[lexeme[0]]
+            if kind == IDENTIFIER:
+                name = names.get(lexeme)
+                if name is None:
+                    text = intern(lexeme.decode("ascii"))
+                    name = names[lexeme] = (keywords.get(text, TokenType.IDENTIFIER), text)
+                yield Token(name[0], name[1], line)
+            elif kind == SKIP:
+                line += lexeme.count(b"\n")
+            elif kind == NUMBER:
+                yield Token(TokenType.NUMBER, lexeme.decode("ascii"), line, float(lexeme) if b"." in lexeme else int(lexeme))
+            elif kind == STRING:
+                if len(lexeme) == 1:
+                    self.line = line
+                    return True
+                line += lexeme.count(b"\n")
+                text = lexeme.decode("ascii")
+                yield Token(TokenType.STRING, text, line, intern(text[1:-1]))
+            else:
+                Lox.Lox.error(line, "Unexpected character")
+        self.line = line
+        return False
+
+    def scan_text(self, window: str):
+        """
+        Same as "scan" for a window that had to be decoded, with the RegexScanner
+        """
+        scanner = self.text
+        scanner.line = self.line
+        yield from scanner.scan_chunk(window)
+        self.line = scanner.line
+        return bool(scanner.pending)
@@ -0,0 +1,247 @@
+
+'''
+There is a separation of concerns by moving the function call into a separate file instead of 
+having it with the rest of the front-end code with Interpreter.py. 
+
+LoxCallable -> an interface making sure our native functions and function objects implement 
+a call method and an arity method to check if # of parameters match # of arguments. 
+
+NativeClock -> an example of a native, or built-in, function that the user can use in Lox. 
+Native functions are written in the implementation language (Pyton) and are used in the target
+language itself (Lox). This is a simple native function to calculate time elapsed. 
+
+LoxFunction -> The real gist behind intepreting a Function AST class. In our Interpreter file,
+we wrap the environment and overall stmt given in the Stmt.Function_Statement AST class into an
+instance of LoxFunction within the "visit_Function_Statement" function. The same function also 
+defines it in the current environment so when we see it later being called, we can use LoxFunction
+class method "call()" to represent a function call. 
+
+'''
+
+from abc import ABC, abstractmethod 
+import time 
+from .Environment import Environment 
+
+class TailCall:
+    '''
+    What a "return f(...)" completes with instead of "(value,)" when f is a 
+    LoxFunction: the function and the Environment already set up for its call. 
+    The LoxFunction running the return calls it in its own loop (see "run") 
+    so tail recursion doesn't nest any deeper 
+    '''
+    __slots__ = ("function", "environment") 
+
+    def __init__(self, function, environment):
+        self.function = function 
+        self.environment = environment 
+
+class LoxCallable(ABC):
+    
+    @abstractmethod
+    def call(self, interpreter, arguments):
+        pass 
+
+    @abstractmethod 
+    def arity(self): 
+        pass 
+
+class NativeClock(LoxCallable):
+
+    def arity(self):
+        return 0 
+
+    def call(self, interpreter, arguments):
+        return time.perf_counter()      ## seconds, like jlox's currentTimeMillis() / 1000.0 
+
+    def __repr__(self):
+        return "<native fn>"
+
+    def __call__(self):
+        pass 
+
+class LoxFunction(LoxCallable): 
+
+    def __init__(self, closure, declaration, is_initializer, this=None):
+        '''
+        Args 
+            Closure -> is the enclosing environment.
+            In most cases, this will be the self.globals
+            from the Interpreter instance. But if we have
+            nested functions, the enclosing environment will
+            be the outer function's environment. 
+
+            Declaration -> The Stmt.Function_Statement itself
+            with its name, parameters, and body. 
+
+            This -> the instance a method was bound to. None 
+            for functions and for the methods stored in a class 
+        '''
+        self.closure = closure    
+        self.declaration = declaration 
+        self.is_initializer = is_initializer 
+        self.this = this 
+
+    def call(self, interpreter, arguments):
+        '''
+        Each function call gets its own environment instance.
+        This is how we can enable recursion with multiple call
+        stacks. And no matter how deep we go into a recursion or
+        a general nested function, we have to get out somehow so
+        when the body completes with a return we hand back its value 
+        '''
+        return self.run(interpreter, self.frame(self.this, arguments)) 
+
+    def call_bound(self, interpreter, instance, arguments):
+        '''
+        Calls a method on "instance". A method's own Environment keeps "this" 
+        in slot 0 (followed by the parameters) so calling one doesn't need 
+        a bound LoxFunction or an extra Environment just for "this" 
+        '''
+        return self.run(interpreter, self.frame(instance, arguments)) 
+
+    def frame(self, this, arguments):
+        '''
+        The Environment of a call, "this" (if any) in slot 0 followed by the arguments 
+        '''
+        environment = Environment(self.closure, self.declaration.scope_size)  ## self.closure is the enclosing environment for this new instance
+        if this is None:
+            environment.values[:len(arguments)] = arguments     ## parameters take up the first slots
+        else:
+            values = environment.values 
+            values[0] = this 
+            values[1:len(arguments) + 1] = arguments 
+        return environment 
+
+    def run(self, interpreter, environment):
+        '''
+        Runs the body. A body that completes with a tail call hands us the next 
+        function and its Environment, which we run in its place instead of 
+        calling it, so the returning call's Python frames are reused and its 
+        Environment can be freed straight away 
+        '''
+        function = self 
+        while True:
+            completion = interpreter.execute_block(function.declaration.body, environment) 
+            if function.is_initializer: return environment.values[0] 
+            if completion is None: return None 
+            if type(completion) is not TailCall: 
+                return completion[0] 
+            function, environment = completion.function, completion.environment 
+    
+    def bind(self, instance):
+        '''
+        Only needed when a method is used as a value (e.g. "var m = obj.method;") 
+        '''
+        return LoxFunction(self.closure, self.declaration, self.is_initializer, instance)  
+
+    def arity(self):
+        return len(self.declaration.params) 
+
+    def __repr__(self):
+        return f"<fn {self.declaration.name.lexeme}>" 
+
+    def __call__(self):
+        '''
+        Must be callable otherwise check for callability in Interpreter's
+        "visit_Call" will fail. 
+        '''
+        pass 
+
+class Shape:
+    '''
+    A "hidden class" describing which fields an instance has and at which index of 
+    its values list each one is. Instances that got the same fields in the same order 
+    (e.g. everything made by the same "init") share one Shape instead of each carrying 
+    its own dict. Adding a field moves an instance to the next Shape, which is 
+    remembered in "transitions" so the next instance takes the same path 
+    '''
+    __slots__ = ("indexes", "transitions") 
+
+    def __init__(self, indexes: dict):
+        self.indexes = indexes 
+        self.transitions = {} 
+
+    def add(self, name: str):
+        shape = self.transitions.get(name) 
+        if shape is None:
+            shape = self.transitions[name] = Shape({**self.indexes, name: len(self.indexes)}) 
+        return shape 
+
+class LoxClass(LoxCallable):
+
+    def __init__(self, name: str, superclass, methods: dict):
+        '''
+        Classes can't change once they're created so we copy the superclass's 
+        methods down into our own table (ours override theirs). Finding a method 
+        is then one lookup however deep the inheritance goes 
+        '''
+        self.name = name 
+        self.superclass = superclass 
+        self.methods = {**superclass.methods, **methods} if superclass else methods 
+        self.shape = Shape({})     ## the shape of its instances before they have any fields 
+
+    def find_method(self, name: str):
+        return self.methods.get(name) 
+
+    def call(self, interpreter, arguments: list):
+        instance = LoxInstance(self) 
+        initializer = self.find_method("init") 
+        if initializer:
+            initializer.call_bound(interpreter, instance, arguments) 
+        return instance 
+
+    def arity(self):
+        initializer = self.find_method("init")
+        if not initializer: return 0 
+        return initializer.arity() 
+
+    def __call__(self):
+        pass 
+
+    def __repr__(self):
+        return self.name
+
+class LoxInstance:
+    '''
+    Will store our Class's fields/attributes. We will 
+    also call the LoxClass's methods here even though they're
+    stored in the Class itself. The field values are kept in 
+    a list, in the order its Shape gives them 
+    '''
+    __slots__ = ("klass", "shape", "values") 
+
+    def __init__(self, klass: LoxClass):
+        self.klass = klass 
+        self.shape = klass.shape 
+        self.values = [] 
+
+    def get(self, name):
+        index = self.shape.indexes.get(name.lexeme) 
+        if index is not None:
+            return self.values[index] 
+        method = self.klass.find_method(name.lexeme) 
+        if method:
+            return method.bind(self) 
+        message = "Undefined property '" + name.lexeme + "'." 
+        raise RuntimeError(name, message)
+
+    def set(self, name, value):
+        self.set_field(name.lexeme, value) 
+
+    def set_field(self, name: str, value):
+        index = self.shape.indexes.get(name) 
+        if index is None:
+            self.shape = self.shape.add(name) 
+            self.values.append(value) 
+        else:
+            self.values[index] = value 
+
+    def __repr__(self):
+        return f"{self.klass.name} instance" 
+
+if __name__ == "__main__":
+    d = {} 
+    d[1] = NativeClock() 
+    print(d[1].call("interp", [])) 
+    n = NativeClock()
+    print(n)
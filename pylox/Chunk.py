@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+'''
+The bytecode format shared by "Compiler.py" and "VM.py". This follows the second half of
+"Crafting Interpreters" (clox) closely: a Chunk is a flat sequence of one-byte opcodes, each
+followed by zero or more one-byte operands, plus a pool of constants that the CONSTANT,
+CLOSURE and name-carrying instructions index into.
+
+    code      -> bytearray of opcodes and operands
+    lines     -> array of source lines, one entry per byte of code (used for runtime errors)
+    constants -> the constant pool (numbers, strings, names and compiled functions)
+
+Jump and loop instructions carry a 16-bit, big-endian operand, so a jump can't skip over more
+than 65535 bytes and an operand index (constant, local slot, upvalue) can't go past 255. Those
+are the limits that the "test/limit" tests check for.
+
+The opcodes are plain module-level ints rather than an Enum since the VM compares against them
+for every single instruction it executes.
+'''
+
+from array import array
+
+OP_CONSTANT = 0
+OP_NIL = 1
+OP_TRUE = 2
+OP_FALSE = 3
+OP_POP = 4
+OP_GET_LOCAL = 5
+OP_SET_LOCAL = 6
+OP_GET_GLOBAL = 7
+OP_DEFINE_GLOBAL = 8
+OP_SET_GLOBAL = 9
+OP_GET_UPVALUE = 10
+OP_SET_UPVALUE = 11
+OP_GET_PROPERTY = 12
+OP_SET_PROPERTY = 13
+OP_GET_SUPER = 14
+OP_EQUAL = 15
+OP_GREATER = 16
+OP_LESS = 17
+OP_ADD = 18
+OP_SUBTRACT = 19
+OP_MULTIPLY = 20
+OP_DIVIDE = 21
+OP_NOT = 22
+OP_NEGATE = 23
+OP_PRINT = 24
+OP_JUMP = 25
+OP_JUMP_IF_FALSE = 26
+OP_LOOP = 27
+OP_CALL = 28
+OP_INVOKE = 29
+OP_SUPER_INVOKE = 30
+OP_CLOSURE = 31
+OP_CLOSE_UPVALUE = 32
+OP_RETURN = 33
+OP_CLASS = 34
+OP_INHERIT = 35
+OP_METHOD = 36
+
+OPCODE_NAMES = {value: name for name, value in globals().items() if name.startswith("OP_")}
+
+UINT8_COUNT = 256       ## max number of constants per chunk, locals and upvalues per function
+UINT16_MAX = 65535      ## max distance of a jump or loop
+
+class Chunk:
+
+    def __init__(self):
+        self.code = bytearray()
+        self.lines = array("I")
+        self.constants = []
+
+    def write(self, byte: int, line: int):
+        self.code.append(byte)
+        self.lines.append(line)
+
+    def add_constant(self, value):
+        '''
+        Constants are never de-duplicated (just like clox) so
+        every literal in the source takes up its own slot
+        '''
+        self.constants.append(value)
+        return len(self.constants) - 1
+
+    def disassemble(self, name: str):
+        '''
+        Human readable listing of the chunk, handy when debugging the compiler
+        '''
+        lines = [f"== {name} =="]
+        offset = 0
+        while offset < len(self.code):
+            op = self.code[offset]
+            op_name = OPCODE_NAMES.get(op, f"UNKNOWN {op}")
+            text = f"{offset:04d} {self.lines[offset]:4d} {op_name}"
+            if op in (OP_JUMP, OP_JUMP_IF_FALSE, OP_LOOP):
+                jump = (self.code[offset + 1] << 8) | self.code[offset + 2]
+                target = offset + 3 + (-jump if op == OP_LOOP else jump)
+                text += f" -> {target}"
+                offset += 3
+            elif op in (OP_INVOKE, OP_SUPER_INVOKE):
+                text += f" {self.constants[self.code[offset + 1]]!r} ({self.code[offset + 2]} args)"
+                offset += 3
+            elif op == OP_CLOSURE:
+                function = self.constants[self.code[offset + 1]]
+                text += f" {function!r}"
+                offset += 2 + 2 * function.upvalue_count
+            elif op in (OP_CONSTANT, OP_GET_GLOBAL, OP_DEFINE_GLOBAL, OP_SET_GLOBAL, OP_GET_PROPERTY,
+                    OP_SET_PROPERTY, OP_GET_SUPER, OP_CLASS, OP_METHOD):
+                text += f" {self.constants[self.code[offset + 1]]!r}"
+                offset += 2
+            elif op in (OP_GET_LOCAL, OP_SET_LOCAL, OP_GET_UPVALUE, OP_SET_UPVALUE, OP_CALL):
+                text += f" {self.code[offset + 1]}"
+                offset += 2
+            else:
+                offset += 1
+            lines.append(text)
+        return "\n".join(lines)
+
+class VMFunction:
+    '''
+    What the Compiler produces for every function declaration (and for the top-level
+    script): its bytecode plus what the VM needs to know to call it. At runtime it's
+    always wrapped in a closure that carries the captured upvalues.
+    '''
+
+    def __init__(self, name=None):
+        self.name = name
+        self.arity = 0
+        self.upvalue_count = 0
+        self.chunk = Chunk()
+
+    def __repr__(self):
+        if self.name is None:
+            return "<script>"
+        return f"<fn {self.name}>"
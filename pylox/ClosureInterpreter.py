@@ -0,0 +1,543 @@
+#!/usr/bin/env python
+
+'''
+An alternative execution engine to the visitor-based Interpreter.
+
+The tree-walking Interpreter pays for double dispatch on every single node every time it
+runs: "expr.accept(self)" -> "visit_*" -> an isinstance assert -> a chain of token type checks.
+The ClosureCompiler below instead walks the resolved Stmt/Expr tree exactly ONCE and turns
+every node into a small, specialized Python closure. Executing the program is then just
+calling these closures with the current Environment.
+
+    Expressions -> compiled into "fn(env) -> value"
+    Statements  -> compiled into "fn(env) -> None" when they complete normally. A statement
+                   that executes a Lox "return" hands back a 1-tuple "(value,)" instead so that
+                   enclosing blocks/loops can pass it along without raising an exception.
+
+All the decisions that the Interpreter makes again and again at runtime (which operator is
+this? how many environment hops away is this variable? how many arguments does this call have?)
+are made here at compile time and baked into the closure that gets returned.
+
+The ClosureInterpreter is a drop-in replacement for the Interpreter as far as "Lox.py" and the
+Resolver are concerned and it shares the Interpreter's value semantics (truthiness, equality,
+arithmetic and error messages). Select it with "python Lox.py --engine=closure [script]".
+'''
+
+from . import Lox
+from .TokenType import TokenType
+from . import Expr
+from . import Stmt
+from .Environment import Environment
+from .Interpreter import Interpreter
+from .Callable import LoxFunction, LoxClass, LoxInstance
+
+_RETURN_NIL = (None,)    ## completion of a bare "return;" statement
+
+class ClosureFunction(LoxFunction):
+    '''
+    A LoxFunction whose body has already been compiled into a list of statement closures.
+    The LoxClass/LoxInstance runtime classes only ever rely on "call", "bind" and "arity"
+    so classes and instances are shared with the tree-walking Interpreter.
+    '''
+
+    def __init__(self, closure, declaration, is_initializer, body, this=None):
+        super().__init__(closure, declaration, is_initializer, this)
+        self.body = body
+        self.params = [param.lexeme for param in declaration.params]
+        self.padding = [None] * (declaration.scope_size - declaration.first_param - len(declaration.params))     ## slots of the body's locals
+
+    def call(self, interpreter, arguments):
+        if self.this is not None:
+            return self.run([self.this] + arguments + self.padding)
+        return self.run(arguments + self.padding)     ## parameters take up the first slots
+
+    def call_bound(self, interpreter, instance, arguments):
+        '''
+        Same as "bind(instance).call(...)" but without allocating
+        the intermediate bound ClosureFunction
+        '''
+        return self.run([instance] + arguments + self.padding)
+
+    def run(self, values):
+        environment = Environment(self.closure)
+        environment.values = values
+        for statement in self.body:
+            completion = statement(environment)
+            if completion is not None:
+                if self.is_initializer: return values[0]
+                return completion[0]
+        if self.is_initializer: return values[0]
+
+    def bind(self, instance):
+        return ClosureFunction(self.closure, self.declaration, self.is_initializer, self.body, instance)
+
+class ClosureInterpreter(Interpreter):
+    '''
+    Keeps the Interpreter's globals, resolved local scopes and runtime helpers but
+    executes compiled closures instead of visiting the AST.
+    '''
+
+    def interpret(self, statements):
+        try:
+            program = ClosureCompiler(self).compile_statements(statements)
+            for statement in program:
+                statement(self.globals)
+        except RecursionError as e:
+            Lox.Lox.runtime_error((self.innermost_call(e), "Stack overflow."))
+        except RuntimeError as e:
+            Lox.Lox.runtime_error(e.args)
+
+class ClosureCompiler:
+    '''
+    A visitor whose "visit_*" methods return closures instead of values.
+    '''
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def compile(self, node):
+        return node.accept(self)
+
+    def compile_statements(self, statements):
+        return [self.compile(statement) for statement in statements]
+
+    def key(self, stmt, name):
+        '''
+        What a declaration is stored under in "env.values": its slot for
+        a local or its name in the globals' dictionary
+        '''
+        return name.lexeme if stmt.slot is None else stmt.slot
+
+    def variable_getter(self, name, distance, slot):
+        '''
+        Specialize the environment walk on the resolved distance so the
+        common cases (locals and enclosing function's locals) need no loop
+        '''
+        lexeme = name.lexeme
+        if distance is None:
+            global_values = self.interpreter.globals.values
+            def get_global(env):
+                try:
+                    return global_values[lexeme]
+                except KeyError:
+                    raise RuntimeError(name, f"Undefined variable '{lexeme}'.")
+            return get_global
+        if distance == 0:
+            return lambda env: env.values[slot]
+        if distance == 1:
+            return lambda env: env.enclosing.values[slot]
+        if distance == 2:
+            return lambda env: env.enclosing.enclosing.values[slot]
+        return lambda env: env.ancestor(distance).values[slot]
+
+    # STATEMENTS
+
+    def visit_Block(self, stmt):
+        statements = self.compile_statements(stmt.statements)
+        size = stmt.scope_size
+        def block(env):
+            inner = Environment(env, size)
+            for statement in statements:
+                completion = statement(inner)
+                if completion is not None:
+                    return completion
+        return block
+
+    def visit_Class_Statement(self, stmt):
+        name = stmt.name.lexeme
+        key = self.key(stmt, stmt.name)
+        superclass_getter = self.compile(stmt.superclass) if stmt.superclass else None
+        methods = [(method.name.lexeme, method, self.compile_statements(method.body)) for method in stmt.methods]
+        def class_statement(env):
+            superclass = None
+            if superclass_getter:
+                superclass = superclass_getter(env)
+                if not isinstance(superclass, LoxClass):
+                    raise RuntimeError(stmt.superclass.name, "Superclass must be a class.")
+            env.values[key] = None
+            method_env = env
+            if superclass:
+                method_env = Environment(env)
+                method_env.values = [superclass]
+            functions = {}
+            for method_name, declaration, body in methods:
+                functions[method_name] = ClosureFunction(method_env, declaration, method_name == "init", body)
+            env.values[key] = LoxClass(name, superclass, functions)
+        return class_statement
+
+    def visit_Function_Statement(self, stmt):
+        key = self.key(stmt, stmt.name)
+        body = self.compile_statements(stmt.body)
+        def function_statement(env):
+            env.values[key] = ClosureFunction(env, stmt, False, body)
+        return function_statement
+
+    def visit_Return_Statement(self, stmt):
+        if not stmt.value:
+            return lambda env: _RETURN_NIL
+        value = self.compile(stmt.value)
+        return lambda env: (value(env),)
+
+    def visit_If_Statement(self, stmt):
+        condition = self.compile(stmt.condition)
+        then_branch = self.compile(stmt.then_branch)
+        if stmt.else_branch:
+            else_branch = self.compile(stmt.else_branch)
+            def if_else(env):
+                value = condition(env)
+                if value is None or value is False:
+                    return else_branch(env)
+                return then_branch(env)
+            return if_else
+        def if_then(env):
+            value = condition(env)
+            if value is not None and value is not False:
+                return then_branch(env)
+        return if_then
+
+    def visit_While_Statement(self, stmt):
+        condition = self.compile(stmt.condition)
+        body = self.compile(stmt.body)
+        def while_statement(env):
+            while True:
+                value = condition(env)
+                if value is None or value is False:
+                    return
+                completion = body(env)
+                if completion is not None:
+                    return completion
+        return while_statement
+
+    def visit_Expression_Statement(self, stmt):
+        expression = self.compile(stmt.expression)
+        def expression_statement(env):
+            expression(env)     ## discard the value so it can't be mistaken for a "return"
+        return expression_statement
+
+    def visit_Print_Statement(self, stmt):
+        expression = self.compile(stmt.expression)
+        def print_statement(env):
+            print(str(expression(env)))
+        return print_statement
+
+    def visit_Var_Statement(self, stmt):
+        key = self.key(stmt, stmt.name)
+        if not stmt.initializer:
+            def declare(env):
+                env.values[key] = None
+            return declare
+        initializer = self.compile(stmt.initializer)
+        def define(env):
+            env.values[key] = initializer(env)
+        return define
+
+    # EXPRESSIONS
+
+    def visit_Literal(self, expr):
+        value = expr.value
+        return lambda env: value
+
+    def visit_Grouping(self, expr):
+        return self.compile(expr.expression)    ## parentheses only matter to the Parser
+
+    def visit_Variable(self, expr):
+        return self.variable_getter(expr.name, expr.depth, expr.slot)
+
+    def visit_This(self, expr):
+        return self.variable_getter(expr.keyword, expr.depth, expr.slot)
+
+    def visit_Assign(self, expr):
+        name = expr.name
+        lexeme = name.lexeme
+        value = self.compile(expr.value)
+        distance = expr.depth
+        slot = expr.slot
+        if distance is None:
+            global_values = self.interpreter.globals.values
+            def assign_global(env):
+                result = value(env)
+                if lexeme not in global_values:
+                    raise RuntimeError(name, f"Undefined variable '{lexeme}'.")
+                global_values[lexeme] = result
+                return result
+            return assign_global
+        if distance == 0:
+            def assign_local(env):
+                result = env.values[slot] = value(env)
+                return result
+            return assign_local
+        def assign_at(env):
+            result = env.ancestor(distance).values[slot] = value(env)
+            return result
+        return assign_at
+
+    def visit_Logical(self, expr):
+        left = self.compile(expr.left)
+        right = self.compile(expr.right)
+        if expr.operator.token_type == TokenType.OR:
+            def or_op(env):
+                value = left(env)
+                if value is not None and value is not False:
+                    return value
+                return right(env)
+            return or_op
+        def and_op(env):
+            value = left(env)
+            if value is None or value is False:
+                return value
+            return right(env)
+        return and_op
+
+    def visit_Unary(self, expr):
+        interpreter = self.interpreter
+        operator = expr.operator
+        right = self.compile(expr.right)
+        if operator.token_type == TokenType.BANG:
+            def not_op(env):
+                value = right(env)
+                return value is None or value is False
+            return not_op
+        def negate(env):
+            value = right(env)
+            if type(value) is int:
+                return -value
+            interpreter.check_number_operand(operator, value)
+            if interpreter.is_int(value):
+                return -(int(value))
+            return -(float(value))
+        return negate
+
+    def visit_Binary(self, expr):
+        '''
+        Every operator gets its own closure with an int/int (or str/str) fast path.
+        Anything else falls back to the Interpreter's own helpers so both engines agree
+        on mixed int/float results and on the runtime error messages.
+        '''
+        interpreter = self.interpreter
+        operator = expr.operator
+        token_type = operator.token_type
+        left = self.compile(expr.left)
+        right = self.compile(expr.right)
+
+        if token_type == TokenType.PLUS:
+            def add(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is int and type(b) is int: return a + b
+                if isinstance(a, str) and isinstance(b, str): return a + b
+                result = interpreter.perform_operation("+", a, b)
+                if result is not False:
+                    return result
+                raise RuntimeError(operator, "Operands must be two numbers or two strings.")
+            return add
+        if token_type == TokenType.MINUS:
+            def subtract(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is int and type(b) is int: return a - b
+                interpreter.check_number_operands(operator, a, b)
+                return interpreter.perform_operation("-", a, b)
+            return subtract
+        if token_type == TokenType.STAR:
+            def multiply(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is int and type(b) is int: return a * b
+                interpreter.check_number_operands(operator, a, b)
+                return interpreter.perform_operation("*", a, b)
+            return multiply
+        if token_type == TokenType.SLASH:
+            def divide(env):
+                a = left(env)
+                b = right(env)
+                try:
+                    if type(a) is int and type(b) is int: return a // b
+                    interpreter.check_number_operands(operator, a, b)
+                    return interpreter.perform_operation("/", a, b)
+                except ZeroDivisionError:
+                    raise RuntimeError(operator, "Cannot divide by 0")
+            return divide
+        if token_type == TokenType.EQUAL_EQUAL:
+            def equal(env):
+                a = left(env)
+                b = right(env)
+                return type(a) is type(b) and a == b
+            return equal
+        if token_type == TokenType.BANG_EQUAL:
+            def not_equal(env):
+                a = left(env)
+                b = right(env)
+                return not (type(a) is type(b) and a == b)
+            return not_equal
+        if token_type == TokenType.GREATER:
+            def greater(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is int and type(b) is int: return a > b
+                interpreter.check_number_operands(operator, a, b)
+                return float(a) > float(b)
+            return greater
+        if token_type == TokenType.GREATER_EQUAL:
+            def greater_equal(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is int and type(b) is int: return a >= b
+                interpreter.check_number_operands(operator, a, b)
+                return float(a) >= float(b)
+            return greater_equal
+        if token_type == TokenType.LESS:
+            def less(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is int and type(b) is int: return a < b
+                interpreter.check_number_operands(operator, a, b)
+                return float(a) < float(b)
+            return less
+        if token_type == TokenType.LESS_EQUAL:
+            def less_equal(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is int and type(b) is int: return a <= b
+                interpreter.check_number_operands(operator, a, b)
+                return float(a) <= float(b)
+            return less_equal
+        return lambda env: None
+
+    def visit_Call(self, expr):
+        '''
+        Calls to compiled Lox functions skip the generic LoxCallable protocol
+        and run the function body right here. Natives and classes go through
+        "call()" as usual.
+        '''
+        interpreter = self.interpreter
+        paren = expr.paren
+        argument_getters = self.compile_statements(expr.arguments)
+        count = len(argument_getters)
+        if isinstance(expr.callee, Expr.Get):
+            return self.compile_invoke(expr.callee, paren, argument_getters)
+        if isinstance(expr.callee, Expr.Super):
+            return self.compile_super_invoke(expr.callee, paren, argument_getters)
+        callee_getter = self.compile(expr.callee)
+        def call(env):
+            callee = callee_getter(env)
+            arguments = [argument(env) for argument in argument_getters]
+            if type(callee) is ClosureFunction:
+                if count != len(callee.params):
+                    raise RuntimeError(paren, f"Expected {len(callee.params)} arguments but got {count}.")
+                return callee.call(interpreter, arguments)
+            return self.call_value(callee, arguments, paren)
+        return call
+
+    def compile_invoke(self, get, paren, argument_getters):
+        '''
+        "object.method(arguments)" looks the method up on the instance's class
+        and runs it without going through a bound method value first. Fields
+        shadow methods so a field holding a function is called like any other value.
+        '''
+        name = get.name
+        lexeme = name.lexeme
+        obj_getter = self.compile(get.object)
+        count = len(argument_getters)
+        interpreter = self.interpreter
+        field_index = interpreter.field_index
+        lookup_method = interpreter.lookup_method
+        def invoke(env):
+            obj = obj_getter(env)
+            if not isinstance(obj, LoxInstance):
+                raise RuntimeError(name, "Only instances have properties.")
+            index = field_index(obj, get)
+            if index is not None:
+                callee = obj.values[index]
+            else:
+                method = lookup_method(obj.klass, get)
+                if type(method) is ClosureFunction:
+                    arguments = [argument(env) for argument in argument_getters]
+                    if count != len(method.params):
+                        raise RuntimeError(paren, f"Expected {len(method.params)} arguments but got {count}.")
+                    return method.call_bound(interpreter, obj, arguments)
+                if not method:
+                    raise RuntimeError(name, "Undefined property '" + lexeme + "'.")
+                callee = method.bind(obj)
+            arguments = [argument(env) for argument in argument_getters]
+            return self.call_value(callee, arguments, paren)
+        return invoke
+
+    def call_value(self, callee, arguments, paren):
+        '''
+        The generic path shared by every call site: anything
+        callable that isn't a plain compiled Lox function
+        '''
+        if type(callee) is LoxClass:
+            initializer = callee.find_method("init")
+            if type(initializer) is ClosureFunction:
+                if len(arguments) != len(initializer.params):
+                    raise RuntimeError(paren, f"Expected {len(initializer.params)} arguments but got {len(arguments)}.")
+                instance = LoxInstance(callee)
+                initializer.call_bound(self.interpreter, instance, arguments)
+                return instance
+        if not callable(callee):
+            raise RuntimeError(paren, "Can only call functions and classes.")
+        if len(arguments) != callee.arity():
+            raise RuntimeError(paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
+        return callee.call(self.interpreter, arguments)
+
+    def visit_Get(self, expr):
+        name = expr.name
+        lexeme = name.lexeme
+        obj_getter = self.compile(expr.object)
+        field_index = self.interpreter.field_index
+        lookup_method = self.interpreter.lookup_method
+        def get(env):
+            obj = obj_getter(env)
+            if isinstance(obj, LoxInstance):
+                if obj.shape is expr.shape:
+                    return obj.values[expr.index]
+                index = field_index(obj, expr)
+                if index is not None:
+                    return obj.values[index]
+                method = lookup_method(obj.klass, expr)
+                if method:
+                    return method.bind(obj)
+                raise RuntimeError(name, "Undefined property '" + lexeme + "'.")
+            raise RuntimeError(name, "Only instances have properties.")
+        return get
+
+    def visit_Set(self, expr):
+        name = expr.name
+        lexeme = name.lexeme
+        obj_getter = self.compile(expr.object)
+        value_getter = self.compile(expr.value)
+        set_field = self.interpreter.set_field
+        def set_property(env):
+            obj = obj_getter(env)
+            if not isinstance(obj, LoxInstance):
+                raise RuntimeError(name, "Only instances have fields.")
+            value = value_getter(env)
+            set_field(obj, expr, value)
+            return value
+        return set_property
+
+    def visit_Super(self, expr):
+        distance = expr.depth - 1
+        lookup_super = self.interpreter.super_method
+        def super_method(env):
+            method_env = env.ancestor(distance)
+            return lookup_super(expr, method_env).bind(method_env.values[0])
+        return super_method
+
+    def compile_super_invoke(self, expr, paren, argument_getters):
+        '''
+        "super.method(arguments)" -> calls the superclass's method on "this" directly
+        '''
+        distance = expr.depth - 1
+        count = len(argument_getters)
+        interpreter = self.interpreter
+        lookup_super = interpreter.super_method
+        def super_invoke(env):
+            method_env = env.ancestor(distance)
+            method = lookup_super(expr, method_env)
+            arguments = [argument(env) for argument in argument_getters]
+            if count != len(method.params):
+                raise RuntimeError(paren, f"Expected {len(method.params)} arguments but got {count}.")
+            return method.call_bound(interpreter, method_env.values[0], arguments)
+        return super_invoke
@@ -0,0 +1,510 @@
+#!/usr/bin/env python
+
+'''
+Compiles the resolved AST into bytecode for the stack VM in "VM.py".
+
+clox compiles straight from tokens in a single pass. We already have a Parser that builds
+an AST and a Resolver that reports the static errors (returns at top-level, "this" outside of
+a class, reading a local in its own initializer, ...), so this Compiler is just one more Visitor
+walking the same Stmt/Expr classes as the Interpreter. Instead of evaluating each node, it
+emits the instructions that will evaluate it.
+
+What this Compiler does keep from clox is how variables are laid out:
+    1. Globals are looked up by name at runtime (the name lives in the constant pool).
+    2. Locals live in the VM's value stack. The Compiler mirrors that stack with the "locals"
+    array of the function it's currently compiling, so a local variable becomes a slot index.
+    3. A local of an enclosing function is reached through an upvalue. Each function records
+    which of its enclosing function's locals or upvalues it captures so the VM can wire up
+    the closure when it's created.
+
+Operands are single bytes so there can only be 256 constants in a chunk and 256 locals/upvalues
+in a function. Going over reports a compile error, just like clox.
+'''
+
+import enum
+from enum import auto
+from . import Lox
+from .TokenType import TokenType
+from . import Expr
+from . import Stmt
+from .Chunk import *
+
+class FunctionType(enum.Enum):
+    SCRIPT, FUNCTION, METHOD, INITIALIZER = auto(), auto(), auto(), auto()
+
+class Local:
+    __slots__ = ("name", "depth", "is_captured")
+
+    def __init__(self, name: str, depth: int):
+        self.name = name
+        self.depth = depth          ## -1 until the variable's initializer has been compiled
+        self.is_captured = False
+
+class FunctionState:
+    '''
+    Book-keeping for the function currently being compiled. They form a
+    linked list through "enclosing" that upvalue resolution walks outwards.
+    '''
+
+    def __init__(self, enclosing, function: VMFunction, function_type: FunctionType):
+        self.enclosing = enclosing
+        self.function = function
+        self.function_type = function_type
+        self.upvalues = []          ## (index, is_local) pairs
+        self.identifiers = {}       ## name -> constant index, so each global or property name is stored once
+        self.scope_depth = 0
+        ## slot 0 holds the function being called, or the receiver ("this") for methods
+        slot_zero = "this" if function_type in (FunctionType.METHOD, FunctionType.INITIALIZER) else ""
+        self.locals = [Local(slot_zero, 0)]
+
+class ClassState:
+
+    def __init__(self, enclosing):
+        self.enclosing = enclosing
+        self.has_superclass = False
+
+class Compiler:
+
+    def __init__(self):
+        self.state = None
+        self.class_state = None
+        self.token = None           ## most recent token seen, for line numbers and error messages
+        self.had_error = False
+        self.panic_mode = False
+
+    def compile(self, statements):
+        '''
+        Returns the top-level script as a VMFunction or None if
+        there was a compile error
+        '''
+        self.state = FunctionState(None, VMFunction(), FunctionType.SCRIPT)
+        for statement in statements:
+            self.declaration(statement)
+        function = self.end_function()
+        return None if self.had_error else function
+
+    def declaration(self, stmt):
+        self.panic_mode = False     ## report at most one error per statement like clox's synchronize()
+        stmt.accept(self)
+
+    def expression(self, expr):
+        expr.accept(self)
+
+    # ERRORS AND EMITTING BYTES
+
+    def error(self, message: str):
+        if self.panic_mode:
+            return
+        self.panic_mode = True
+        self.had_error = True
+        if self.token:
+            Lox.Lox.error(self.token, message)
+        else:
+            Lox.Lox.error(1, message)
+
+    def at(self, token):
+        self.token = token
+
+    def chunk(self):
+        return self.state.function.chunk
+
+    def emit(self, *values):
+        line = self.token.line if self.token else 1
+        chunk = self.chunk()
+        for value in values:
+            chunk.write(value, line)
+
+    def make_constant(self, value):
+        index = self.chunk().add_constant(value)
+        if index >= UINT8_COUNT:
+            self.error("Too many constants in one chunk.")
+            return 0
+        return index
+
+    def emit_constant(self, value):
+        self.emit(OP_CONSTANT, self.make_constant(value))
+
+    def emit_jump(self, op):
+        self.emit(op, 0xff, 0xff)
+        return len(self.chunk().code) - 2
+
+    def patch_jump(self, offset, token=None):
+        '''
+        "token" is the one to report "Too much code to jump over." at, the current one if None
+        '''
+        if token:
+            self.at(token)
+        code = self.chunk().code
+        jump = len(code) - offset - 2
+        if jump > UINT16_MAX:
+            self.error("Too much code to jump over.")
+        code[offset] = (jump >> 8) & 0xff
+        code[offset + 1] = jump & 0xff
+
+    def emit_loop(self, loop_start, token=None):
+        '''
+        "token" is the one to report "Loop body too large." at, the current one if None
+        '''
+        if token:
+            self.at(token)
+        self.emit(OP_LOOP)
+        offset = len(self.chunk().code) - loop_start + 2
+        if offset > UINT16_MAX:
+            self.error("Loop body too large.")
+        self.emit((offset >> 8) & 0xff, offset & 0xff)
+
+    def emit_return(self):
+        if self.state.function_type == FunctionType.INITIALIZER:
+            self.emit(OP_GET_LOCAL, 0)      ## initializers always hand back "this"
+        else:
+            self.emit(OP_NIL)
+        self.emit(OP_RETURN)
+
+    # SCOPES AND VARIABLES
+
+    def begin_scope(self):
+        self.state.scope_depth += 1
+
+    def end_scope(self):
+        state = self.state
+        state.scope_depth -= 1
+        while state.locals and state.locals[-1].depth > state.scope_depth:
+            if state.locals[-1].is_captured:
+                self.emit(OP_CLOSE_UPVALUE)
+            else:
+                self.emit(OP_POP)
+            state.locals.pop()
+
+    def identifier_constant(self, name: str):
+        '''
+        Unlike literals, names are shared within a chunk: otherwise a long
+        top-level script runs out of constants just by mentioning its globals
+        '''
+        identifiers = self.state.identifiers
+        if name not in identifiers:
+            identifiers[name] = self.make_constant(name)
+        return identifiers[name]
+
+    def add_local(self, name: str):
+        if len(self.state.locals) == UINT8_COUNT:
+            self.error("Too many local variables in function.")
+            return
+        self.state.locals.append(Local(name, -1))
+
+    def declare_variable(self, name_token):
+        '''
+        Globals are late bound so only locals need declaring. Redeclaring a
+        local in the same scope was already reported by the Resolver.
+        '''
+        if self.state.scope_depth == 0:
+            return 0
+        self.add_local(name_token.lexeme)
+        return 0
+
+    def parse_variable(self, name_token):
+        self.at(name_token)
+        if self.state.scope_depth > 0:
+            return self.declare_variable(name_token)
+        return self.identifier_constant(name_token.lexeme)
+
+    def mark_initialized(self):
+        if self.state.scope_depth == 0:
+            return
+        self.state.locals[-1].depth = self.state.scope_depth
+
+    def define_variable(self, global_index):
+        if self.state.scope_depth > 0:
+            self.mark_initialized()
+            return
+        self.emit(OP_DEFINE_GLOBAL, global_index)
+
+    def resolve_local(self, state, name: str):
+        for index in range(len(state.locals) - 1, -1, -1):
+            if state.locals[index].name == name:
+                if state.locals[index].depth == -1:
+                    self.had_error = True       ## the Resolver has already reported this one
+                return index
+        return -1
+
+    def add_upvalue(self, state, index: int, is_local: bool):
+        for i, upvalue in enumerate(state.upvalues):
+            if upvalue == (index, is_local):
+                return i
+        if len(state.upvalues) == UINT8_COUNT:
+            self.error("Too many closure variables in function.")
+            return 0
+        state.upvalues.append((index, is_local))
+        state.function.upvalue_count = len(state.upvalues)
+        return len(state.upvalues) - 1
+
+    def resolve_upvalue(self, state, name: str):
+        if state.enclosing is None:
+            return -1
+        local = self.resolve_local(state.enclosing, name)
+        if local != -1:
+            state.enclosing.locals[local].is_captured = True
+            return self.add_upvalue(state, local, True)
+        upvalue = self.resolve_upvalue(state.enclosing, name)
+        if upvalue != -1:
+            return self.add_upvalue(state, upvalue, False)
+        return -1
+
+    def named_variable(self, name: str, assign_value=None):
+        '''
+        Emits the load (or, if "assign_value" is given, the store) of a variable,
+        picking the local, upvalue or global instruction depending on where it lives
+        '''
+        arg = self.resolve_local(self.state, name)
+        if arg != -1:
+            get_op, set_op = OP_GET_LOCAL, OP_SET_LOCAL
+        else:
+            arg = self.resolve_upvalue(self.state, name)
+            if arg != -1:
+                get_op, set_op = OP_GET_UPVALUE, OP_SET_UPVALUE
+            else:
+                arg = self.identifier_constant(name)
+                get_op, set_op = OP_GET_GLOBAL, OP_SET_GLOBAL
+        if assign_value is not None:
+            self.expression(assign_value)
+            self.emit(set_op, arg)
+        else:
+            self.emit(get_op, arg)
+
+    # FUNCTIONS
+
+    def function(self, stmt, function_type: FunctionType):
+        self.at(stmt.name)
+        self.state = FunctionState(self.state, VMFunction(stmt.name.lexeme), function_type)
+        self.begin_scope()
+        self.state.function.arity = len(stmt.params)
+        for param in stmt.params:
+            self.at(param)
+            self.declare_variable(param)
+            self.mark_initialized()
+        for statement in stmt.body:
+            self.declaration(statement)
+        upvalues = self.state.upvalues
+        function = self.end_function()
+        self.emit(OP_CLOSURE, self.make_constant(function))
+        for index, is_local in upvalues:
+            self.emit(1 if is_local else 0, index)
+
+    def end_function(self):
+        '''
+        No need to end the function's outermost scope: returning
+        discards the whole call frame in one go
+        '''
+        self.emit_return()
+        function = self.state.function
+        self.state = self.state.enclosing
+        return function
+
+    # STATEMENT VISITOR METHODS
+
+    def visit_Block(self, stmt):
+        self.begin_scope()
+        for statement in stmt.statements:
+            self.declaration(statement)
+        self.end_scope()
+
+    def visit_Class_Statement(self, stmt):
+        self.at(stmt.name)
+        class_name = stmt.name.lexeme
+        name_constant = self.identifier_constant(class_name)
+        self.declare_variable(stmt.name)
+        self.emit(OP_CLASS, name_constant)
+        self.define_variable(name_constant)
+
+        self.class_state = ClassState(self.class_state)
+        if stmt.superclass:
+            self.expression(stmt.superclass)
+            self.begin_scope()
+            self.add_local("super")
+            self.define_variable(0)
+            self.named_variable(class_name)
+            self.at(stmt.name)
+            self.emit(OP_INHERIT)
+            self.class_state.has_superclass = True
+
+        self.named_variable(class_name)
+        for method in stmt.methods:
+            method_constant = self.identifier_constant(method.name.lexeme)
+            function_type = FunctionType.INITIALIZER if method.name.lexeme == "init" else FunctionType.METHOD
+            self.function(method, function_type)
+            self.emit(OP_METHOD, method_constant)
+        self.emit(OP_POP)
+
+        if self.class_state.has_superclass:
+            self.end_scope()
+        self.class_state = self.class_state.enclosing
+
+    def visit_Function_Statement(self, stmt):
+        global_index = self.parse_variable(stmt.name)
+        self.mark_initialized()     ## a function can refer to itself for recursion
+        self.function(stmt, FunctionType.FUNCTION)
+        self.define_variable(global_index)
+
+    def visit_Var_Statement(self, stmt):
+        global_index = self.parse_variable(stmt.name)
+        if stmt.initializer:
+            self.expression(stmt.initializer)
+        else:
+            self.emit(OP_NIL)
+        self.at(stmt.name)
+        self.define_variable(global_index)
+
+    def visit_Expression_Statement(self, stmt):
+        self.expression(stmt.expression)
+        self.emit(OP_POP)
+
+    def visit_Print_Statement(self, stmt):
+        self.expression(stmt.expression)
+        self.emit(OP_PRINT)
+
+    def visit_Return_Statement(self, stmt):
+        self.at(stmt.keyword)
+        if stmt.value is None or self.state.function_type == FunctionType.INITIALIZER:
+            self.emit_return()
+        else:
+            self.expression(stmt.value)
+            self.emit(OP_RETURN)
+
+    def visit_If_Statement(self, stmt):
+        self.expression(stmt.condition)
+        then_jump = self.emit_jump(OP_JUMP_IF_FALSE)
+        self.emit(OP_POP)
+        stmt.then_branch.accept(self)
+        else_jump = self.emit_jump(OP_JUMP)
+        self.patch_jump(then_jump)
+        self.emit(OP_POP)
+        if stmt.else_branch:
+            stmt.else_branch.accept(self)
+        self.patch_jump(else_jump)
+
+    def visit_While_Statement(self, stmt):
+        loop_start = len(self.chunk().code)
+        self.expression(stmt.condition)
+        exit_jump = self.emit_jump(OP_JUMP_IF_FALSE)
+        self.emit(OP_POP)
+        stmt.body.accept(self)
+        self.emit_loop(loop_start, stmt.end)
+        self.patch_jump(exit_jump, stmt.end)
+        self.emit(OP_POP)
+
+    # EXPRESSION VISITOR METHODS
+
+    def visit_Literal(self, expr):
+        if expr.value is None:
+            self.emit(OP_NIL)
+        elif expr.value is True:
+            self.emit(OP_TRUE)
+        elif expr.value is False:
+            self.emit(OP_FALSE)
+        else:
+            if expr.token:
+                self.at(expr.token)
+            self.emit_constant(expr.value)
+
+    def visit_Grouping(self, expr):
+        self.expression(expr.expression)
+
+    def visit_Variable(self, expr):
+        self.at(expr.name)
+        self.named_variable(expr.name.lexeme)
+
+    def visit_Assign(self, expr):
+        self.at(expr.name)
+        self.named_variable(expr.name.lexeme, expr.value)
+
+    def visit_This(self, expr):
+        self.at(expr.keyword)
+        self.named_variable("this")
+
+    def visit_Super(self, expr):
+        self.at(expr.keyword)
+        name = self.identifier_constant(expr.method.lexeme)
+        self.named_variable("this")
+        self.named_variable("super")
+        self.at(expr.method)
+        self.emit(OP_GET_SUPER, name)
+
+    def visit_Logical(self, expr):
+        self.expression(expr.left)
+        self.at(expr.operator)
+        if expr.operator.token_type == TokenType.AND:
+            end_jump = self.emit_jump(OP_JUMP_IF_FALSE)
+            self.emit(OP_POP)
+            self.expression(expr.right)
+            self.patch_jump(end_jump)
+        else:
+            else_jump = self.emit_jump(OP_JUMP_IF_FALSE)
+            end_jump = self.emit_jump(OP_JUMP)
+            self.patch_jump(else_jump)
+            self.emit(OP_POP)
+            self.expression(expr.right)
+            self.patch_jump(end_jump)
+
+    def visit_Unary(self, expr):
+        self.expression(expr.right)
+        self.at(expr.operator)
+        if expr.operator.token_type == TokenType.MINUS:
+            self.emit(OP_NEGATE)
+        else:
+            self.emit(OP_NOT)
+
+    def visit_Binary(self, expr):
+        self.expression(expr.left)
+        self.expression(expr.right)
+        self.at(expr.operator)
+        token_type = expr.operator.token_type
+        if token_type == TokenType.PLUS: self.emit(OP_ADD)
+        elif token_type == TokenType.MINUS: self.emit(OP_SUBTRACT)
+        elif token_type == TokenType.STAR: self.emit(OP_MULTIPLY)
+        elif token_type == TokenType.SLASH: self.emit(OP_DIVIDE)
+        elif token_type == TokenType.EQUAL_EQUAL: self.emit(OP_EQUAL)
+        elif token_type == TokenType.BANG_EQUAL: self.emit(OP_EQUAL, OP_NOT)
+        elif token_type == TokenType.GREATER: self.emit(OP_GREATER)
+        elif token_type == TokenType.GREATER_EQUAL: self.emit(OP_LESS, OP_NOT)
+        elif token_type == TokenType.LESS: self.emit(OP_LESS)
+        elif token_type == TokenType.LESS_EQUAL: self.emit(OP_GREATER, OP_NOT)
+
+    def visit_Call(self, expr):
+        '''
+        Method calls ("object.method()" and "super.method()") get their own
+        instructions so the VM never has to create a bound method for them
+        '''
+        callee = expr.callee
+        if isinstance(callee, Expr.Get):
+            self.expression(callee.object)
+            self.arguments(expr.arguments)
+            self.at(callee.name)
+            self.emit(OP_INVOKE, self.identifier_constant(callee.name.lexeme), len(expr.arguments) & 0xff)
+        elif isinstance(callee, Expr.Super):
+            self.at(callee.keyword)
+            self.named_variable("this")
+            self.arguments(expr.arguments)
+            self.named_variable("super")
+            self.at(callee.method)
+            self.emit(OP_SUPER_INVOKE, self.identifier_constant(callee.method.lexeme), len(expr.arguments) & 0xff)
+        else:
+            self.expression(callee)
+            self.arguments(expr.arguments)
+            self.at(expr.paren)
+            self.emit(OP_CALL, len(expr.arguments) & 0xff)
+
+    def arguments(self, arguments):
+        if len(arguments) >= UINT8_COUNT:
+            self.error("Can't have more than 255 arguments")
+        for argument in arguments:
+            self.expression(argument)
+
+    def visit_Get(self, expr):
+        self.expression(expr.object)
+        self.at(expr.name)
+        self.emit(OP_GET_PROPERTY, self.identifier_constant(expr.name.lexeme))
+
+    def visit_Set(self, expr):
+        self.expression(expr.object)
+        self.expression(expr.value)
+        self.at(expr.name)
+        self.emit(OP_SET_PROPERTY, self.identifier_constant(expr.name.lexeme))
@@ -5,47 +5,76 @@ The Environment is necessary for lexical scoping. The book touches upon the diff
 To introduce that with Lox, we will have an overall global environment. But if we introduce Statement blocks, we are now creating a sub-area where the variables defined here (even possibly defined with the same name as the enclosing environment) will have their values exist only here. 
 
 We implement that notion with an instance of Environment() representing an overall environment with a "values" dictionary which will track our variables and their associated values. If the user tries accessing an identifier that doesn't exist in the current Environment, we can look at its "enclosing" environment--and so on and so forth. 
+
+Since the Resolver already knows statically where every local variable lives, local environments don't 
+need to look anything up by name: each one is a fixed-size list of values and a local is read or written 
+by its (depth, slot) pair -> "depth" enclosing environments up, index "slot" in that environment's list. 
+Only the globals, which can be defined/referenced in any order at runtime, are kept in a dictionary 
+(GlobalEnvironment). 
 '''
-import sys 
-sys.path.insert(0, "scanner/")
-from Token import Token 
-import Lox 
+from .Token import Token 
+from . import Lox 
 
 class Environment:
+    __slots__ = ("values", "enclosing")
 
-    def __init__(self, enclosing=None):
+    def __init__(self, enclosing=None, size: int = 0):
         '''
         Create a new instance of an Environemnt. If we pass in an argument, then
-        it would be the enclosing environment. 
+        it would be the enclosing environment. "size" is the number of locals
+        declared in this scope, as counted by the Resolver.
 
         E.g. we could have an overall global environment with 
-        "global = Environment()" and then a for-loop would have a new environment
-        called "for_loop = Environment(global)" so it can still access variables 
+        "global = GlobalEnvironment()" and then a for-loop would have a new environment
+        called "for_loop = Environment(global, 1)" so it can still access variables 
         defined in the "global" environment 
         '''
-        self.values = {} 
-        assert (type(enclosing) == Environment or enclosing == None), "enclosing init arg must be of type Environment or NoneType" 
+        self.values = [None] * size 
         self.enclosing = enclosing 
 
-    def define(self, name, value):
+    def define(self, slot: int, value):
+        self.values[slot] = value 
+
+    def get_at(self, distance: int, slot: int):
+        return self.ancestor(distance).values[slot]
+
+    def ancestor(self, distance):
+        '''
+        Returns an ancestral environment where our variable
+        was defined. 
+        '''
+        environment = self 
+        for i in range(distance):
+            environment = environment.enclosing 
+        return environment 
+
+    def assign_at(self, distance: int, slot: int, value):
+        self.ancestor(distance).values[slot] = value 
+
+class GlobalEnvironment:
+    '''
+    The outermost environment. Globals aren't resolved so they're still
+    looked up (and can go missing) by name at runtime.
+    '''
+    __slots__ = ("values", "enclosing")
+
+    def __init__(self):
+        self.values = {} 
+        self.enclosing = None 
+
+    def define(self, name: str, value):
         '''
-        Args: name -> can be either a Token (lexeme) or a String. 
-        Most of the time it'll be a token that will need 
-        to be defined in the environment. But one string
-        argument could be the "clock" native function 
+        Args: name -> a string: either a token's lexeme
+        or the name of a native function like "clock" 
         '''
         self.values[name] = value   
 
     def get(self, name):  
         '''
         Arg -> Name is of Token Type. 
-        If token's lexeme exists in environment, retrieve associated value 
-        otherwise look into its enclosing environments 
         '''
         if name.lexeme in self.values:
             return self.values[name.lexeme] 
-        if self.enclosing:
-            return self.enclosing.get(name) 
         raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.") 
 
     def assign(self, name, value):
@@ -56,23 +85,4 @@ class Environment:
         if name.lexeme in self.values:
             self.values[name.lexeme] = value 
             return 
-        if self.enclosing:   ## if we can't find the variable to assign to, we try going to the enclosing one
-            self.enclosing.assign(name, value) 
-            return
         raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.") 
-
-    def get_at(self, distance: int, name: str):
-        return self.ancestor(distance).values[name]
-
-    def ancestor(self, distance):
-        '''
-        Returns an ancestral environment where our variable
-        was defined. 
-        '''
-        environment = self 
-        for i in range(distance):
-            environment = environment.enclosing 
-        return environment 
-
-    def assign_at(self, distance: int, name: Token, value):
-        self.ancestor(distance).values[name.lexeme] = value 
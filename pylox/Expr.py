@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+
+from abc import ABC, abstractmethod
+from .Token import Token
+
+class Expr(ABC):
+
+	__slots__ = ()
+
+	@abstractmethod
+	def accept(self, visitor):
+		pass
+
+class Assign(Expr):
+
+	__slots__ = ("name", "value", "depth", "slot")
+	__match_args__ = ("name", "value")
+
+	def __init__(self, name, value):
+		self.name = name
+		self.value = value
+		self.depth = None
+		self.slot = None
+
+	def accept(self, visitor):
+		return visitor.visit_Assign(self)
+
+class Binary(Expr):
+
+	__slots__ = ("left", "operator", "right", "generic")
+	__match_args__ = ("left", "operator", "right")
+
+	def __init__(self, left, operator, right):
+		self.left = left
+		self.operator = operator
+		self.right = right
+		self.generic = None
+
+	def accept(self, visitor):
+		return visitor.visit_Binary(self)
+
+class Add(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Add
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class Add_Int(Add):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Add_Int
+		except AttributeError:
+			return Add.accept(self, visitor)
+		return visit(self)
+
+class Add_String(Add):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Add_String
+		except AttributeError:
+			return Add.accept(self, visitor)
+		return visit(self)
+
+class Subtract(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Subtract
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class Multiply(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Multiply
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class Divide(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Divide
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class Greater(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Greater
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class GreaterEqual(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_GreaterEqual
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class Less(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Less
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class LessEqual(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_LessEqual
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class EqualEqual(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_EqualEqual
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class BangEqual(Binary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_BangEqual
+		except AttributeError:
+			return visitor.visit_Binary(self)
+		return visit(self)
+
+class Call(Expr):
+
+	__slots__ = ("callee", "paren", "arguments", "target", "generic")
+	__match_args__ = ("callee", "paren", "arguments")
+
+	def __init__(self, callee, paren, arguments):
+		self.callee = callee
+		self.paren = paren
+		self.arguments = arguments
+		self.target = None
+		self.generic = None
+
+	def accept(self, visitor):
+		return visitor.visit_Call(self)
+
+class Call_Direct(Call):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Call_Direct
+		except AttributeError:
+			return visitor.visit_Call(self)
+		return visit(self)
+
+class Get(Expr):
+
+	__slots__ = ("object", "name", "cached_class", "cached_method", "cache", "shape", "index", "generic")
+	__match_args__ = ("object", "name")
+
+	def __init__(self, object, name):
+		self.object = object
+		self.name = name
+		self.cached_class = None
+		self.cached_method = None
+		self.cache = None
+		self.shape = None
+		self.index = None
+		self.generic = None
+
+	def accept(self, visitor):
+		return visitor.visit_Get(self)
+
+class Get_Field(Get):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Get_Field
+		except AttributeError:
+			return visitor.visit_Get(self)
+		return visit(self)
+
+class Set(Expr):
+
+	__slots__ = ("object", "name", "value", "shape", "index", "next_shape")
+	__match_args__ = ("object", "name", "value")
+
+	def __init__(self, object, name, value):
+		self.object = object
+		self.name = name
+		self.value = value
+		self.shape = None
+		self.index = None
+		self.next_shape = None
+
+	def accept(self, visitor):
+		return visitor.visit_Set(self)
+
+class Super(Expr):
+
+	__slots__ = ("keyword", "method", "depth", "slot", "cached_class", "cached_method")
+	__match_args__ = ("keyword", "method")
+
+	def __init__(self, keyword, method):
+		self.keyword = keyword
+		self.method = method
+		self.depth = None
+		self.slot = None
+		self.cached_class = None
+		self.cached_method = None
+
+	def accept(self, visitor):
+		return visitor.visit_Super(self)
+
+class This(Expr):
+
+	__slots__ = ("keyword", "depth", "slot")
+	__match_args__ = ("keyword",)
+
+	def __init__(self, keyword):
+		self.keyword = keyword
+		self.depth = None
+		self.slot = None
+
+	def accept(self, visitor):
+		return visitor.visit_This(self)
+
+class Grouping(Expr):
+
+	__slots__ = ("expression",)
+	__match_args__ = ("expression",)
+
+	def __init__(self, expression):
+		self.expression = expression
+
+	def accept(self, visitor):
+		return visitor.visit_Grouping(self)
+
+class Literal(Expr):
+
+	__slots__ = ("value", "token")
+	__match_args__ = ("value",)
+
+	def __init__(self, value):
+		self.value = value
+		self.token = None
+
+	def accept(self, visitor):
+		return visitor.visit_Literal(self)
+
+class Logical(Expr):
+
+	__slots__ = ("left", "operator", "right")
+	__match_args__ = ("left", "operator", "right")
+
+	def __init__(self, left, operator, right):
+		self.left = left
+		self.operator = operator
+		self.right = right
+
+	def accept(self, visitor):
+		return visitor.visit_Logical(self)
+
+class And(Logical):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_And
+		except AttributeError:
+			return visitor.visit_Logical(self)
+		return visit(self)
+
+class Or(Logical):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Or
+		except AttributeError:
+			return visitor.visit_Logical(self)
+		return visit(self)
+
+class Unary(Expr):
+
+	__slots__ = ("operator", "right")
+	__match_args__ = ("operator", "right")
+
+	def __init__(self, operator, right):
+		self.operator = operator
+		self.right = right
+
+	def accept(self, visitor):
+		return visitor.visit_Unary(self)
+
+class Negate(Unary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Negate
+		except AttributeError:
+			return visitor.visit_Unary(self)
+		return visit(self)
+
+class Not(Unary):
+
+	__slots__ = ()
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_Not
+		except AttributeError:
+			return visitor.visit_Unary(self)
+		return visit(self)
+
+class Variable(Expr):
+
+	__slots__ = ("name", "depth", "slot")
+	__match_args__ = ("name",)
+
+	def __init__(self, name):
+		self.name = name
+		self.depth = None
+		self.slot = None
+
+	def accept(self, visitor):
+		return visitor.visit_Variable(self)
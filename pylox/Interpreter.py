@@ -0,0 +1,809 @@
+#!/usr/bin/env python 
+
+'''
+WHERE WE ARE NOW 
+
+The Interpreter can now interpret basic OOP 
+
+'''
+
+import operator 
+from . import Lox 
+from .Token import Token 
+from .TokenType import TokenType 
+from . import Expr 
+from . import Stmt
+from .Environment import Environment, GlobalEnvironment 
+from .Callable import NativeClock, LoxFunction, LoxClass, LoxInstance, TailCall 
+from .JIT import JIT 
+
+## what a counted loop's condition compares its counter with its limit with 
+COMPARISONS = {Expr.Less: operator.lt, Expr.LessEqual: operator.le, Expr.Greater: operator.gt, Expr.GreaterEqual: operator.ge} 
+
+POLYMORPHIC_LIMIT = 4       ## # of classes a property get site remembers before it gives up caching new ones 
+
+class Interpreter(): 
+
+
+    def __init__(self):
+        '''
+        Environment is created for scope purposes 
+        '''
+        self.globals = GlobalEnvironment() 
+        self.globals.define("clock", NativeClock())
+        self.environment = self.globals 
+        self.operators = {"-": operator.sub, "+": operator.add, "/": operator.floordiv,"*": operator.mul}  
+        self.cache_hits = 0         ## method lookups answered by a property get's inline cache 
+        self.cache_misses = 0       ## ... and the ones that had to walk the class chain 
+        self.jit = JIT(self)        ## compiles hot while loops, None when turned off 
+
+    def interpret(self, statements):
+        '''
+        We take our array of statement ASTs from the 
+        Parser and start executing them 
+        '''
+        try:
+            for statement in statements:
+                if self.execute(statement) is not None:
+                    return          ## a "return" outside of any function ends the script 
+        except RecursionError as e:     ## Lox calls nested deeper than Python's own stack allows 
+            Lox.Lox.runtime_error((self.innermost_call(e), "Stack overflow.")) 
+        except RuntimeError as e:
+            Lox.Lox.runtime_error(e.args) 
+
+    def innermost_call(self, error):
+        '''
+        Line of the deepest Lox call that was still running when "error" got raised. 
+        It's found in the Python frames the error unwound: the Call expression a visit method 
+        was given or the "paren" a call closure (see "ClosureInterpreter.py") closed over 
+        '''
+        line = 0 
+        traceback = error.__traceback__
+        while traceback:
+            variables = traceback.tb_frame.f_locals
+            if isinstance(variables.get("expr"), Expr.Call):
+                line = variables["expr"].paren.line 
+            elif variables.get("paren") is not None:
+                line = variables["paren"].line 
+            traceback = traceback.tb_next
+        return line 
+
+    def execute(self, stmt):
+        '''
+        Execution really means having the statement accept 
+        the Interpreter visitor. Depending on the specific AST contained 
+        in either Stmt.py or Expr.py, it'll then call one of 
+        the Interpreter's methods below for evaluation. 
+
+        Statements that complete normally return None. One that executes 
+        a "return" returns the 1-tuple "(value,)" instead, which every 
+        enclosing block, if and while hands straight back up to the 
+        LoxFunction being called 
+        '''
+        return stmt.accept(self) 
+
+    def define(self, slot, name: str, value):
+        '''
+        Declarations the Resolver gave a slot to are locals of the current
+        environment, the rest are globals 
+        '''
+        if slot is None:
+            self.globals.define(name, value) 
+        else:
+            self.environment.define(slot, value) 
+
+    def visit_Class_Statement(self, stmt):
+        '''
+        When we come across a Stmt.Class, we make sure our current environment
+        has a label for this syntax node BEFORE wrapping it in a runtime LoxClass.
+        We then reassign the syntax node class to this runtime klass. We break this
+        into two pieces so the LoxClass can still access the class name in its methods.
+        '''
+        superclass = None 
+        if stmt.superclass:
+            superclass = self.evaluate(stmt.superclass) 
+            if not isinstance(superclass, LoxClass):
+                raise RuntimeError(stmt.superclass.name, "Superclass must be a class.") 
+        self.define(stmt.slot, stmt.name.lexeme, None) 
+        if stmt.superclass:
+            self.environment = Environment(self.environment, 1) # we create a new env for the super class 
+            self.environment.define(0, superclass) 
+        methods = {}
+        for method in stmt.methods:
+            function = LoxFunction(self.environment, method, method.name.lexeme == 'init')
+            methods[method.name.lexeme] = function 
+        klass = LoxClass(stmt.name.lexeme, superclass, methods)
+        if superclass:
+            self.environment = self.environment.enclosing  # go back to original 
+        #klass = LoxClass(stmt.name, None, methods) 
+        self.define(stmt.slot, stmt.name.lexeme, klass) 
+
+    def visit_Function_Statement(self, stmt):
+        '''
+        If we encounter a Stmt.Function_Statement in our array of statements,
+        we wrap it in a LoxFunction instance along with the current environment
+        we are in (e.g. we could be in a block_statement body with a new inner
+        environment which we're passing into LoxFunction) 
+        '''
+        function = LoxFunction(self.environment, stmt, False) 
+        self.define(stmt.slot, stmt.name.lexeme, function) ## now our function call can retrieve the function name to get the object 
+
+    def visit_Return_Statement(self, stmt):
+        '''
+        When we encounter a return statement class we evaluate its value and complete 
+        with it, which gets passed all the way back to our original Call expression 
+        '''
+        if stmt.tail_call:
+            return self.tail_call(stmt.value) 
+        value = None 
+        if stmt.value:
+            value = self.evaluate(stmt.value)
+        return (value,) 
+
+    def visit_Block(self, stmt):
+        '''
+        Each block AST will get it's own Environment for its set of statements. 
+        We pass in the current self.environment as the enclosing environment for 
+        our new environment dedicated for this block. 
+        '''
+        assert isinstance(stmt, Stmt.Block), "must be of type Block Statement" 
+        return self.execute_block(stmt.statements, Environment(self.environment, stmt.scope_size)) 
+
+    def execute_block(self, statements, env):
+        '''
+        We make sure to keep track of our overall environment so that when 
+        we are evaluating the statements with respect to a new environment for 
+        our statement block, we can go back to our previous self.environment. 
+        This is how we implement scoping concepts such as nesting and shadowing.
+        '''
+        prev_env = self.environment 
+        try:
+            self.environment = env     
+            for statement in statements:
+                completion = self.execute(statement) 
+                if completion is not None:
+                    return completion 
+        finally:
+            self.environment = prev_env 
+
+    def visit_If_Statement(self, stmt):
+        assert isinstance(stmt, Stmt.If_Statement), "must be of type If Statement" 
+        if self.is_truthy(self.evaluate(stmt.condition)):
+            return self.execute(stmt.then_branch)
+        elif stmt.else_branch:
+            return self.execute(stmt.else_branch)
+        return 
+
+    def visit_While_Statement(self, stmt):
+        '''
+        Every finished iteration is a back-edge for the JIT to count. Once the loop 
+        is hot it's specialized (see "JIT.py") and from then on runs compiled, as long as its guards hold 
+        '''
+        assert isinstance(stmt, Stmt.While_Statement), "must of type While Statement"
+        jit = self.jit 
+        if stmt.specialized and jit.enter(stmt):
+            return 
+        while self.is_truthy(self.evaluate(stmt.condition)):
+            completion = self.execute(stmt.body) 
+            if completion is not None:
+                return completion 
+            if jit is not None and stmt.specialized is not False and jit.back_edge(stmt):
+                return          ## the rest of the loop ran compiled 
+        return 
+
+    def visit_For_Statement(self, stmt):
+        '''
+        A counted loop (see "Resolver.visit_For_Statement") keeps its counter in a Python 
+        int, compares it with the limit directly and adds the step itself, storing the 
+        counter back in its slot for the body (and any closure) to read. The Block around 
+        the body and increment has no slots so one Environment does for every iteration. 
+        Other loops, and ones whose counter doesn't start out as an int, run as the 
+        "while" loop they are 
+        '''
+        statements = stmt.body.statements if stmt.counter is not None else None 
+        if not statements or statements[-1] is not stmt.increment:
+            return self.visit_While_Statement(stmt)     ## also when -O1 dropped the increment after a "return" 
+        environment = self.environment 
+        values, slot, step = environment.values, stmt.counter, stmt.step 
+        counter = values[slot] 
+        if type(counter) is not int:
+            return self.visit_While_Statement(stmt) 
+        condition = stmt.condition 
+        compare, limit = COMPARISONS[type(condition)], condition.right 
+        body = statements[:-1] 
+        scope = Environment(environment, 0) 
+        if len(body) == 1 and type(body[0]) is Stmt.Block and body[0].scope_size == 0:
+            body, scope = body[0].statements, Environment(scope, 0)     ## same for a body "{...}" declaring nothing 
+        try:
+            while True:
+                self.environment = environment 
+                bound = self.evaluate(limit) 
+                if type(bound) is not int:
+                    self.check_number_operands(condition.operator, counter, bound) 
+                if not compare(counter, bound):
+                    return 
+                self.environment = scope 
+                for statement in body:
+                    completion = self.execute(statement) 
+                    if completion is not None:
+                        return completion 
+                counter += step 
+                values[slot] = counter 
+        finally:
+            self.environment = environment 
+    
+    def visit_Expression_Statement(self, stmt):
+        assert isinstance(stmt, Stmt.Expression_Statement), "must be of type Expression Statement" 
+        self.evaluate(stmt.expression)
+        return 
+
+    def visit_Print_Statement(self, stmt):
+        '''
+        All we need to do is evaluate the expression AST and print it out 
+        '''
+        assert isinstance(stmt, Stmt.Print_Statement), "must be of type Print Statement" 
+        value = self.evaluate(stmt.expression)
+        print(str(value)) 
+        return 
+
+    def visit_Var_Statement(self, stmt):
+        '''
+        The point of variables is to "remember" so here we initialize it with an expression 
+        and define it in our local environment 
+        '''
+        assert isinstance(stmt, Stmt.Var_Statement), "must be of type Variable Statement" 
+        value = None 
+        if stmt.initializer:
+            value = self.evaluate(stmt.initializer) 
+        self.define(stmt.slot, stmt.name.lexeme, value) 
+        return 
+
+    # EXPRESSION VISITOR METHODS BELOW
+
+    def evaluate(self, expr):
+        '''
+        expr is a type of AST defined in "Expr.py" and will
+        call one of the visitor methods below depending on its type 
+        '''
+        return expr.accept(self) 
+
+    def visit_Logical(self, expr):
+        '''
+        The short-circuiting is why we didn't package Logical Operator expressions 
+        with the rest of the Binary operations. If we detect an OR token and we 
+        know the left-hand operand is 'truthy', then we can return it and short-circuit.
+        If it is an AND and the left-hand side is 'falsy' then we return it and short-circuit.
+        Only if the above two cases don't short-circuit, do we bother evaluating 
+        the right operand
+        '''
+        assert isinstance(expr, Expr.Logical), "Expression must be of type If otherwise cannot evaluate" 
+        left = self.evaluate(expr.left)
+        if expr.operator.token_type == TokenType.OR:
+            if self.is_truthy(left): 
+                return left 
+        else:
+            if not self.is_truthy(left): return left 
+        return self.evaluate(expr.right) 
+
+    def visit_And(self, expr):
+        left = self.evaluate(expr.left) 
+        if left is None or left is False: 
+            return left 
+        return self.evaluate(expr.right) 
+
+    def visit_Or(self, expr):
+        left = self.evaluate(expr.left) 
+        if left is not None and left is not False: 
+            return left 
+        return self.evaluate(expr.right) 
+
+    def visit_Assign(self, expr):
+        '''
+        In our env, create an assignment for our variable to a value evaluation. 
+        With the Resolver, we can also assign a variable in a local scope different
+        values.
+        '''
+        assert isinstance(expr, Expr.Assign), "Expression must be of type Assignment otherwise cannot evaluate" 
+        value = self.evaluate(expr.value)
+        if expr.depth is not None: 
+            self.environment.assign_at(expr.depth, expr.slot, value) 
+        else: 
+            self.globals.assign(expr.name, value)  
+        return value 
+
+    def visit_Literal(self, expr):
+        assert isinstance(expr, Expr.Literal), "Expression must be of type Literal otherwise cannot evaluate" 
+        return expr.value
+
+    def visit_Grouping(self, expr):
+        assert isinstance(expr, Expr.Grouping), "Expression must be of type Grouping otherwise cannot evaluate"
+        return self.evaluate(expr.expression) 
+
+    def visit_Unary(self, expr):
+        assert isinstance(expr, Expr.Unary), "Expression must be of type Unary otherwise cannot evaluate"
+        right = self.evaluate(expr.right) 
+        if expr.operator.token_type == TokenType.MINUS:
+            return self.negate(expr.operator, right) 
+        elif expr.operator.token_type == TokenType.BANG:
+            return not self.is_truthy(right) 
+        return
+
+    def visit_Negate(self, expr):
+        right = self.evaluate(expr.right) 
+        if type(right) is int: 
+            return -right 
+        return self.negate(expr.operator, right) 
+
+    def visit_Not(self, expr):
+        return not self.is_truthy(self.evaluate(expr.right)) 
+
+    def visit_Variable(self, expr):
+        return self.look_up_var(expr.name, expr) 
+
+    def visit_Binary(self, expr):
+        '''
+        Many kinds of binary operations exist such as 
+        addition, subtraction, >=, etc. For binary expressions 
+        that need numbers, we first check the operands before 
+        committing to the evaluation (e.g. can't try to convert
+        a string to a float) 
+        '''
+        assert isinstance(expr, Expr.Binary), "Expression must be of type Binary otherwise cannot evaluate" 
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        return self.binary_operation(expr.operator, left, right) 
+
+    ## The Parser hands us one Binary subclass per operator so the ones below already know
+    ## what to do. Two ints (the common case in loops) are handled right here, other numbers
+    ## go through "number_operation" for the mixed int/float rules 
+
+    def visit_Add(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int: 
+            if expr.generic is None:
+                expr.__class__ = Expr.Add_Int 
+            return left + right 
+        if type(left) is str and type(right) is str and expr.generic is None:
+            expr.__class__ = Expr.Add_String 
+            return left + right 
+        return self.binary_operation(expr.operator, left, right) 
+
+    ## Quickening -> the first time an Add, a Get or a Call runs it rewrites itself (its class) into a 
+    ## node specialized for what it saw: Add_Int/Add_String for two ints/strings, Get_Field for a field 
+    ## of instances of one Shape and Call_Direct for a call of one LoxFunction. The visit methods below 
+    ## only check that what they were specialized for still holds. When it doesn't the node goes back 
+    ## to its generic class for good ("generalize") 
+
+    def generalize(self, expr, generic_class):
+        expr.__class__ = generic_class 
+        expr.generic = True 
+
+    def visit_Add_Int(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int: 
+            return left + right 
+        self.generalize(expr, Expr.Add) 
+        return self.binary_operation(expr.operator, left, right) 
+
+    def visit_Add_String(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is str and type(right) is str: 
+            return left + right 
+        self.generalize(expr, Expr.Add) 
+        if type(left) is int and type(right) is int: 
+            return left + right 
+        return self.binary_operation(expr.operator, left, right) 
+
+    def visit_Get_Field(self, expr):
+        obj = self.evaluate(expr.object) 
+        if type(obj) is LoxInstance and obj.shape is expr.shape:
+            return obj.values[expr.index] 
+        self.generalize(expr, Expr.Get) 
+        return self.get_property(obj, expr) 
+
+    def visit_Call_Direct(self, expr):
+        callee = self.evaluate(expr.callee) 
+        arguments = [self.evaluate(argument) for argument in expr.arguments] 
+        if callee is expr.target:           ## already checked its arity the first time 
+            environment = Environment(callee.closure, callee.declaration.scope_size) 
+            environment.values[:len(arguments)] = arguments 
+            return callee.run(self, environment) 
+        self.generalize(expr, Expr.Call) 
+        expr.target = None 
+        return self.call_value(callee, arguments, expr.paren) 
+
+    def visit_Subtract(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int: 
+            return left - right 
+        self.check_number_operands(expr.operator, left, right) 
+        return self.number_operation(operator.sub, left, right) 
+
+    def visit_Multiply(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int: 
+            return left * right 
+        self.check_number_operands(expr.operator, left, right) 
+        return self.number_operation(operator.mul, left, right) 
+
+    def visit_Divide(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int and right: 
+            return left // right 
+        return self.binary_operation(expr.operator, left, right) 
+
+    def visit_Greater(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int: 
+            return left > right 
+        self.check_number_operands(expr.operator, left, right) 
+        return left > right 
+
+    def visit_GreaterEqual(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int: 
+            return left >= right 
+        self.check_number_operands(expr.operator, left, right) 
+        return left >= right 
+
+    def visit_Less(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int: 
+            return left < right 
+        self.check_number_operands(expr.operator, left, right) 
+        return left < right 
+
+    def visit_LessEqual(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        if type(left) is int and type(right) is int: 
+            return left <= right 
+        self.check_number_operands(expr.operator, left, right) 
+        return left <= right 
+
+    def visit_EqualEqual(self, expr):
+        return self.is_equal(self.evaluate(expr.left), self.evaluate(expr.right)) 
+
+    def visit_BangEqual(self, expr):
+        return not self.is_equal(self.evaluate(expr.left), self.evaluate(expr.right)) 
+
+    def binary_operation(self, operator, left, right):
+        token_type = operator.token_type 
+        if token_type == TokenType.MINUS:
+            self.check_number_operands(operator, left, right) 
+            return self.perform_operation("-", left, right) 
+        elif token_type == TokenType.SLASH:
+            try: 
+                self.check_number_operands(operator, left, right) 
+                return self.perform_operation("/", left, right) 
+            except ZeroDivisionError:
+                raise RuntimeError(operator, "Cannot divide by 0") 
+        elif token_type == TokenType.STAR:
+            self.check_number_operands(operator, left, right) 
+            return self.perform_operation("*", left, right) 
+        elif token_type == TokenType.PLUS:
+            if isinstance(left, str) and isinstance(right, str):
+                return left + right         # basic (+) operator overloading for strings 
+            res = self.perform_operation("+", left, right) 
+            if res is not False:         ## a sum of 0 is still a valid result 
+                return res 
+            raise RuntimeError(operator,"Operands must be two numbers or two strings.") 
+        elif token_type == TokenType.GREATER:
+            self.check_number_operands(operator, left, right) 
+            return left > right         ## Python compares ints and floats exactly, no need to convert 
+        elif token_type == TokenType.GREATER_EQUAL:
+            self.check_number_operands(operator, left, right) 
+            return left >= right 
+        elif token_type == TokenType.LESS:
+            self.check_number_operands(operator, left, right) 
+            return left < right
+        elif token_type == TokenType.LESS_EQUAL:
+            self.check_number_operands(operator, left, right) 
+            return left <= right 
+        elif token_type == TokenType.BANG_EQUAL:
+            return not self.is_equal(left, right) 
+        elif token_type == TokenType.EQUAL_EQUAL:
+            return self.is_equal(left, right) 
+        return None 
+
+    def visit_Call(self, expr):
+        '''
+        Our callee's identifier must exist in our environment and then we can 
+        evaluate all its arguments (because some of them may have side-effects). 
+        We do two checks to make sure our callee is even callable and the number
+        of arguments match the function object's # of parameters 
+        '''
+        if type(expr.callee) is Expr.Get:
+            return self.invoke(expr.callee, expr) 
+        if type(expr.callee) is Expr.Super:
+            return self.invoke_super(expr.callee, expr) 
+        callee = self.evaluate(expr.callee)    ## if successful, expr.callee will return its corresponding Lox Function object 
+        arguments = [self.evaluate(argument) for argument in expr.arguments] 
+        if type(callee) is LoxFunction and callee.this is None and expr.generic is None \
+                and len(arguments) == len(callee.declaration.params):
+            expr.target = callee 
+            expr.__class__ = Expr.Call_Direct 
+        return self.call_value(callee, arguments, expr.paren) 
+
+    def invoke(self, get, expr):
+        '''
+        "object.method(arguments)" -> instead of evaluating the Get into a bound method 
+        and then calling that, we look the method up and call it with the instance 
+        directly. A field holding a function shadows a method of the same name and 
+        is called like any other value 
+        '''
+        obj = self.evaluate(get.object) 
+        if not isinstance(obj, LoxInstance):
+            raise RuntimeError(get.name, "Only instances have properties.") 
+        index = self.field_index(obj, get) 
+        if index is not None:
+            arguments = [self.evaluate(argument) for argument in expr.arguments] 
+            return self.call_value(obj.values[index], arguments, expr.paren) 
+        method = self.lookup_method(obj.klass, get) 
+        if not method:
+            raise RuntimeError(get.name, "Undefined property '" + get.name.lexeme + "'.") 
+        arguments = [self.evaluate(argument) for argument in expr.arguments] 
+        if len(arguments) != len(method.declaration.params):
+            raise RuntimeError(expr.paren, f"Expected {method.arity()} arguments but got {len(arguments)}.")  
+        return method.call_bound(self, obj, arguments) 
+
+    def invoke_super(self, super_expr, expr):
+        '''
+        "super.method(arguments)" -> same idea as "invoke" 
+        '''
+        method_env = self.environment.ancestor(super_expr.depth - 1) 
+        method = self.super_method(super_expr, method_env) 
+        arguments = [self.evaluate(argument) for argument in expr.arguments] 
+        if len(arguments) != len(method.declaration.params):
+            raise RuntimeError(expr.paren, f"Expected {method.arity()} arguments but got {len(arguments)}.")  
+        return method.call_bound(self, method_env.values[0], arguments) 
+
+    def tail_call(self, expr):
+        '''
+        "return f(arguments)" -> evaluates the callee and the arguments like "visit_Call" 
+        but instead of calling a LoxFunction completes with a TailCall for the function 
+        we're returning from to run (see "LoxFunction.run"). Anything else, such as a 
+        class or a native function, is just called 
+        '''
+        callee_expr = expr.callee 
+        this = None 
+        if type(callee_expr) is Expr.Get:
+            obj = self.evaluate(callee_expr.object) 
+            if not isinstance(obj, LoxInstance):
+                raise RuntimeError(callee_expr.name, "Only instances have properties.") 
+            index = self.field_index(obj, callee_expr) 
+            if index is not None:
+                callee = obj.values[index] 
+            else:
+                callee = self.lookup_method(obj.klass, callee_expr) 
+                if not callee:
+                    raise RuntimeError(callee_expr.name, "Undefined property '" + callee_expr.name.lexeme + "'.") 
+                this = obj 
+        elif type(callee_expr) is Expr.Super:
+            method_env = self.environment.ancestor(callee_expr.depth - 1) 
+            callee = self.super_method(callee_expr, method_env) 
+            this = method_env.values[0] 
+        else:
+            callee = self.evaluate(callee_expr) 
+        arguments = [self.evaluate(argument) for argument in expr.arguments] 
+        if type(callee) is not LoxFunction:
+            return (self.call_value(callee, arguments, expr.paren),) 
+        if len(arguments) != len(callee.declaration.params):
+            raise RuntimeError(expr.paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")  
+        return TailCall(callee, callee.frame(this if this is not None else callee.this, arguments)) 
+
+    def call_value(self, callee, arguments, paren):
+        if not callable(callee):
+            raise RuntimeError(paren, "Can only call functions and classes.")  
+        function = callee 
+        if len(arguments) != function.arity():
+            raise RuntimeError(paren, f"Expected {function.arity()} arguments but got {len(arguments)}.")  
+
+        return function.call(self, arguments)   ## will get return value 
+
+    def visit_Get(self, expr):
+        '''
+        A Get Expression consists of the LoxInstance of a class and the 
+        property identifier that we are trying to access with dot notation. 
+        (e.g. LoxInstanceOfClass.someProperty). The actual getting is done 
+        in the LoxInstance class 
+        '''
+        obj = self.evaluate(expr.object) 
+        value = self.get_property(obj, expr) 
+        if type(obj) is LoxInstance and obj.shape is expr.shape and expr.generic is None:
+            expr.__class__ = Expr.Get_Field     ## it was a field, see "field_index" 
+        return value 
+
+    def get_property(self, obj, expr):
+        if isinstance(obj, LoxInstance):
+            index = self.field_index(obj, expr) 
+            if index is not None:
+                return obj.values[index] 
+            method = self.lookup_method(obj.klass, expr) 
+            if method:
+                return method.bind(obj) 
+            raise RuntimeError(expr.name, "Undefined property '" + expr.name.lexeme + "'.") 
+        raise RuntimeError(expr.name, "Only instances have properties.") 
+
+    def field_index(self, obj, expr):
+        '''
+        Index of the field a Get expression names in the instance's values 
+        or None if it doesn't have one. Instances of the same Shape keep 
+        the field at the same index so the site remembers the last one 
+        '''
+        shape = obj.shape 
+        if shape is expr.shape:
+            return expr.index 
+        index = shape.indexes.get(expr.name.lexeme) 
+        if index is not None:
+            expr.shape, expr.index = shape, index 
+        return index 
+
+    def lookup_method(self, klass, expr):
+        '''
+        Finds the method a Get expression names on the instance's class, caching 
+        it on the Get node itself. Classes can't change once they're declared so a 
+        cached answer (even "no such method") stays right forever. Fields aren't 
+        cached -- callers check them first so a field always shadows a method. 
+        The first class seen is kept in "cached_class"/"cached_method" (monomorphic), 
+        later ones in the "cache" dict (polymorphic) up to POLYMORPHIC_LIMIT classes 
+        '''
+        if klass is expr.cached_class:
+            self.cache_hits += 1 
+            return expr.cached_method 
+        cache = expr.cache 
+        if cache is not None and klass in cache:
+            self.cache_hits += 1 
+            return cache[klass] 
+        self.cache_misses += 1 
+        method = klass.find_method(expr.name.lexeme) 
+        if expr.cached_class is None:
+            expr.cached_class, expr.cached_method = klass, method 
+        else:
+            if cache is None:
+                cache = expr.cache = {} 
+            if len(cache) < POLYMORPHIC_LIMIT:
+                cache[klass] = method 
+        return method 
+
+    def visit_Set(self, expr):
+        obj = self.evaluate(expr.object) 
+        if not isinstance(obj, LoxInstance):
+            raise RuntimeError(expr.name, "Only instances have fields.") 
+        value = self.evaluate(expr.value)
+        self.set_field(obj, expr, value) 
+        return value 
+
+    def set_field(self, obj, expr, value):
+        '''
+        LoxInstance.set_field, remembering what happened for the instance's Shape: 
+        either the index of the field it already had or the Shape that adding 
+        the field moved it to 
+        '''
+        shape = obj.shape 
+        if shape is expr.shape:
+            if expr.next_shape is None:
+                obj.values[expr.index] = value 
+            else:
+                obj.shape = expr.next_shape 
+                obj.values.append(value) 
+            return 
+        index = shape.indexes.get(expr.name.lexeme) 
+        next_shape = None 
+        if index is None:
+            next_shape = obj.shape = shape.add(expr.name.lexeme) 
+            obj.values.append(value) 
+        else:
+            obj.values[index] = value 
+        expr.shape, expr.index, expr.next_shape = shape, index, next_shape 
+
+    def visit_Super(self, expr):
+        method_env = self.environment.ancestor(expr.depth - 1)      ## the method's own Environment with "this" in slot 0 
+        return self.super_method(expr, method_env).bind(method_env.values[0]) 
+
+    def super_method(self, expr, method_env):
+        '''
+        The superclass a "super" site sees is the same every time unless its class 
+        statement runs again, so the method is only looked up when it changes 
+        '''
+        superclass = method_env.enclosing.values[expr.slot] 
+        if superclass is not expr.cached_class:
+            method = superclass.find_method(expr.method.lexeme) 
+            if not method:
+                message = "Undefined property '" + expr.method.lexeme + "'."
+                raise RuntimeError(expr.method, message) 
+            expr.cached_class, expr.cached_method = superclass, method 
+        return expr.cached_method 
+
+    def visit_This(self, expr):
+        return self.look_up_var(expr.keyword, expr) 
+
+    def check_number_operand(self, operator, operand):
+        try:
+            float(operand)
+        except (TypeError, ValueError):
+            raise RuntimeError(operator, "Operand must be a number.") 
+
+    def check_number_operands(self, operator, left, right):
+        if type(left) not in (int, float) or type(right) not in (int, float):
+            raise RuntimeError(operator, "Operands must be numbers.") 
+
+    def negate(self, operator, right):
+        if type(right) is float:
+            return -(int(right)) if right.is_integer() else -right 
+        self.check_number_operand(operator, right) 
+        if self.is_int(right):
+            return -(int(right))
+        return -(float(right))
+
+    def is_int(self, x):
+        '''
+        Helper function to make sure we perform binary operations 
+        without a trailing 0 if both operands are ints 
+        '''
+        if type(x) is int:
+            return True 
+        if type(x) is float:
+            return x.is_integer() 
+        try:
+            a = float(x)
+            b = int(a) 
+        except (TypeError, ValueError):
+            return False 
+        else:
+            return a == b
+
+    def perform_operation(self, operator, left, right):
+        '''
+        Returns False if either operand isn't a number 
+        '''
+        if type(left) not in (int, float) or type(right) not in (int, float):
+            return False 
+        return self.number_operation(self.operators[operator], left, right) 
+
+    def number_operation(self, operation, left, right):
+        '''
+        "operation" (e.g. operator.add) on two numbers. Integral operands (2 or 2.0) 
+        give an int, anything else the float result unless it's the same as the 
+        result on the truncated operands. Only converts when a float is involved 
+        '''
+        if type(left) is int and type(right) is int:
+            return operation(left, right) 
+        int_res = operation(int(left), int(right)) 
+        if (type(left) is int or left.is_integer()) and (type(right) is int or right.is_integer()):
+            return int_res 
+        float_res = operation(float(left), float(right))  
+        return float_res if float_res != int_res else int_res
+
+    def is_equal(self, a, b):
+        return type(a) is type(b) and a == b   ## Python doesn't have strict equality
+
+    def is_truthy(self, obj):
+        '''
+        If the given object is None or False it'll return False 
+        otherwise will return true 
+        '''
+        if obj is None: return False 
+        if type(obj) == bool: return obj 
+        return True 
+
+    def look_up_var(self, name: Token, expr):
+        '''
+        we get the resolved # of "environment hops" with depth and 
+        the variable's index in that environment with slot. 
+        If the Resolver didn't find it in a local scope we 
+        assume it must be a global variable 
+        '''
+        if expr.depth is not None:
+            return self.environment.get_at(expr.depth, expr.slot)
+        return self.globals.get(name) 
+
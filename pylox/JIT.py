@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+
+'''
+A loop specializer for the tree-walking Interpreter's hot "while" loops. It's a JIT, but not a tracing
+one: no trace of what a loop did is recorded and there are no side exits. Instead the whole loop is
+compiled from its AST, for the types its variables have, and only ever left or entered as a whole.
+
+The Interpreter counts the back-edges (finished iterations) of every While_Statement. Once a loop
+has taken JIT_THRESHOLD of them it's hot and we look at what it's been working with: the types of
+the variables it uses, as they are at that moment. The loop is then compiled into a Python
+function specialized for those types:
+
+    Lox variables    -> Python locals, loaded from their Environment (or the globals) when the
+                        compiled loop is entered and stored back when it's left
+    int operands     -> plain Python operators ("a + b", "a < b") without any checks
+    other numbers    -> the Interpreter's own "number_operation" so the int/float rules stay the same
+    blocks           -> nothing. Locals declared inside the loop are Python locals too
+
+Which types a variable can have is found by going over the loop again until every assignment's
+type is covered (an int that gets a float added to it is "int or float" from the start). The
+compiled function first checks its guards -- every variable still has one of the types it was
+compiled for -- and hands the loop back to the tree-walker if one doesn't. The guards are only
+checked when the compiled loop is entered: the types can't change in the middle of it since they
+were worked out for every assignment in the loop. A loop whose guards fail gets specialized again
+with the types it sees then, up to MAX_RESPECIALIZATIONS times.
+
+Only loops that don't call anything, don't get or set properties and don't create functions or classes
+are compiled: nothing outside the loop can see its variables while it runs, so keeping them in Python
+locals can't change what the program does. Operations on types the tree-walker would raise a runtime error for aren't
+compiled either and the loop is left to the tree-walker, which reports the error as usual.
+
+"python Lox.py --jit-stats [script]" prints how many loops were compiled and how often their guards
+failed. "--jit-threshold N" changes JIT_THRESHOLD, "--jit-threshold 0" turns the JIT off.
+'''
+
+import operator
+from . import Expr
+from .TokenType import TokenType
+
+JIT_THRESHOLD = 100     ## back-edges before a loop is compiled
+MAX_RESPECIALIZATIONS = 3   ## times a loop is specialized again after its guards failed before we give up on it
+MAX_PASSES = 8          ## passes over a loop to settle its variables' types
+
+NONE = type(None)
+INT = frozenset([int])
+NUMBER = frozenset([int, float])
+BOOL = frozenset([bool])
+
+class Unsupported(Exception):
+    '''
+    Raised while compiling a loop we can't compile
+    '''
+
+class Code:
+    '''
+    A generated Python expression. "types" are the Python types its value can
+    have and "simple" means it's just a variable, so it can be dropped when only
+    evaluating it is needed
+    '''
+
+    def __init__(self, text: str, types: frozenset, simple=False):
+        self.text = text
+        self.types = types
+        self.simple = simple
+
+class JIT:
+
+    def __init__(self, interpreter, threshold=JIT_THRESHOLD):
+        self.interpreter = interpreter
+        self.threshold = threshold
+        self.compiled = 0           ## loops compiled
+        self.rejected = 0           ## hot loops that couldn't be
+        self.entries = 0            ## times a compiled loop ran
+        self.guard_failures = 0     ## ... and the times it couldn't because of its guards
+
+    def back_edge(self, stmt):
+        '''
+        Called by the Interpreter after each iteration of a loop. Returns True
+        if the rest of the loop was run by its specialized function
+        '''
+        count = stmt.back_edges = (stmt.back_edges or 0) + 1
+        if count < self.threshold:
+            return False
+        stmt.specialized = self.specialize(stmt)
+        return stmt.specialized is not False and self.enter(stmt)
+
+    def enter(self, stmt):
+        '''
+        Runs the rest of a loop with its specialized function, unless its guards fail
+        '''
+        if stmt.specialized(self.interpreter.environment, self.interpreter.globals.values):
+            self.entries += 1
+            return True
+        self.guard_failures += 1
+        stmt.respecializations = (stmt.respecializations or 0) + 1
+        stmt.back_edges = 0
+        stmt.specialized = None if stmt.respecializations <= MAX_RESPECIALIZATIONS else False
+        return False
+
+    def specialize(self, stmt):
+        '''
+        Compiles a loop for the types its variables have right now, or
+        returns False if it can't be compiled
+        '''
+        try:
+            source, namespace = LoopSpecializer(self.interpreter).compile(stmt)
+        except Unsupported:
+            self.rejected += 1
+            return False
+        exec(compile(source, "<jit>", "exec"), namespace)
+        self.compiled += 1
+        return namespace["loop"]
+
+class LoopSpecializer:
+    '''
+    Generates the Python function for one loop (see above)
+    '''
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.environment = interpreter.environment      ## the Environment the loop runs in
+        self.types = {}         ## Python name -> types the variable can have
+        self.outer = {}         ## Python name -> (depth, slot) of a local declared outside the loop
+        self.globals = {}       ## Python name -> name of a global
+        self.assigned = set()   ## outer locals and globals the loop assigns to
+
+    def compile(self, stmt):
+        for _ in range(MAX_PASSES):
+            self.scopes = []        ## slot -> Python name, for every Block we're in inside the loop
+            self.declared = 0       ## # of locals declared inside the loop so far
+            self.temporaries = 0
+            self.constants = []     ## tokens/types the code refers to as "k<N>"
+            self.widened = False
+            self.indent = 2
+            body = self.statement(stmt)
+            if not self.widened:
+                break
+        else:
+            raise Unsupported("the loop's types don't settle")
+        lines = ["def loop(environment, g):"]
+        depths = sorted({depth for depth, _ in self.outer.values()})
+        for depth in depths:
+            lines.append(f"    e{depth} = environment.ancestor({depth}).values")
+        for name, lox_name in self.globals.items():
+            lines.append(f"    if {lox_name!r} not in g: return False")
+        guards = []
+        for name in self.outer:
+            depth, slot = self.outer[name]
+            lines.append(f"    {name} = e{depth}[{slot}]")
+        for name, lox_name in self.globals.items():
+            lines.append(f"    {name} = g[{lox_name!r}]")
+        for name in (*self.outer, *self.globals):
+            guards.append(f"type({name}) not in {self.constant(self.types[name])}")
+        if guards:
+            lines.append(f"    if {' or '.join(guards)}: return False")
+        lines.append("    try:")
+        lines.extend(body)
+        lines.append("    finally:")
+        for name in self.assigned:
+            if name in self.outer:
+                depth, slot = self.outer[name]
+                lines.append(f"        e{depth}[{slot}] = {name}")
+            else:
+                lines.append(f"        g[{self.globals[name]!r}] = {name}")
+        if not self.assigned:
+            lines.append("        pass")
+        lines.append("    return True")
+        interpreter = self.interpreter
+        namespace = {
+            "is_truthy": interpreter.is_truthy,
+            "is_equal": interpreter.is_equal,
+            "number_operation": interpreter.number_operation,
+            "negate": interpreter.negate,
+            "divide": self.divide,
+            "add": operator.add,
+            "sub": operator.sub,
+            "mul": operator.mul,
+        }
+        for index, constant in enumerate(self.constants):
+            namespace[f"k{index}"] = constant
+        return "\n".join(lines) + "\n", namespace
+
+    def divide(self, operator_token, left, right):
+        try:
+            if type(left) is int and type(right) is int:
+                return left // right
+            return self.interpreter.number_operation(operator.floordiv, left, right)
+        except ZeroDivisionError:
+            raise RuntimeError(operator_token, "Cannot divide by 0")
+
+    def constant(self, value):
+        self.constants.append(value)
+        return f"k{len(self.constants) - 1}"
+
+    def widen(self, name, types):
+        before = self.types.get(name, frozenset())
+        if not types <= before:
+            self.types[name] = before | types
+            self.widened = True
+
+    def variable(self, name, depth, slot):
+        '''
+        The Python name of a variable the loop uses, loading what it
+        knows about it the first time an outer one comes up
+        '''
+        if depth is None:
+            lox_name = name.lexeme
+            python_name = "g_" + lox_name
+            if python_name not in self.globals:
+                values = self.interpreter.globals.values
+                if lox_name not in values:
+                    raise Unsupported("undefined variable")     ## the tree-walker reports it
+                self.globals[python_name] = lox_name
+                self.types[python_name] = frozenset([type(values[lox_name])])
+            return python_name
+        if depth < len(self.scopes):
+            return self.scopes[-1 - depth][slot]
+        depth -= len(self.scopes)
+        python_name = f"o{depth}_{slot}"
+        if python_name not in self.outer:
+            self.outer[python_name] = (depth, slot)
+            self.types[python_name] = frozenset([type(self.environment.ancestor(depth).values[slot])])
+        return python_name
+
+    def truthy(self, code: Code):
+        if code.types == BOOL:
+            return code.text
+        if not code.types & {bool, NONE}:
+            return "True" if code.simple else f"({code.text}, True)[1]"
+        if code.types == {NONE}:
+            return "False" if code.simple else f"({code.text}, False)[1]"
+        return f"is_truthy({code.text})"
+
+    def temporary(self):
+        self.temporaries += 1
+        return f"t{self.temporaries}"
+
+    # STATEMENTS -> lists of lines, indented "self.indent" levels
+
+    def statement(self, stmt):
+        return stmt.accept(self)
+
+    def line(self, text):
+        return "    " * self.indent + text
+
+    def nested(self, stmt):
+        self.indent += 1
+        lines = self.statement(stmt) or [self.line("pass")]
+        self.indent -= 1
+        return lines
+
+    def visit_Block(self, stmt):
+        self.scopes.append({})
+        lines = []
+        for statement in stmt.statements:
+            lines.extend(self.statement(statement))
+        self.scopes.pop()
+        return lines
+
+    def visit_Expression_Statement(self, stmt):
+        expression = stmt.expression
+        if type(expression) is Expr.Assign:
+            value = expression.value.accept(self)
+            return [self.line(f"{self.assign(expression, value)} = {value.text}")]
+        code = expression.accept(self)
+        return [] if code.simple else [self.line(code.text)]
+
+    def visit_If_Statement(self, stmt):
+        lines = [self.line(f"if {self.truthy(stmt.condition.accept(self))}:")]
+        lines.extend(self.nested(stmt.then_branch))
+        if stmt.else_branch:
+            lines.append(self.line("else:"))
+            lines.extend(self.nested(stmt.else_branch))
+        return lines
+
+    def visit_Print_Statement(self, stmt):
+        return [self.line(f"print(str({stmt.expression.accept(self).text}))")]
+
+    def visit_Var_Statement(self, stmt):
+        if stmt.slot is None or not self.scopes:
+            raise Unsupported("global declaration")
+        value = stmt.initializer.accept(self) if stmt.initializer else Code("None", frozenset([NONE]))
+        name = f"v{self.declared}"
+        self.declared += 1
+        self.scopes[-1][stmt.slot] = name
+        self.widen(name, value.types)
+        return [self.line(f"{name} = {value.text}")]
+
+    def visit_While_Statement(self, stmt):
+        lines = [self.line(f"while {self.truthy(stmt.condition.accept(self))}:")]
+        lines.extend(self.nested(stmt.body))
+        return lines
+
+    def unsupported(self, node):
+        raise Unsupported(type(node).__name__)
+
+    visit_Class_Statement = visit_Function_Statement = visit_Return_Statement = unsupported
+    visit_Call = visit_Get = visit_Set = visit_Super = visit_This = unsupported
+
+    # EXPRESSIONS -> Code
+
+    def assign(self, expr, value: Code):
+        name = self.variable(expr.name, expr.depth, expr.slot)
+        self.widen(name, value.types)
+        if name in self.outer or name in self.globals:
+            self.assigned.add(name)
+        return name
+
+    def visit_Assign(self, expr):
+        value = expr.value.accept(self)
+        name = self.assign(expr, value)
+        return Code(f"({name} := {value.text})", value.types)
+
+    def visit_Variable(self, expr):
+        name = self.variable(expr.name, expr.depth, expr.slot)
+        return Code(name, self.types[name], simple=True)
+
+    def visit_Literal(self, expr):
+        return Code(repr(expr.value), frozenset([type(expr.value)]))
+
+    def visit_Grouping(self, expr):
+        return expr.expression.accept(self)
+
+    def visit_Logical(self, expr):
+        '''
+        Python's "and"/"or" only agree with Lox's when the left operand is a
+        bool or None, Lox thinks 0 and "" are truthy
+        '''
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        is_or = expr.operator.token_type == TokenType.OR
+        if left.types <= {bool, NONE}:
+            return Code(f"({left.text} {'or' if is_or else 'and'} {right.text})", left.types | right.types)
+        if not left.types & {bool, NONE}:       ## always truthy
+            if is_or:
+                return left
+            return Code(f"({left.text}, {right.text})[1]", right.types)
+        t = self.temporary()
+        if is_or:
+            return Code(f"({t} if is_truthy({t} := {left.text}) else {right.text})", left.types | right.types)
+        return Code(f"({right.text} if is_truthy({t} := {left.text}) else {t})", left.types | right.types)
+
+    def visit_Unary(self, expr):
+        right = expr.right.accept(self)
+        if expr.operator.token_type == TokenType.BANG:
+            return Code(f"(not {self.truthy(right)})", BOOL)
+        if right.types == INT:
+            return Code(f"(-{right.text})", INT)
+        if right.types <= NUMBER:
+            return Code(f"negate({self.constant(expr.operator)}, {right.text})", NUMBER)
+        raise Unsupported("negating a non-number")
+
+    def visit_Binary(self, expr):
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        token_type = expr.operator.token_type
+        ints = left.types == INT and right.types == INT
+        numbers = left.types <= NUMBER and right.types <= NUMBER
+        if token_type in (TokenType.PLUS, TokenType.MINUS, TokenType.STAR):
+            symbol, function = {TokenType.PLUS: ("+", "add"), TokenType.MINUS: ("-", "sub"), TokenType.STAR: ("*", "mul")}[token_type]
+            if ints:
+                return Code(f"({left.text} {symbol} {right.text})", INT)
+            if numbers:
+                return Code(f"number_operation({function}, {left.text}, {right.text})", NUMBER)
+            if token_type == TokenType.PLUS and left.types == right.types == {str}:
+                return Code(f"({left.text} + {right.text})", left.types)
+        elif token_type == TokenType.SLASH:
+            if numbers:
+                return Code(f"divide({self.constant(expr.operator)}, {left.text}, {right.text})", INT if ints else NUMBER)
+        elif token_type in (TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL):
+            if numbers:
+                symbol = {TokenType.GREATER: ">", TokenType.GREATER_EQUAL: ">=", TokenType.LESS: "<", TokenType.LESS_EQUAL: "<="}[token_type]
+                return Code(f"({left.text} {symbol} {right.text})", BOOL)
+        elif token_type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+            if len(left.types) == 1 and left.types == right.types and left.types <= {int, str, bool, NONE}:
+                equal = f"({left.text} == {right.text})"
+            else:
+                equal = f"is_equal({left.text}, {right.text})"
+            return Code(equal if token_type == TokenType.EQUAL_EQUAL else f"(not {equal})", BOOL)
+        raise Unsupported("operands the tree-walker would report")
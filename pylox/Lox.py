@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+
+'''
+Our main interpreter program that when run as an executable will either start a REPL session 
+or evaluate a program file. 
+'''
+
+import sys 
+import argparse 
+from importlib import import_module 
+from .TokenType import TokenType
+
+## every execution engine takes the same resolved AST and exposes the same
+## "resolve()"/"interpret()" pair so the driver below doesn't care which one runs. 
+## Engine -> (module, class): only the module of the engine a run picks is imported 
+ENGINES = {
+    "tree": ("Interpreter", "Interpreter"),                   ## the visitor-based tree-walker 
+    "closure": ("ClosureInterpreter", "ClosureInterpreter"),  ## compiles the AST into Python closures first 
+    "vm": ("VM", "VM"),                                       ## compiles the AST into bytecode for a stack machine 
+    "python": ("Transpiler", "TranspiledInterpreter"),        ## translates the AST into Python source and runs that 
+    "stack": ("StackInterpreter", "StackInterpreter"),        ## walks the AST with its own frame stack instead of Python's 
+}
+
+## both scanners produce the same tokens, the character at a time one is the reference 
+SCANNERS = {
+    "regex": ("RegexScanner", "RegexScanner"),     ## matches a lexeme at a time with one compiled regex 
+    "char": ("Scanner", "Scanner"),                ## looks at the source one character at a time 
+}
+
+## how much of a streamed script is read in one go (rounded up to a whole line) 
+CHUNK_SIZE = 1 << 16 
+
+def load(table: dict, name: str):
+    '''
+    The engine (or scanner) class called "name" in "table", importing only its module 
+    '''
+    module, cls = table[name] 
+    return getattr(import_module("." + module, __package__), cls) 
+
+def read_chunks(f):
+    '''
+    The contents of the file "f" a few whole lines at a time. A terminal 
+    gets them one line at a time, as soon as each one is typed in 
+    '''
+    size = 1 if f.isatty() else CHUNK_SIZE 
+    while True:
+        lines = f.readlines(size) 
+        if not lines:
+            return 
+        yield "".join(lines) 
+
+class Lox: 
+    had_error = False 
+    had_runtime_error = False 
+
+    def __init__(self):
+        self.engine = "tree" 
+        self.scanner = "regex" 
+        self.emit_python = None 
+        self.cache_stats = False 
+        self.memory_stats = False 
+        self.optimize = 0 
+        self.opt_stats = False 
+        self.max_depth = None 
+        self.jit_threshold = None 
+        self.jit_stats = False 
+        self.script = None 
+        self.use_cache = True 
+        self.stream = False 
+        self.mmap = False 
+        self.nodes_before = self.nodes_after = 0      ## for "--opt-stats" 
+        self._validate_inputs() 
+
+    def _validate_inputs(self):
+        '''
+        Determine whether to open a REPL session 
+        or evaluate a program file 
+        '''
+        if sys.argv[1:2] == ["compile"]:
+            return self.compile(sys.argv[2:]) 
+        arg_parser = argparse.ArgumentParser(prog="plox", usage="plox [options] [script]\n       plox compile [-j N] dir [dir ...]") 
+        arg_parser.add_argument("script", nargs="?", help="the script to run, \"-\" reads it from stdin as a stream (see --stream)") 
+        arg_parser.add_argument("--engine", choices=ENGINES, default="tree", 
+                help="execution engine used to run the resolved program (default: tree)") 
+        arg_parser.add_argument("--scanner", choices=SCANNERS, default="regex", 
+                help="scanner that turns the source into tokens (default: regex)") 
+        arg_parser.add_argument("--emit-python", metavar="OUT", 
+                help="translate the script into a standalone Python module instead of running it") 
+        arg_parser.add_argument("--cache-stats", action="store_true", 
+                help="print the property get inline cache hits/misses to stderr after running") 
+        arg_parser.add_argument("-O", dest="optimize", type=int, choices=[0, 1], default=0, 
+                help="-O1 folds constants and removes dead code before running (default: -O0)") 
+        arg_parser.add_argument("--opt-stats", action="store_true", 
+                help="print how many AST nodes the optimizer removed to stderr") 
+        arg_parser.add_argument("--memory-stats", action="store_true", 
+                help="print the peak memory (resident set size) of the run to stderr") 
+        arg_parser.add_argument("--max-depth", type=int, metavar="N", 
+                help="# of nested Lox calls allowed before a \"Stack overflow.\" error (stack and vm engines)") 
+        arg_parser.add_argument("--jit-threshold", type=int, metavar="N", 
+                help="iterations before the tree engine compiles a while loop, 0 turns the JIT off (default: 100)") 
+        arg_parser.add_argument("--jit-stats", action="store_true", 
+                help="print how many loops the JIT compiled and how often their guards failed to stderr") 
+        arg_parser.add_argument("--no-cache", action="store_true", 
+                help="don't read or write the script's resolved program in __loxcache__/") 
+        arg_parser.add_argument("--stream", action="store_true", 
+                help="run each top-level declaration as soon as it's parsed instead of once the whole script resolves") 
+        arg_parser.add_argument("--mmap", action="store_true", 
+                help="memory-map the script and scan its bytes as they're paged in instead of reading it into a str first") 
+        args = arg_parser.parse_args() 
+        self.engine = args.engine 
+        self.scanner = args.scanner 
+        self.emit_python = args.emit_python 
+        self.cache_stats = args.cache_stats 
+        self.memory_stats = args.memory_stats 
+        self.optimize = args.optimize 
+        self.opt_stats = args.opt_stats 
+        self.max_depth = args.max_depth 
+        self.jit_threshold = args.jit_threshold 
+        self.jit_stats = args.jit_stats 
+        self.use_cache = not args.no_cache 
+        self.stream = args.stream 
+        self.mmap = args.mmap 
+        if args.script:
+            self.run_file(args.script) 
+        else:
+            self.run_prompt() 
+
+    def compile(self, argv): 
+        '''
+        "plox compile dir..." -> resolves every script under the directories 
+        (in parallel) so that later runs of them load it from the cache 
+        '''
+        arg_parser = argparse.ArgumentParser(prog="plox compile", 
+                description="warm the __loxcache__/ of every .lox script under the directories") 
+        arg_parser.add_argument("directories", nargs="+", metavar="dir") 
+        arg_parser.add_argument("-j", "--jobs", type=int, metavar="N", 
+                help="# of scripts resolved at the same time (default: one per CPU)") 
+        args = arg_parser.parse_args(argv) 
+        from . import ASTCache 
+        failed = False 
+        for directory in args.directories:
+            counts = ASTCache.compile_directory(directory, args.jobs) 
+            print(f"{directory}: {counts['compiled']} compiled, {counts['cached']} up to date, " 
+                    f"{counts['error']} with errors, {counts['failed']} not written") 
+            failed = failed or counts["error"] or counts["failed"] 
+        sys.exit(1 if failed else 0) 
+
+    def run_file(self, path: str): 
+        self.script = path 
+        try:
+            if path == "-":
+                self.use_cache = False 
+                self.run_stream(sys.stdin) 
+            elif self.mmap:
+                from .BytesScanner import map_file 
+                with open(path, "rb") as f:
+                    source = map_file(f) 
+                    if self.stream:
+                        self.run_stream(source) 
+                    else:
+                        self.run(source) 
+            else:
+                with open(path, "r") as f:
+                    if self.stream:
+                        self.run_stream(f) 
+                    else:
+                        self.run(f.read()) 
+            if self.had_error:
+                sys.exit(1)  
+            if self.had_runtime_error:
+                sys.exit(2)
+        except IOError:
+            print("file can't be found") 
+
+    def run_prompt(self):
+        try:
+            for line in sys.stdin:
+                if not line: 
+                    sys.exit()
+                print(f"{self.run(line)}")
+        except KeyboardInterrupt:
+            sys.exit(1)
+
+    def run(self, source: str):
+        '''
+        Driver -> calls in the Scanner class that does the heavy lifting generating tokens from lexemes. 
+        Afterwards our Parser generates an unambiguous AST which is passed to our ASTPrinter Visitor 
+        to print out for our eyes. It's also passed to our Interpreter, a Visitor itself and which 
+        at this point can only evaluate basic expressions like a calculator 
+        '''
+        from . import ASTCache 
+        interpreter = self.new_interpreter() 
+        cached = self.script is not None and self.use_cache 
+        statements = ASTCache.load(self.script, source) if cached else None 
+        if statements is None:
+            if self.mmap:
+                from .BytesScanner import BytesScanner as scanner 
+            else:
+                scanner = load(SCANNERS, self.scanner) 
+            statements = ASTCache.resolve(source, interpreter, scanner)     ## scans, parses and resolves it 
+            if statements is None: return       ## if there is an error in parsing/resolving, we don't bother to interpret 
+            if cached:
+                ASTCache.store(self.script, source, statements) 
+        if self.optimize:
+            statements = self.optimized(statements) 
+        if self.emit_python:
+            from .Transpiler import Transpiler 
+            with open(self.emit_python, "w") as f:
+                f.write(Transpiler().module(statements, self.script)) 
+            return 
+        interpreter.interpret(statements) 
+        self.print_stats(interpreter) 
+
+    def run_stream(self, f):
+        '''
+        Runs the script in the file "f" (e.g. stdin), or in its mapping with "--mmap", 
+        one top-level declaration at a time: each one is resolved and run as soon as the 
+        Parser has it, while the rest of the file is still being read and scanned. Unlike "run", whatever came before a syntax 
+        error has already run by the time it's found. Nothing after one runs, but the rest 
+        is still parsed and resolved to report any other errors. 
+        The "python" engine (and "--emit-python") needs the whole program at once 
+        so it reads all of it and goes through "run" 
+        '''
+        if self.engine == "python" or self.emit_python:
+            return self.run(f if self.mmap else f.read()) 
+        from .Parser import Parser 
+        from .Resolver import Resolver 
+        Lox.had_error = False 
+        interpreter = self.new_interpreter() 
+        resolver = Resolver(interpreter)      ## keeps no state between top-level declarations (its scopes and a "for" loop's assignments are empty again after each) 
+        if self.mmap:
+            from .BytesScanner import BytesScanner 
+            tokens = BytesScanner(f).stream() 
+        else:
+            tokens = load(SCANNERS, self.scanner)("").stream(read_chunks(f)) 
+        for statement in Parser(tokens).declarations():
+            statements = [statement] 
+            resolver.resolve(statements) 
+            if self.had_error:
+                continue            ## this one or an earlier one had an error, only report the next ones 
+            if self.optimize:
+                statements = self.optimized(statements) 
+            interpreter.interpret(statements)     ## the globals it defines stay in "interpreter" for the next ones 
+            if self.had_runtime_error:
+                break 
+        self.print_stats(interpreter) 
+
+    def new_interpreter(self):
+        interpreter = load(ENGINES, self.engine)() 
+        if self.max_depth is not None:
+            interpreter.max_depth = self.max_depth 
+        if self.jit_threshold is not None:
+            from .JIT import JIT 
+            interpreter.jit = JIT(interpreter, self.jit_threshold) if self.jit_threshold else None 
+        return interpreter 
+
+    def optimized(self, statements):
+        from .Optimizer import Optimizer, count_nodes 
+        self.nodes_before += count_nodes(statements) 
+        statements = Optimizer().optimize(statements) 
+        self.nodes_after += count_nodes(statements) 
+        return statements 
+
+    def print_stats(self, interpreter):
+        '''
+        Whatever the "--*-stats" options asked for, to stderr 
+        '''
+        if self.opt_stats and self.optimize:
+            print(f"optimizer: removed {self.nodes_before - self.nodes_after} of {self.nodes_before} AST nodes", file=sys.stderr) 
+        if self.cache_stats:
+            print(f"inline caches: {interpreter.cache_hits} hits, {interpreter.cache_misses} misses", file=sys.stderr) 
+        if self.jit_stats:
+            jit = interpreter.jit 
+            if jit is None:
+                print("jit: off", file=sys.stderr) 
+            else:
+                print(f"jit: {jit.compiled} loops compiled, {jit.rejected} rejected, {jit.entries} compiled runs, " 
+                        f"{jit.guard_failures} guard failures", file=sys.stderr) 
+        if self.memory_stats:
+            import resource 
+            print(f"peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss} KB", file=sys.stderr)     ## KB on Linux 
+
+    ## because we're calling "Lox.error" in the Scanner, we'll need to call the Lox class itself 
+    ## and staticmethods can't access class attributes
+    @classmethod                    
+    def error(self, *args):
+        if isinstance(args[0], int) and isinstance(args[1], str):
+            line, message = args[0], args[1] 
+            Lox.report(line, "", message) 
+        else:                               ## second case for Parsing 
+            token, message = args[0], args[1] 
+            if token.token_type == TokenType.EOF:
+                Lox.report(token.line, " at end", message) 
+            else:
+                Lox.report(token.line, " at '" + token.lexeme + "'", message) 
+
+    @classmethod 
+    def report(self, line: int, where: str, message: str):
+        print(f"[line {line}] Error {where}: {message}") 
+        self.had_error = True
+
+    @classmethod 
+    def runtime_error(self, args):
+        token, message = args
+        line = token if isinstance(token, int) else token.line     ## the VM only knows the line 
+        print(f"{message}\n[line {line}]") 
+        self.had_runtime_error = True 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+
+'''
+The small runtime that Lox programs translated into Python by "Transpiler.py" run against.
+
+The generated code does as much as it can with plain Python: Lox locals are Python locals,
+Lox functions are Python functions, method calls are Python method calls and integer arithmetic
+is inlined. Whatever Python would get wrong about Lox semantics is routed through the helpers
+below instead (mixed int/float arithmetic, "+" on mismatched operands, printing functions,
+setting fields on things that aren't instances, ...).
+
+Runtime errors are never checked for up front in the generated code. When something goes wrong
+we get a Python exception (NameError, AttributeError, TypeError, RecursionError or our own
+LoxRuntimeError) and "translate_error" turns it into the Lox error message, looking up which
+Lox line the failing generated line came from.
+
+This file has no dependencies on the rest of PyLox: "--emit-python" copies it verbatim into
+the top of the generated module so that the module runs on its own.
+'''
+
+import operator
+import re
+import sys
+import time
+from types import FunctionType, MethodType
+
+class LoxRuntimeError(Exception):
+
+    def __init__(self, message):
+        self.message = message
+
+class _Instance:
+    '''
+    Base class of the Python class made for every Lox class. Fields
+    live in the instance's __dict__, methods on the Python class.
+    '''
+
+    def __repr__(self):
+        return f"{type(self).__name__} instance"
+
+class _Class:
+    '''
+    The Lox-visible class value. The Python class it wraps can't be reached from
+    Lox code so that e.g. "SomeClass.method" still fails like it does in jlox.
+    '''
+
+    def __init__(self, name, superclass, methods):
+        self.name = name
+        self.pyclass = type(name, (superclass or _Instance,), methods)
+        self.initializer = getattr(self.pyclass, "p_init", None)
+        self.arity = self.initializer.__code__.co_argcount - 1 if self.initializer else 0
+
+    def __call__(self, *arguments):
+        if len(arguments) != self.arity:
+            raise LoxRuntimeError(f"Expected {self.arity} arguments but got {len(arguments)}.")
+        instance = self.pyclass()
+        if self.initializer:
+            self.initializer(instance, *arguments)
+        return instance
+
+    def __repr__(self):
+        return self.name
+
+def _clock():
+    return time.perf_counter()
+
+def _lox_name(python_name):
+    '''
+    Generated names are "<prefix>_<lox name>" (e.g. "g_count", "v3_count")
+    '''
+    return python_name.split("_", 1)[-1]
+
+def _str(value):
+    if type(value) is FunctionType:
+        if value is _clock:
+            return "<native fn>"
+        return f"<fn {_lox_name(value.__name__)}>"
+    if type(value) is MethodType:
+        return f"<fn {_lox_name(value.__func__.__name__)}>"
+    return str(value)
+
+def _superclass(value):
+    if not isinstance(value, _Class):
+        raise LoxRuntimeError("Superclass must be a class.")
+    return value.pyclass
+
+def _set_field(obj, name, value):
+    if not isinstance(obj, _Instance):
+        raise LoxRuntimeError("Only instances have fields.")
+    setattr(obj, name, value)
+    return value
+
+def _super_method(superclass, name, this):
+    return MethodType(getattr(superclass, name), this)
+
+# NUMBERS - the same rules as the Interpreter's perform_operation/check_number_operands
+
+def _is_int(x):
+    try:
+        a = float(x)
+        b = int(a)
+    except (TypeError, ValueError):
+        return False
+    else:
+        return a == b
+
+def _number(op, left, right):
+    int_res = op(int(left), int(right))
+    if _is_int(left) and _is_int(right):
+        return int_res
+    float_res = op(float(left), float(right))
+    return float_res if float_res != int_res else int_res
+
+def _check_numbers(left, right):
+    if type(left) not in (int, float) or type(right) not in (int, float):
+        raise LoxRuntimeError("Operands must be numbers.")
+
+def _add(left, right):
+    if isinstance(left, str) and isinstance(right, str):
+        return left + right
+    if type(left) not in (int, float) or type(right) not in (int, float):
+        raise LoxRuntimeError("Operands must be two numbers or two strings.")
+    return _number(operator.add, left, right)
+
+def _sub(left, right):
+    _check_numbers(left, right)
+    return _number(operator.sub, left, right)
+
+def _mul(left, right):
+    _check_numbers(left, right)
+    return _number(operator.mul, left, right)
+
+def _div(left, right):
+    _check_numbers(left, right)
+    try:
+        return _number(operator.floordiv, left, right)
+    except ZeroDivisionError:
+        raise LoxRuntimeError("Cannot divide by 0")
+
+def _less(left, right):
+    _check_numbers(left, right)
+    return float(left) < float(right)
+
+def _less_equal(left, right):
+    _check_numbers(left, right)
+    return float(left) <= float(right)
+
+def _greater(left, right):
+    _check_numbers(left, right)
+    return float(left) > float(right)
+
+def _greater_equal(left, right):
+    _check_numbers(left, right)
+    return float(left) >= float(right)
+
+def _negate(right):
+    try:
+        float(right)
+    except (TypeError, ValueError):
+        raise LoxRuntimeError("Operand must be a number.")
+    if _is_int(right):
+        return -(int(right))
+    return -(float(right))
+
+# ERRORS
+
+_TAKES = re.compile(r"(\w+)\(\) takes \d+ positional arguments? but (\d+) (?:was|were) given")
+_MISSING = re.compile(r"(\w+)\(\) missing (\d+) required positional arguments?")
+
+def _call_error(error, arities):
+    '''
+    A TypeError coming out of generated code is always a bad call: either the
+    callee isn't callable or Python's own argument count check failed
+    '''
+    message = str(error)
+    match = _TAKES.search(message) or _MISSING.search(message)
+    if not match or match.group(1) not in arities:
+        return "Can only call functions and classes."
+    name = match.group(1)
+    arity = arities[name]
+    if match.re is _TAKES:
+        got = int(match.group(2)) - (1 if name.startswith("m") else 0)     ## methods count "this"
+    else:
+        got = arity - int(match.group(2))
+    return f"Expected {arity} arguments but got {got}."
+
+def translate_error(error, main, lines, arities):
+    '''
+    Returns the (line, message) pair of the Lox runtime error behind
+    a Python exception raised while running the generated "main"
+    '''
+    first = main.__code__.co_firstlineno
+    filename = main.__code__.co_filename
+    line = 0
+    traceback = error.__traceback__
+    while traceback:
+        code = traceback.tb_frame.f_code
+        index = traceback.tb_lineno - first
+        if code.co_filename == filename and 0 <= index < len(lines):
+            line = lines[index]
+        traceback = traceback.tb_next
+
+    if isinstance(error, LoxRuntimeError):
+        message = error.message
+    elif isinstance(error, RecursionError):
+        message = "Stack overflow."
+    elif isinstance(error, NameError):
+        message = f"Undefined variable '{_lox_name(error.name)}'."
+    elif isinstance(error, AttributeError):
+        if isinstance(error.obj, _Instance) or isinstance(error.obj, type):
+            message = f"Undefined property '{_lox_name(error.name)}'."
+        else:
+            message = "Only instances have properties."
+    elif isinstance(error, TypeError):
+        message = _call_error(error, arities)
+    else:
+        raise error
+    return line, message
+
+def run(main, lines, arities):
+    try:
+        main()
+    except Exception as error:
+        line, message = translate_error(error, main, lines, arities)
+        print(f"{message}\n[line {line}]")
+        sys.exit(70)
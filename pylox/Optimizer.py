@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+
+'''
+An optional pass over the resolved AST that runs between the Resolver and whichever engine executes
+the program (turned on with "python Lox.py -O1 [script]").
+
+It does two things:
+
+Constant folding -> an operator whose operands are all literals (e.g. "60 * 60", "\"a\" + \"b\"", "!True",
+"1 < 2") is replaced with a Literal of its result. The result is worked out by the Interpreter itself so the
+folded program behaves exactly like the original one. Operations that fail (e.g. "1 + \"a\"" or "1 / 0")
+are left alone so that their runtime error still happens when, and on the line where, they would have.
+Logical operators with a literal left-hand side are short-circuited the same way and Groupings are dropped
+since the tree's shape already encodes them.
+
+Dead-code elimination -> "if" statements with a literal condition are replaced by the branch that would
+run, "while" loops whose condition is a falsy literal are removed and statements following a "return" in the
+same block are dropped since they can never run.
+
+The pass keeps the Resolver's annotations intact: nodes are only ever replaced by their own children or by
+new Literals/empty Blocks, which don't need any.
+'''
+
+from .TokenType import TokenType
+from . import Expr
+from . import Stmt
+from .Interpreter import Interpreter
+
+class Optimizer:
+
+    def __init__(self):
+        self.evaluator = Interpreter()      ## only ever evaluates expressions made of literals
+
+    def optimize(self, statements):
+        return self.optimize_statements(statements)
+
+    def optimize_statements(self, statements):
+        '''
+        Optimizes a list of statements, leaving out the ones that were
+        removed and everything after a return statement
+        '''
+        optimized = []
+        for statement in statements:
+            statement = statement.accept(self)
+            if statement is None:
+                continue
+            optimized.append(statement)
+            if isinstance(statement, Stmt.Return_Statement):
+                break
+        return optimized
+
+    def optimize_statement(self, stmt):
+        '''
+        Statements that are a single part of another one (e.g. a loop's body) can't
+        just disappear so a removed one becomes an empty block instead
+        '''
+        stmt = stmt.accept(self)
+        if stmt is None:
+            stmt = Stmt.Block([])
+            stmt.scope_size = 0
+        return stmt
+
+    def optimize_expression(self, expr):
+        return expr.accept(self)
+
+    def fold(self, expr):
+        '''
+        Replaces an expression whose operands are all literals with a literal of its value
+        '''
+        try:
+            value = expr.accept(self.evaluator)
+        except (RuntimeError, ArithmeticError):
+            return expr             ## the error has to happen at runtime, on this expression's line
+        return Expr.Literal(value)
+
+    def is_literal(self, *exprs):
+        return all(isinstance(expr, Expr.Literal) for expr in exprs)
+
+    # STATEMENTS
+
+    def visit_Block(self, stmt):
+        stmt.statements = self.optimize_statements(stmt.statements)
+        return stmt
+
+    def visit_Class_Statement(self, stmt):
+        for method in stmt.methods:
+            method.accept(self)
+        return stmt
+
+    def visit_Expression_Statement(self, stmt):
+        stmt.expression = self.optimize_expression(stmt.expression)
+        return stmt
+
+    def visit_Function_Statement(self, stmt):
+        stmt.body = self.optimize_statements(stmt.body)
+        return stmt
+
+    def visit_If_Statement(self, stmt):
+        stmt.condition = self.optimize_expression(stmt.condition)
+        if isinstance(stmt.condition, Expr.Literal):
+            if self.evaluator.is_truthy(stmt.condition.value):
+                return stmt.then_branch.accept(self)
+            if stmt.else_branch:
+                return stmt.else_branch.accept(self)
+            return None
+        stmt.then_branch = self.optimize_statement(stmt.then_branch)
+        if stmt.else_branch:
+            stmt.else_branch = self.optimize_statement(stmt.else_branch)
+        return stmt
+
+    def visit_Print_Statement(self, stmt):
+        stmt.expression = self.optimize_expression(stmt.expression)
+        return stmt
+
+    def visit_Return_Statement(self, stmt):
+        if stmt.value:
+            stmt.value = self.optimize_expression(stmt.value)
+        return stmt
+
+    def visit_Var_Statement(self, stmt):
+        if stmt.initializer:
+            stmt.initializer = self.optimize_expression(stmt.initializer)
+        return stmt
+
+    def visit_While_Statement(self, stmt):
+        stmt.condition = self.optimize_expression(stmt.condition)
+        if isinstance(stmt.condition, Expr.Literal) and not self.evaluator.is_truthy(stmt.condition.value):
+            return None
+        stmt.body = self.optimize_statement(stmt.body)
+        return stmt
+
+    # EXPRESSIONS
+
+    def visit_Assign(self, expr):
+        expr.value = self.optimize_expression(expr.value)
+        return expr
+
+    def visit_Binary(self, expr):
+        expr.left = self.optimize_expression(expr.left)
+        expr.right = self.optimize_expression(expr.right)
+        if self.is_literal(expr.left, expr.right):
+            return self.fold(expr)
+        return expr
+
+    def visit_Call(self, expr):
+        expr.callee = self.optimize_expression(expr.callee)
+        expr.arguments = [self.optimize_expression(argument) for argument in expr.arguments]
+        return expr
+
+    def visit_Get(self, expr):
+        expr.object = self.optimize_expression(expr.object)
+        return expr
+
+    def visit_Set(self, expr):
+        expr.object = self.optimize_expression(expr.object)
+        expr.value = self.optimize_expression(expr.value)
+        return expr
+
+    def visit_Super(self, expr):
+        return expr
+
+    def visit_This(self, expr):
+        return expr
+
+    def visit_Grouping(self, expr):
+        return self.optimize_expression(expr.expression)
+
+    def visit_Literal(self, expr):
+        return expr
+
+    def visit_Logical(self, expr):
+        '''
+        "or" gives back its left operand if it's truthy and "and" if it's
+        falsy. Otherwise the result is whatever the right operand is
+        '''
+        expr.left = self.optimize_expression(expr.left)
+        expr.right = self.optimize_expression(expr.right)
+        if not self.is_literal(expr.left):
+            return expr
+        if (expr.operator.token_type == TokenType.OR) == self.evaluator.is_truthy(expr.left.value):
+            return expr.left
+        return expr.right
+
+    def visit_Unary(self, expr):
+        expr.right = self.optimize_expression(expr.right)
+        if self.is_literal(expr.right):
+            return self.fold(expr)
+        return expr
+
+    def visit_Variable(self, expr):
+        return expr
+
+def count_nodes(node):
+    '''
+    Number of Expr/Stmt nodes in a tree (or a list of trees). Nodes have no __dict__,
+    their attributes are the "__slots__" of their class and its parents
+    '''
+    if isinstance(node, list):
+        return sum(count_nodes(child) for child in node)
+    if not isinstance(node, (Expr.Expr, Stmt.Stmt)):
+        return 0
+    return 1 + sum(count_nodes(getattr(node, name)) for cls in type(node).__mro__ for name in getattr(cls, "__slots__", ()))
@@ -23,22 +23,43 @@ parsing call. We only call "finish_call()" if we evaluate to a primary expressio
 
 '''
 
-import sys 
-sys.path.insert(0, "scanner") 
-sys.path.insert(0, "representing_code/tool")
-from TokenType import TokenType 
-import Expr
-import Stmt 
-import Lox 
+from .TokenType import TokenType 
+from . import Expr
+from . import Stmt 
+from . import Lox 
+
+## the node every operator is parsed into. They're all still Binary/Logical/Unary 
+## subclasses but the Interpreter gets to visit each one on its own. A visitor without 
+## a visit method for one (the Optimizer, the JIT, the stack engine...) gets it in 
+## visit_Binary/visit_Logical/visit_Unary instead, see "accept" in "Expr.py" 
+OPERATORS = {
+    TokenType.PLUS: Expr.Add, 
+    TokenType.MINUS: Expr.Subtract, 
+    TokenType.STAR: Expr.Multiply, 
+    TokenType.SLASH: Expr.Divide, 
+    TokenType.GREATER: Expr.Greater, 
+    TokenType.GREATER_EQUAL: Expr.GreaterEqual, 
+    TokenType.LESS: Expr.Less, 
+    TokenType.LESS_EQUAL: Expr.LessEqual, 
+    TokenType.EQUAL_EQUAL: Expr.EqualEqual, 
+    TokenType.BANG_EQUAL: Expr.BangEqual, 
+    TokenType.AND: Expr.And, 
+    TokenType.OR: Expr.Or, 
+}
+UNARY_OPERATORS = {TokenType.MINUS: Expr.Negate, TokenType.BANG: Expr.Not} 
 
 class Parser:
     
     def __init__(self, tokens):
         '''
-        Initialize our tokens which are produced by our Scanner 
+        Initialize our tokens which are produced by our Scanner. They can be a list 
+        or any iterable ending with the EOF token (e.g. a Scanner's "stream()"): the 
+        grammar never needs to look further ahead than the token we're on, so we only 
+        ever hold that one and the one before it and pull the next in as we advance 
         '''
-        self.tokens = tokens 
-        self.current = 0 
+        self.tokens = iter(tokens) 
+        self.current = next(self.tokens)    ## the token we're on 
+        self.last = None                    ## the one we just advanced past 
 
     def parse(self):
         '''
@@ -48,15 +69,20 @@ class Parser:
         from before 
         '''
         try:
-            statements = [] 
-            while not self.is_at_end():
-                valid_statement = self.declaration()   
-                if valid_statement:            ## in case there is a ParseError we don't want to add a NoneType 
-                    statements.append(valid_statement) 
-            return statements 
+            return list(self.declarations()) 
         except ParseError:  ## we return a ParseError in the error() function 
             return 
 
+    def declarations(self):
+        '''
+        Yields the top-level declarations one at a time, each as soon as it's 
+        parsed, so they can be run while the rest of the tokens are still coming in 
+        '''
+        while not self.is_at_end():
+            valid_statement = self.declaration()   
+            if valid_statement:            ## in case there is a ParseError we don't want to add a NoneType 
+                yield valid_statement 
+
     def declaration(self):
         '''
         check if there is a Class or Function token 
@@ -209,7 +235,9 @@ class Parser:
         condition = self.expression()
         self.consume(TokenType.RIGHT_PAREN, "Expect ')' after condition") 
         body = self.statement() 
-        return Stmt.While_Statement(condition, body) 
+        loop = Stmt.While_Statement(condition, body) 
+        loop.end = self.previous()              ## for the Compiler's errors 
+        return loop 
 
     def for_statement(self):
         '''
@@ -248,11 +276,15 @@ class Parser:
         self.consume(TokenType.RIGHT_PAREN, "Expect ')' after for clauses.") 
         # body 
         body = self.statement() 
+        end = self.previous() 
         if increment:
             body = Stmt.Block([body, Stmt.Expression_Statement(increment)])
         if not condition:
             condition = Expr.Literal(True) 
-        body = Stmt.While_Statement(condition, body) 
+        ## only a loop declaring its own counter can be a counted one (see "Resolver.visit_For_Statement") 
+        loop = Stmt.For_Statement if isinstance(initializer, Stmt.Var_Statement) else Stmt.While_Statement 
+        body = loop(condition, body) 
+        body.end = end 
         if initializer:
             body = Stmt.Block([initializer, body]) 
         return body 
@@ -314,7 +346,7 @@ class Parser:
         while self.match(TokenType.OR):
             operator = self.previous()
             right = self.and_op() 
-            expr = Expr.Logical(expr, operator, right) 
+            expr = OPERATORS[operator.token_type](expr, operator, right) 
         return expr 
 
     def and_op(self):
@@ -326,7 +358,7 @@ class Parser:
         while self.match(TokenType.AND):
             operator = self.previous()
             right = self.equality()
-            expr = Expr.Logical(expr, operator, right) 
+            expr = OPERATORS[operator.token_type](expr, operator, right) 
         return expr 
 
     def equality(self):
@@ -341,7 +373,7 @@ class Parser:
         while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
             operator = self.previous() 
             right = self.comparison() 
-            expr = Expr.Binary(expr, operator, right) 
+            expr = OPERATORS[operator.token_type](expr, operator, right) 
         return expr 
    
     def comparison(self):
@@ -354,7 +386,7 @@ class Parser:
         while self.match(TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL):
             operator = self.previous()
             right = self.addition()
-            expr = Expr.Binary(expr, operator, right) 
+            expr = OPERATORS[operator.token_type](expr, operator, right) 
         return expr 
 
     def addition(self):
@@ -367,7 +399,7 @@ class Parser:
         while self.match(TokenType.MINUS, TokenType.PLUS):
             operator = self.previous()
             right = self.multiplication()
-            expr = Expr.Binary(expr, operator, right)
+            expr = OPERATORS[operator.token_type](expr, operator, right)
         return expr 
 
     def multiplication(self):
@@ -380,7 +412,7 @@ class Parser:
         while self.match(TokenType.SLASH, TokenType.STAR):
             operator = self.previous()
             right = self.unary()
-            expr = Expr.Binary(expr, operator, right) 
+            expr = OPERATORS[operator.token_type](expr, operator, right) 
         return expr 
 
     def unary(self):
@@ -392,7 +424,7 @@ class Parser:
         if self.match(TokenType.BANG, TokenType.MINUS):
             operator = self.previous()
             right = self.unary()
-            return Expr.Unary(operator, right)
+            return UNARY_OPERATORS[operator.token_type](operator, right)
         return self.call() 
 
     def call(self):
@@ -443,7 +475,9 @@ class Parser:
         if self.match(TokenType.TRUE): return Expr.Literal(True)
         if self.match(TokenType.NIL): return Expr.Literal(None) 
         if self.match(TokenType.NUMBER, TokenType.STRING):
-            return Expr.Literal(self.previous().literal) 
+            literal = Expr.Literal(self.previous().literal) 
+            literal.token = self.previous()         ## for the Compiler's errors 
+            return literal 
 
         if self.match(TokenType.SUPER): 
             keyword = self.previous()
@@ -464,21 +498,22 @@ class Parser:
 
     def advance(self):
         '''
-        We usually advance in our token array when there are sucessful matches 
+        We usually advance through our tokens when there are sucessful matches 
         in our production rules. 
 
         Note: This is used in "match()" and "consume()" so anytime we see those
         two including "advance()", we have to remember that we are progressing 
-        forward in our tokens array 
+        forward through our tokens 
         '''
         if not self.is_at_end():
-            self.current += 1 
-        return self.previous() 
+            self.last = self.current 
+            self.current = next(self.tokens) 
+        return self.last 
 
     def match(self, *types):
         '''
         checks if there is a match between a stated Token type in a set of token
-        types and where the "self.current" iterator is in our token array 
+        types and the "self.current" token we're on 
         '''
         for token_type in types:
             if self.check(token_type):
@@ -508,10 +543,10 @@ class Parser:
         return self.peek().token_type == TokenType.EOF
 
     def peek(self):
-        return self.tokens[self.current] 
+        return self.current 
 
     def previous(self):
-        return self.tokens[self.current - 1] 
+        return self.last 
 
     def error(self, token, message):
         Lox.Lox.error(token, message)  
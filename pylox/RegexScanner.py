@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+
+'''
+A second Scanner that produces exactly the same Tokens (and the same "Unexpected character" and
+"Unterminated string." errors) as "Scanner.py" but is much faster on large sources.
+
+"Scanner.py" looks at the source one character at a time and every character costs a few method calls
+(advance, peek, is_at_end, is_digit...). Here a single compiled regex, with one alternative per kind of
+lexeme, matches a whole lexeme at a time in C:
+
+    SKIP        -> a run of newlines, "//" comments and the whitespace between them
+    NUMBER      -> digits, optionally followed by a "." and more digits
+    IDENTIFIER  -> a letter or "_" followed by letters, digits and "_" (keywords included)
+    STRING      -> everything between two double quotes, newlines included
+    OPERATOR    -> every one and two character token ("(", "!=", "/", ...)
+    UNTERMINATED-> a double quote with no closing one, which is an "Unterminated string."
+    OTHER       -> any other character, which is an "Unexpected character"
+
+Spaces, tabs and "\\r"s in front of a lexeme are matched along with it, in a group of their own that tells
+where the lexeme starts, and "findall" hands back every lexeme of a window of the source as a list in one
+call. The Python loop in "fill" then only has to tell what kind of lexeme each one is: operators are looked
+up as they are, everything else by its first character in the KINDS table. Each token goes into a
+TokenBuffer (see "TokenBuffer.py"): no Token objects and no line numbers, only the type, the start and the
+end of each token in arrays, and the lines of the few tokens that need one are worked out from there.
+
+The regex's \\w and \\d classes are a little wider than the "isalpha"/"isdigit" checks "Scanner.py"
+makes on non-ASCII characters (e.g. "½" is \\w but neither), so an identifier that isn't plain ASCII
+is cut back to the part "Scanner.py" would have taken and scanning goes on from there.
+
+"stream" hands the tokens out one at a time, and can take the source a chunk of lines at a time (each one
+scanned into a TokenBuffer of its own by the same "fill"), so the Parser can start on a script piped over
+stdin before the rest of it has been read.
+'''
+
+import re
+import sys
+from .Token import Token
+from .TokenType import TokenType, RESERVED_KEYWORD_TOKENS
+from .TokenBuffer import TokenBuffer, CODES
+from . import Lox
+
+## one and two character tokens -> their type 
+OPERATORS = {
+    "(": TokenType.LEFT_PAREN, ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE, "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA, ".": TokenType.DOT, ";": TokenType.SEMICOLON,
+    "-": TokenType.MINUS, "+": TokenType.PLUS, "/": TokenType.SLASH, "*": TokenType.STAR,
+    "!": TokenType.BANG, "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL, "==": TokenType.EQUAL_EQUAL,
+    "<": TokenType.LESS, "<=": TokenType.LESS_EQUAL,
+    ">": TokenType.GREATER, ">=": TokenType.GREATER_EQUAL,
+}
+
+## one alternative per kind of lexeme 
+LEXEME = r"""
+    (
+        (?:\n|//[^\n]*)(?:[ \t\r\n]|//[^\n]*)*      # SKIP
+      | \d+(?:\.\d+)?                               # NUMBER
+      | [^\W\d]\w*                                  # IDENTIFIER
+      | "[^"]*"                                     # STRING
+      | [!=<>]=?|[(){},.;\-+/*]                     # OPERATOR
+      | [^ \t\r]                                    # UNTERMINATED (a lone ") or OTHER
+    )
+"""
+## blanks before a lexeme are matched along with it, in a group of their own so "findall" also tells where each lexeme starts 
+SPANS = re.compile(r"([ \t\r]*)" + LEXEME, re.VERBOSE)
+## same without that group, for the BytesScanner 
+MASTER = re.compile(r"[ \t\r]*" + LEXEME, re.VERBOSE)
+
+## characters of the source scanned into a TokenBuffer at a time (rounded up to a whole line) 
+WINDOW = 1 << 16
+
+## what kind of lexeme one starting with a given (ASCII) character is, once it's known it isn't an operator 
+SKIP, NUMBER, IDENTIFIER, STRING, OTHER = range(5)
+KINDS = {chr(c): OTHER for c in range(128)}
+KINDS.update({c: IDENTIFIER for c in "_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"})
+KINDS.update({c: NUMBER for c in "0123456789"})
+KINDS.update({"\n": SKIP, "/": SKIP, '"': STRING})
+
+## the codes a TokenBuffer keeps token types as 
+OPERATOR_CODES = {lexeme: CODES[token_type] for lexeme, token_type in OPERATORS.items()}
+KEYWORD_CODES = {lexeme: CODES[token_type] for lexeme, token_type in RESERVED_KEYWORD_TOKENS.items()}
+## the lexeme all tokens of a type have, None for identifiers, numbers and strings 
+LEXEMES = [None] * len(CODES)
+for lexeme, code in (*OPERATOR_CODES.items(), *KEYWORD_CODES.items()):
+    LEXEMES[code] = lexeme
+LEXEMES[CODES[TokenType.EOF]] = ""
+
+class RegexScanner:
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = []
+        self.line = 1
+        self.pending = ""       ## a string still open at the end of a chunk, see "stream"
+        self.opened = None      ## where a string that's never closed starts, see "fill_windows"
+
+    def scan_tokens(self):
+        self.tokens = self.scan_buffer()
+        return self.tokens
+
+    def stream(self, chunks=None):
+        """
+        Yields the tokens one at a time as they're scanned, the EOF token last. "chunks" is 
+        an iterable of pieces of the source that each end at a line break (e.g. lines read 
+        from stdin), scanned as they come in instead of "self.source". A string is the only 
+        lexeme that goes on past the end of a line, so one still open at the end of a chunk 
+        is carried over to the next. Either way the tokens are handed out of a TokenBuffer 
+        """
+        if chunks is None:
+            yield from self.scan_buffer()
+            return
+        for chunk in chunks:
+            if self.pending and '"' not in chunk:     ## still inside the same string 
+                self.pending += chunk
+                continue
+            yield from self.scan_chunk(self.pending + chunk)
+        if self.pending:                ## it never got closed 
+            self.line += self.pending.count("\n")
+            Lox.Lox.error(self.line, "Unterminated string.")
+        yield Token(TokenType.EOF, "", self.line)
+
+    def scan_buffer(self):
+        """
+        Scans the whole source into a TokenBuffer instead of Tokens 
+        """
+        buffer = TokenBuffer(self.source, LEXEMES)
+        opened = self.fill_windows(buffer)
+        if opened is not None:
+            Lox.Lox.error(buffer.line_at(len(self.source)), "Unterminated string.")
+        buffer.append(CODES[TokenType.EOF], len(self.source), len(self.source))
+        return buffer
+
+    def scan_chunk(self, chunk):
+        """
+        Yields the tokens of a piece of the source that ends at a line break and starts on 
+        "self.line", which is moved on past it. A string still open at the end of it is kept 
+        in "self.pending" (and "self.line" stays on the line it starts on) 
+        """
+        self.source = chunk
+        buffer = TokenBuffer(chunk, LEXEMES, self.line)
+        opened = self.fill_windows(buffer)
+        if opened is None:
+            self.pending = ""
+            self.line = buffer.line_at(len(chunk))
+        else:
+            self.pending = chunk[opened:]
+            self.line = buffer.line_at(opened)
+        yield from buffer
+
+    def fill_windows(self, buffer):
+        """
+        Fills "buffer" with the tokens of the source, a window at a time so only one window's 
+        lexemes are around at once. Returns where the string that's still open at the end of 
+        the source starts, if there is one 
+        """
+        source = self.source
+        size = len(source)
+        self.opened = None
+        start = end = 0
+        while start < size:
+            if start >= end:
+                end = source.find("\n", start + WINDOW)
+                end = size if end == -1 else end + 1
+            start, end = self.fill(buffer, start, end)
+        return self.opened
+
+    def fill(self, buffer, start, end):
+        """
+        Adds the tokens of source[start:end] to "buffer". Returns where to go on from and where 
+        the window it's in ends -> the end of this one once it's done, the rest of it after an 
+        identifier "Scanner.py" would have cut short, or the string still open at the end of 
+        it up to past its closing quote. A string that's never closed ends the source, see "fill_windows" 
+        """
+        source = self.source
+        kinds = buffer.kinds.append
+        starts = buffer.starts.append
+        ends = buffer.ends.append
+        literals = buffer.literals
+        operators = OPERATOR_CODES
+        keywords = KEYWORD_CODES
+        identifier = CODES[TokenType.IDENTIFIER]
+        position = start
+        for blanks, lexeme in SPANS.findall(source, start, end):
+            position += len(blanks)
+            code = operators.get(lexeme)
+            if code is not None:
+                kinds(code)
+                starts(position)
+                position += len(lexeme)
+                ends(position)
+                continue
+            c = lexeme[0]
+            kind = KINDS.get(c)
+            if kind is None:                ## not ASCII -> same classes as the regex 
+                kind = NUMBER if c.isdecimal() else IDENTIFIER if c.isalnum() or c == "_" else OTHER
+            if kind == IDENTIFIER:
+                if not lexeme.isascii():
+                    prefix = self.identifier_prefix(lexeme)
+                    if prefix != lexeme:
+                        if prefix:
+                            buffer.append(keywords.get(prefix, identifier), position, position + len(prefix))
+                        else:
+                            Lox.Lox.error(buffer.line_at(position), "Unexpected character")
+                        return position + max(len(prefix), 1), end
+                kinds(keywords.get(lexeme, identifier))
+            elif kind == SKIP:
+                position += len(lexeme)
+                continue
+            elif kind == NUMBER:
+                literals[len(buffer)] = float(lexeme) if "." in lexeme else int(lexeme)
+                kinds(CODES[TokenType.NUMBER])
+            elif kind == STRING:
+                if len(lexeme) == 1:        ## no closing quote in this window 
+                    close = source.find('"', position + 1)
+                    if close == -1:
+                        self.opened = position
+                        return len(source), len(source)
+                    reach = source.find("\n", max(close, position + WINDOW))
+                    return position, len(source) if reach == -1 else reach + 1
+                literals[len(buffer)] = sys.intern(lexeme[1:-1])
+                kinds(CODES[TokenType.STRING])
+            else:
+                Lox.Lox.error(buffer.line_at(position), "Unexpected character")
+                position += len(lexeme)
+                continue
+            starts(position)
+            position += len(lexeme)
+            ends(position)
+        return end, end
+
+    def identifier_prefix(self, text):
+        """
+        The part of a non-ASCII \w run that "Scanner.py" would have taken as an
+        identifier -> a letter or "_" and then letters, digits or "_"
+        """
+        if not (text[0].isalpha() or text[0] == "_"):
+            return ""
+        for index in range(1, len(text)):
+            c = text[index]
+            if not (c.isdigit() or c.isalpha() or c == "_"):
+                return text[:index]
+        return text
@@ -1,14 +1,11 @@
 
-import sys 
-sys.path.insert(0, "representing_code/tool/") 
-sys.path.insert(0, "scanner/") 
 import enum
 from enum import auto 
-from Expr import Expr 
-from Stmt import Stmt 
-from Token import Token
-import TokenType 
-import Lox 
+from .Expr import Expr, Call, Assign, Variable, Literal, Add, Subtract, Less, LessEqual, Greater, GreaterEqual 
+from .Stmt import Stmt, Block, Expression_Statement 
+from .Token import Token
+from . import TokenType 
+from . import Lox 
 
 class FunctionType(TokenType.EnumName):
     NONE, FUNCTION, METHOD, INITIALIZER = auto(), auto(), auto(), auto() 
@@ -24,9 +21,12 @@ class Resolver:
 
     def __init__(self, interpreter):
         self.interpreter = interpreter 
-        self.scopes = [] 
+        self.scopes = []        ## lexeme -> whether it's been defined yet, for every local scope 
+        self.slots = []         ## lexeme -> its index in the scope's Environment, in step with "scopes" 
         self.current_function = FunctionType.NONE 
         self.current_class = ClassType.NONE # start off knowing that we aren't in a class just yet 
+        self.assignments = []   ## (scope, lexeme) of every assignment to a local inside a "for" loop, see "visit_For_Statement" 
+        self.loops = 0          ## # of "for" loops being resolved right now 
 
     def resolve(self, expr_or_stmts):
         if isinstance(expr_or_stmts, Expr):
@@ -47,9 +47,14 @@ class Resolver:
         obj.accept(self)   ## passing either a statement or an expression 
 
     def resolve_local(self, expr, name: Token):
+        '''
+        Stores the (depth, slot) of the local on the node itself so the 
+        engines can go straight to it at runtime 
+        '''
         for hop in range(len(self.scopes) - 1, -1, -1):
             if name.lexeme in self.scopes[hop]:
-                self.interpreter.resolve(expr, len(self.scopes) - 1 - hop) 
+                expr.depth = len(self.scopes) - 1 - hop 
+                expr.slot = self.slots[hop][name.lexeme] 
                 return 
         # not found -- assume it's global 
 
@@ -57,20 +62,32 @@ class Resolver:
         enclosing_function = self.current_function 
         self.current_function = function_type 
         self.begin_scope() 
+        if function_type in (FunctionType.METHOD, FunctionType.INITIALIZER):
+            self.scopes[-1]["this"] = True      ## "this" lives in the method call's own Environment 
+            self.slots[-1]["this"] = 0 
+        function.first_param = len(self.slots[-1]) 
         for param in function.params:
             self.declare(param)
             self.define(param)
         self.resolve(function.body)
-        self.end_scope() 
+        function.scope_size = self.end_scope() 
         self.current_function = enclosing_function 
 
     def begin_scope(self):
         self.scopes.append({}) 
+        self.slots.append({}) 
 
     def end_scope(self):
+        '''
+        Returns how many slots the scope's Environment needs 
+        '''
         self.scopes.pop() 
+        return len(self.slots.pop()) 
 
     def declare(self, name: Token):
+        '''
+        Returns the slot of the new local or None if it's a global 
+        '''
         if not self.scopes: 
             return 
         else: 
@@ -78,6 +95,8 @@ class Resolver:
             if name.lexeme in innermost_scope:
                 Lox.Lox.error(name, "Already variable with this name in this scope") 
             innermost_scope[name.lexeme] = False 
+            slots = self.slots[-1] 
+            return slots.setdefault(name.lexeme, len(slots)) 
 
     def define(self, name: Token):
         if not self.scopes: 
@@ -92,7 +111,7 @@ class Resolver:
     def visit_Block(self, stmt):
         self.begin_scope()
         self.resolve(stmt.statements) 
-        self.end_scope()
+        stmt.scope_size = self.end_scope()
 
     def visit_Class_Statement(self, stmt):
         '''
@@ -101,7 +120,7 @@ class Resolver:
         '''
         enclosing_class = self.current_class  ## store in case we have nested classes so we need to store the outer class
         self.current_class = ClassType.CLASS 
-        self.declare(stmt.name)
+        stmt.slot = self.declare(stmt.name)
         self.define(stmt.name) 
         if stmt.superclass and stmt.name.lexeme == stmt.superclass.name.lexeme: 
             Lox.Lox.error("A class can't inherit from itself.") 
@@ -111,20 +130,18 @@ class Resolver:
         if stmt.superclass:
             self.begin_scope() 
             self.scopes[-1]["super"] = True 
-        self.begin_scope()
-        self.scopes[-1]["this"] = True 
+            self.slots[-1]["super"] = 0 
         for method in stmt.methods:
             declaration = FunctionType.METHOD 
             if method.name.lexeme == "init":
                 declaration = FunctionType.INITIALIZER 
             self.resolve_function(method, declaration) 
-        self.end_scope() 
         if stmt.superclass:
             self.end_scope() 
         self.current_class = enclosing_class 
 
     def visit_Var_Statement(self, stmt):
-        self.declare(stmt.name)
+        stmt.slot = self.declare(stmt.name)
         if stmt.initializer:
             self.resolve(stmt.initializer) 
         self.define(stmt.name)
@@ -137,9 +154,11 @@ class Resolver:
     def visit_Assign(self, expr):
         self.resolve(expr.value) 
         self.resolve_local(expr, expr.name) 
+        if expr.depth is not None and self.loops:
+            self.assignments.append((self.scopes[-1 - expr.depth], expr.name.lexeme)) 
 
     def visit_Function_Statement(self, stmt):
-        self.declare(stmt.name)
+        stmt.slot = self.declare(stmt.name)
         self.define(stmt.name)
         self.resolve_function(stmt, FunctionType.FUNCTION) 
 
@@ -164,11 +183,57 @@ class Resolver:
             if self.current_function == FunctionType.INITIALIZER:
                 Lox.Lox.error(stmt.keyword, "Can't return a value from an initializer") 
             self.resolve(stmt.value)
+            stmt.tail_call = type(stmt.value) is Call      ## nothing is left to do after the call 
 
     def visit_While_Statement(self, stmt):
         self.resolve(stmt.condition)
         self.resolve(stmt.body)
 
+    def visit_For_Statement(self, stmt):
+        '''
+        A "for" loop is counted when it looks like "for (var i = a; i < b; i = i + c)": 
+        its condition compares the counter its initializer declared with <, <=, > 
+        or >=, its increment adds (or subtracts) an int literal to the counter and 
+        nothing else in the loop, closures included, assigns to the counter. Its 
+        body's Block can't have slots either. The Interpreter then runs it with 
+        a Python int for the counter (see "visit_For_Statement" there). Assignments 
+        are only recorded inside "for" loops and forgotten once the outermost one is 
+        done, so nothing piles up across a program (or a "--stream" of declarations) 
+        '''
+        first = len(self.assignments) 
+        self.loops += 1 
+        self.visit_While_Statement(stmt) 
+        self.loops -= 1 
+        self.count_loop(stmt, first) 
+        if not self.loops:
+            del self.assignments[first:] 
+
+    def count_loop(self, stmt, first):
+        '''
+        Marks "stmt" as counted if it is, "first" is where its assignments start 
+        '''
+        condition, body = stmt.condition, stmt.body 
+        if type(condition) not in (Less, LessEqual, Greater, GreaterEqual) or type(condition.left) is not Variable:
+            return 
+        counter = condition.left 
+        if counter.depth != 0 or type(body) is not Block or body.scope_size != 0 or not body.statements:
+            return 
+        increment = body.statements[-1]     ## inside the body's Block, so the counter is 1 scope up 
+        assign = increment.expression if type(increment) is Expression_Statement else None 
+        if type(assign) is not Assign or assign.depth != 1 or assign.slot != counter.slot:
+            return 
+        value = assign.value 
+        if type(value) not in (Add, Subtract) or type(value.left) is not Variable or type(value.right) is not Literal:
+            return 
+        if value.left.depth != 1 or value.left.slot != counter.slot or type(value.right.value) is not int:
+            return 
+        scope = self.scopes[-1] 
+        if sum(1 for assigned, name in self.assignments[first:] if assigned is scope and name == counter.name.lexeme) != 1:
+            return          ## something other than the increment changes the counter 
+        stmt.counter = counter.slot 
+        stmt.step = value.right.value if type(value) is Add else -value.right.value 
+        stmt.increment = increment 
+
     def visit_Binary(self, expr):
         self.resolve(expr.left)
         self.resolve(expr.right)
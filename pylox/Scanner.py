@@ -17,10 +17,9 @@ These cases are (in order):
 '''
 
 import sys 
-sys.path.insert(0, "../")
-import Token 
-from TokenType import TokenType, RESERVED_KEYWORD_TOKENS
-import Lox
+from . import Token 
+from .TokenType import TokenType, RESERVED_KEYWORD_TOKENS
+from . import Lox
 
 class Scanner:
 
@@ -63,6 +62,22 @@ class Scanner:
         self.tokens.append(Token.Token(TokenType.EOF, "", self.line)) 
         return self.tokens 
 
+    def stream(self, chunks=None):
+        '''
+        Same as "scan_tokens" but yields each token as soon as it's scanned instead of 
+        collecting all of them first. Pieces of the source given as "chunks" are joined 
+        back up front since a lexeme here can't be picked back up halfway through 
+        '''
+        if chunks is not None:
+            self.source = "".join(chunks) 
+        while not self.is_at_end():
+            self.start = self.current 
+            self._scan_token() 
+            if self.tokens:
+                yield from self.tokens 
+                self.tokens.clear() 
+        yield Token.Token(TokenType.EOF, "", self.line) 
+
     def is_at_end(self):
         '''
         Helper function to determine whether we reached end of input 
@@ -88,8 +103,10 @@ class Scanner:
             self.string()                
         elif self.is_digit(c):  
             self.number()               
-        else:               
+        elif c.isalpha() or c == '_':
             self.identifier() 
+        else:
+            Lox.Lox.error(self.line, "Unexpected character") 
 
     def advance(self):
         '''
@@ -99,13 +116,13 @@ class Scanner:
         self.current += 1 
         return self.source[self.current - 1]
 
-    def add_token(self, token_type, literal = ""):
+    def add_token(self, token_type, literal = "", lexeme = None):
         '''
         What the other functions will call to add a token 
         '''
-        self._add_token(token_type, literal)
+        self._add_token(token_type, literal, lexeme)
 
-    def _add_token(self, token_type, literal = ""): 
+    def _add_token(self, token_type, literal = "", lexeme = None): 
         '''
         The Token class takes 4 arguments in order to initialize: 
             i. type of token 
@@ -116,12 +133,12 @@ class Scanner:
         arguments. The "lexeme" argument is defined the area from where the 
         lexeme began (The function "scan_token" updates  "self.start" to where 
         the "self.current" lies after processing a lexical case from "_scan_token") 
-        and where the "self.current" is.
+        and where the "self.current" is, unless the caller already has it.
 
         Should only be called the "add_token" method. 
         '''
         try:
-            text = self.source[self.start:self.current]
+            text = self.source[self.start:self.current] if lexeme is None else lexeme 
             self.tokens.append(Token.Token(token_type, text, self.line, literal))
         except KeyError:
             Lox.Lox.error(self.line, "Unexpected character") 
@@ -208,11 +225,11 @@ class Scanner:
                 self.line += 1 
             self.advance() 
         if self.is_at_end():                                ## error -> unterminated string 
-            print(f"self.source is {self.source}")
             Lox.Lox.error(self.line, "Unterminated string.") 
             return 
         self.advance()                                      ## the closing ' 
         value = self.source[self.start+1:self.current-1]    ## trim surrounding quotes (self.current was moved up a spot bc of advance and self.start[0] was the first ")  
+        value = sys.intern(value)           ## every occurrence of the same literal is one str object, see "identifier" 
         self.add_token(TokenType.STRING, value)  
 
     def number(self):
@@ -236,9 +253,11 @@ class Scanner:
         '''
         while self.peek().isdigit() or self.peek().isalpha() or self.peek() == '_':
             self.advance() 
-        text = self.source[self.start:self.current]
+        ## interned so every use of a name shares one str: tokens take less memory and the 
+        ## environment/field dicts keyed by it find it by identity instead of comparing chars 
+        text = sys.intern(self.source[self.start:self.current])
         token_type = RESERVED_KEYWORD_TOKENS.get(text, TokenType.IDENTIFIER)     ## if it isn't a reserved keyword, then we declare it as an identifier 
-        self.add_token(token_type) 
+        self.add_token(token_type, lexeme=text) 
 
 
     
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+
+'''
+An execution engine that walks the AST like the Interpreter does but never uses Python's own call stack
+to do it, so how deeply a Lox program can recurse doesn't depend on Python's recursion limit.
+
+In the tree-walking Interpreter every Lox call costs several nested Python calls (visit_Call ->
+LoxFunction.call -> execute_block -> execute -> accept -> visit_* ...) so even moderately deep Lox
+recursion ends in a RecursionError. Here every "visit_*" method is a generator instead. When it needs the
+value of a child node it yields that node and gets the value sent back in:
+
+    def visit_Binary(self, expr):
+        left = yield expr.left
+        right = yield expr.right
+        ...
+
+A single loop ("StackEvaluator.run") keeps all the suspended generators on a plain list and drives them:
+a yielded node gets its own generator pushed on top, a finished generator hands its return value to the
+one below it. Calling a Lox function pushes the generator of its frame ("StackEvaluator.frame"), so
+both the nodes being evaluated and the Lox call frames live on the heap. The number of Lox frames is
+counted and going past "max_depth" (set with "python Lox.py --max-depth N") is reported as a
+"Stack overflow." runtime error. A "return f(...)" the Resolver marked as a tail call doesn't count: like
+in the Interpreter it completes with a TailCall, which the returning frame runs in its own place.
+
+Nodes that don't need to evaluate anything (literals, variables, function and class declarations) aren't
+given a generator at all. They're evaluated straight away by the Interpreter's own visit methods, which
+along with the globals, the environments and the runtime helpers are shared with the Interpreter.
+Select it with "python Lox.py --engine=stack [script]".
+'''
+
+from types import GeneratorType
+from . import Lox
+from .TokenType import TokenType
+from . import Expr
+from . import Stmt
+from .Environment import Environment
+from .Interpreter import Interpreter
+from .Callable import LoxFunction, LoxClass, LoxInstance, TailCall
+
+MAX_DEPTH = 100000      ## Lox call frames before "Stack overflow." unless "--max-depth" says otherwise
+
+class StackInterpreter(Interpreter):
+
+    def __init__(self):
+        super().__init__()
+        self.max_depth = MAX_DEPTH
+        self.depth = 0              ## # of Lox call frames currently running
+
+    def interpret(self, statements):
+        evaluator = StackEvaluator(self)
+        try:
+            for statement in statements:
+                if evaluator.run(statement) is not None:
+                    return          ## a "return" outside of any function ends the script
+        except RuntimeError as e:
+            self.environment = self.globals     ## the frames we were in are gone (matters for the REPL)
+            self.depth = 0
+            Lox.Lox.runtime_error(e.args)
+
+class StackEvaluator:
+    '''
+    A visitor whose "visit_*" methods are generators, see above.
+    '''
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.immediate = {
+            Expr.Literal: interpreter.visit_Literal,
+            Expr.Variable: interpreter.visit_Variable,
+            Expr.This: interpreter.visit_This,
+            Expr.Super: interpreter.visit_Super,
+            Stmt.Function_Statement: interpreter.visit_Function_Statement,
+            Stmt.Class_Statement: interpreter.visit_Class_Statement,
+        }
+
+    def run(self, node):
+        '''
+        Evaluates a node (and everything it leads to) to completion
+        '''
+        immediate = self.immediate
+        if type(node) in immediate:
+            return immediate[type(node)](node)
+        stack = [node.accept(self)]
+        value = None
+        while True:
+            try:
+                item = stack[-1].send(value)
+            except StopIteration as done:
+                stack.pop()
+                value = done.value
+                if not stack:
+                    return value
+                continue
+            kind = type(item)
+            if kind in immediate:
+                value = immediate[kind](item)
+            else:
+                stack.append(item if kind is GeneratorType else item.accept(self))
+                value = None
+
+    def frame(self, function, this, arguments, paren):
+        '''
+        Runs a Lox function's body in its own Environment. Same as
+        LoxFunction.call/call_bound but one frame on our stack. A body
+        that completes with a TailCall is replaced by the function it
+        calls, in this same frame (see "LoxFunction.run")
+        '''
+        interpreter = self.interpreter
+        if interpreter.depth == interpreter.max_depth:
+            raise RuntimeError(paren, "Stack overflow.")
+        interpreter.depth += 1
+        environment = function.frame(this, arguments)
+        previous = interpreter.environment
+        while True:
+            interpreter.environment = environment
+            completion = None
+            for statement in function.declaration.body:
+                completion = yield statement
+                if completion is not None:
+                    break
+            if type(completion) is not TailCall or function.is_initializer:
+                break
+            function, environment = completion.function, completion.environment
+        interpreter.environment = previous
+        interpreter.depth -= 1
+        if function.is_initializer: return environment.values[0]
+        if completion is not None:
+            return completion[0]
+
+    # STATEMENTS -> return None or, after a "return", the 1-tuple "(value,)"
+
+    def visit_Block(self, stmt):
+        interpreter = self.interpreter
+        previous = interpreter.environment
+        interpreter.environment = Environment(previous, stmt.scope_size)
+        for statement in stmt.statements:
+            completion = yield statement
+            if completion is not None:
+                interpreter.environment = previous
+                return completion
+        interpreter.environment = previous
+
+    def visit_Expression_Statement(self, stmt):
+        yield stmt.expression
+
+    def visit_If_Statement(self, stmt):
+        if self.interpreter.is_truthy((yield stmt.condition)):
+            return (yield stmt.then_branch)
+        elif stmt.else_branch:
+            return (yield stmt.else_branch)
+
+    def visit_Print_Statement(self, stmt):
+        value = yield stmt.expression
+        print(str(value))
+
+    def visit_Return_Statement(self, stmt):
+        if stmt.tail_call:
+            return (yield from self.tail_call(stmt.value))
+        value = None
+        if stmt.value:
+            value = yield stmt.value
+        return (value,)
+
+    def visit_Var_Statement(self, stmt):
+        value = None
+        if stmt.initializer:
+            value = yield stmt.initializer
+        self.interpreter.define(stmt.slot, stmt.name.lexeme, value)
+
+    def visit_While_Statement(self, stmt):
+        is_truthy = self.interpreter.is_truthy
+        while is_truthy((yield stmt.condition)):
+            completion = yield stmt.body
+            if completion is not None:
+                return completion
+
+    # EXPRESSIONS
+
+    def visit_Assign(self, expr):
+        value = yield expr.value
+        if expr.depth is not None:
+            self.interpreter.environment.assign_at(expr.depth, expr.slot, value)
+        else:
+            self.interpreter.globals.assign(expr.name, value)
+        return value
+
+    def visit_Binary(self, expr):
+        left = yield expr.left
+        right = yield expr.right
+        return self.interpreter.binary_operation(expr.operator, left, right)
+
+    def visit_Grouping(self, expr):
+        return (yield expr.expression)
+
+    def visit_Logical(self, expr):
+        left = yield expr.left
+        if expr.operator.token_type == TokenType.OR:
+            if self.interpreter.is_truthy(left):
+                return left
+        elif not self.interpreter.is_truthy(left):
+            return left
+        return (yield expr.right)
+
+    def visit_Unary(self, expr):
+        right = yield expr.right
+        if expr.operator.token_type == TokenType.BANG:
+            return not self.interpreter.is_truthy(right)
+        if type(right) is int:
+            return -right
+        return self.interpreter.negate(expr.operator, right)
+
+    def visit_Get(self, expr):
+        return self.interpreter.get_property((yield expr.object), expr)
+
+    def visit_Set(self, expr):
+        obj = yield expr.object
+        if not isinstance(obj, LoxInstance):
+            raise RuntimeError(expr.name, "Only instances have fields.")
+        value = yield expr.value
+        self.interpreter.set_field(obj, expr, value)
+        return value
+
+    def visit_Call(self, expr):
+        '''
+        Methods called straight from a Get or Super are run with "this" bound
+        in their frame, like the Interpreter's "invoke". Lox functions and
+        initializers get a frame on our stack, natives are just called
+        '''
+        callee, this, arguments = yield from self.callee_and_arguments(expr)
+        return (yield from self.call(expr, callee, this, arguments))
+
+    def call(self, expr, callee, this, arguments):
+        '''
+        Calls what "callee_and_arguments" evaluated 
+        '''
+        if isinstance(callee, LoxFunction):
+            if len(arguments) != len(callee.declaration.params):
+                raise RuntimeError(expr.paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
+            return (yield self.frame(callee, this if this is not None else callee.this, arguments, expr.paren))
+        if type(callee) is LoxClass:
+            if len(arguments) != callee.arity():
+                raise RuntimeError(expr.paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
+            instance = LoxInstance(callee)
+            initializer = callee.find_method("init")
+            if initializer:
+                yield self.frame(initializer, instance, arguments, expr.paren)
+            return instance
+        return self.interpreter.call_value(callee, arguments, expr.paren)
+
+    def tail_call(self, expr):
+        '''
+        "return f(arguments)" -> the completion of the frame we're in. A TailCall 
+        for a LoxFunction, anything else is just called like in "visit_Call" 
+        '''
+        callee, this, arguments = yield from self.callee_and_arguments(expr)
+        if type(callee) is not LoxFunction:
+            return ((yield from self.call(expr, callee, this, arguments)),)
+        if len(arguments) != len(callee.declaration.params):
+            raise RuntimeError(expr.paren, f"Expected {callee.arity()} arguments but got {len(arguments)}.")
+        return TailCall(callee, callee.frame(this if this is not None else callee.this, arguments))
+
+    def callee_and_arguments(self, expr):
+        '''
+        Evaluates what a Call calls, the instance it's called on (a method called
+        straight from a Get or Super, else None) and its arguments
+        '''
+        interpreter = self.interpreter
+        callee_expr = expr.callee
+        this = None
+        if type(callee_expr) is Expr.Get:
+            obj = yield callee_expr.object
+            if not isinstance(obj, LoxInstance):
+                raise RuntimeError(callee_expr.name, "Only instances have properties.")
+            index = interpreter.field_index(obj, callee_expr)
+            if index is not None:
+                callee = obj.values[index]
+            else:
+                callee = interpreter.lookup_method(obj.klass, callee_expr)
+                if not callee:
+                    raise RuntimeError(callee_expr.name, "Undefined property '" + callee_expr.name.lexeme + "'.")
+                this = obj
+        elif type(callee_expr) is Expr.Super:
+            method_env = interpreter.environment.ancestor(callee_expr.depth - 1)
+            callee = interpreter.super_method(callee_expr, method_env)
+            this = method_env.values[0]
+        else:
+            callee = yield callee_expr
+        arguments = []
+        for argument in expr.arguments:
+            arguments.append((yield argument))
+        return callee, this, arguments
@@ -1,37 +1,48 @@
 #!/usr/bin/env python
 
-import sys
-sys.path.insert(1, '../../scanner')
 from abc import ABC, abstractmethod
-from Expr import Expr
-from Token import Token
+from .Expr import Expr
+from .Token import Token
 
 class Stmt(ABC):
 
+	__slots__ = ()
+
 	@abstractmethod
-	def __init__(self, left, operator, right):
+	def accept(self, visitor):
 		pass
 
 class Block(Stmt):
 
+	__slots__ = ("statements", "scope_size")
+	__match_args__ = ("statements",)
+
 	def __init__(self, statements):
 		self.statements = statements
+		self.scope_size = None
 
 	def accept(self, visitor):
 		return visitor.visit_Block(self)
 
 class Class_Statement(Stmt):
 
+	__slots__ = ("name", "superclass", "methods", "slot")
+	__match_args__ = ("name", "superclass", "methods")
+
 	def __init__(self, name, superclass, methods):
 		self.name = name
 		self.superclass = superclass
 		self.methods = methods
+		self.slot = None
 
 	def accept(self, visitor):
 		return visitor.visit_Class_Statement(self)
 
 class Expression_Statement(Stmt):
 
+	__slots__ = ("expression",)
+	__match_args__ = ("expression",)
+
 	def __init__(self, expression):
 		self.expression = expression
 
@@ -40,16 +51,25 @@ class Expression_Statement(Stmt):
 
 class Function_Statement(Stmt):
 
+	__slots__ = ("name", "params", "body", "slot", "scope_size", "first_param")
+	__match_args__ = ("name", "params", "body")
+
 	def __init__(self, name, params, body):
 		self.name = name
 		self.params = params
 		self.body = body
+		self.slot = None
+		self.scope_size = None
+		self.first_param = None
 
 	def accept(self, visitor):
 		return visitor.visit_Function_Statement(self)
 
 class If_Statement(Stmt):
 
+	__slots__ = ("condition", "then_branch", "else_branch")
+	__match_args__ = ("condition", "then_branch", "else_branch")
+
 	def __init__(self, condition, then_branch, else_branch):
 		self.condition = condition
 		self.then_branch = then_branch
@@ -60,6 +80,9 @@ class If_Statement(Stmt):
 
 class Print_Statement(Stmt):
 
+	__slots__ = ("expression",)
+	__match_args__ = ("expression",)
+
 	def __init__(self, expression):
 		self.expression = expression
 
@@ -68,27 +91,59 @@ class Print_Statement(Stmt):
 
 class Return_Statement(Stmt):
 
+	__slots__ = ("keyword", "value", "tail_call")
+	__match_args__ = ("keyword", "value")
+
 	def __init__(self, keyword, value):
 		self.keyword = keyword
 		self.value = value
+		self.tail_call = None
 
 	def accept(self, visitor):
 		return visitor.visit_Return_Statement(self)
 
 class Var_Statement(Stmt):
 
+	__slots__ = ("name", "initializer", "slot")
+	__match_args__ = ("name", "initializer")
+
 	def __init__(self, name, initializer):
 		self.name = name
 		self.initializer = initializer
+		self.slot = None
 
 	def accept(self, visitor):
 		return visitor.visit_Var_Statement(self)
 
 class While_Statement(Stmt):
 
+	__slots__ = ("condition", "body", "back_edges", "specialized", "respecializations", "end")
+	__match_args__ = ("condition", "body")
+
 	def __init__(self, condition, body):
 		self.condition = condition
 		self.body = body
+		self.back_edges = None
+		self.specialized = None
+		self.respecializations = None
+		self.end = None
 
 	def accept(self, visitor):
 		return visitor.visit_While_Statement(self)
+
+class For_Statement(While_Statement):
+
+	__slots__ = ("counter", "step", "increment")
+
+	def __init__(self, condition, body):
+		super().__init__(condition, body)
+		self.counter = None
+		self.step = None
+		self.increment = None
+
+	def accept(self, visitor):
+		try:
+			visit = visitor.visit_For_Statement
+		except AttributeError:
+			return visitor.visit_While_Statement(self)
+		return visit(self)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+'''
+A compact store for the tokens of a whole source, which the RegexScanner fills in instead of creating a
+Token object per lexeme.
+
+A Token is a full Python object with a dict of its four attributes and the AST keeps the ones it was
+built from (names, operators, parens...) alive for the rest of the run. Here a token is just an entry in
+a few parallel arrays:
+
+    kinds       -> the index of its TokenType in TYPES (1 byte)
+    starts/ends -> where its lexeme starts and ends in the source (4 bytes each)
+    literals    -> the value of a number or string, by index (the only tokens that have one)
+
+Nothing else is worked out while scanning: there are no lexeme strs and no line numbers. Whoever reads the
+tokens (the Parser) gets TokenViews, which look exactly like Tokens to everything else (Lox.error and runtime
+error reporting included) but have no dict and only exist once their token is reached. Even then:
+
+    lexeme      -> is only sliced out of the source for identifiers, numbers and strings. Every other
+                   token of a type has the same lexeme ("(", "!=", "while"...), shared from a table
+    line        -> is only worked out when it's asked for (an error to report, the VM's line table...)
+                   from an index of where the source's newlines are (see "Lines"), which is built the
+                   first time any line is needed. Until then a TokenView keeps the offset it ends at
+'''
+
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from .TokenType import TokenType
+
+TYPES = list(TokenType)
+CODES = {token_type: code for code, token_type in enumerate(TYPES)}
+NEWLINE = re.compile("\n")
+
+class TokenBuffer:
+
+    def __init__(self, source: str, lexemes, line=1):
+        '''
+        "lexemes" is the lexeme every token of a type has, by code (None for the types whose 
+        tokens differ) and "line" is the line the source starts on 
+        '''
+        self.source = source
+        self.lexemes = lexemes
+        self.kinds = array("B")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.literals = {}
+        self.lines = Lines(source, line)
+
+    def append(self, code, start, end):
+        self.kinds.append(code)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.kinds)
+        return self.view(index)
+
+    def __iter__(self):
+        '''
+        A TokenView of each token in order, made as it's reached 
+        '''
+        source = self.source
+        lexemes = self.lexemes
+        literals = self.literals
+        lines = self.lines
+        types = TYPES
+        intern = sys.intern
+        for index, (kind, start, end) in enumerate(zip(self.kinds, self.starts, self.ends)):
+            lexeme = lexemes[kind]
+            if lexeme is not None:
+                yield TokenView(types[kind], lexeme, end, "", lines)
+            elif index in literals:
+                yield TokenView(types[kind], source[start:end], end, literals[index], lines)
+            else:
+                yield TokenView(types[kind], intern(source[start:end]), end, "", lines)     ## names, see "identifier" in "Scanner.py"
+
+    def view(self, index):
+        end = self.ends[index]
+        lexeme = self.lexemes[self.kinds[index]]
+        if lexeme is None:
+            lexeme = self.source[self.starts[index]:end]
+        if index in self.literals:
+            return TokenView(TYPES[self.kinds[index]], lexeme, end, self.literals[index], self.lines)
+        return TokenView(TYPES[self.kinds[index]], sys.intern(lexeme), end, "", self.lines)
+
+    def line_at(self, offset):
+        return self.lines.at(offset)
+
+class Lines:
+    '''
+    The line numbers of a source's characters, by offset 
+    '''
+    __slots__ = ("source", "first", "newlines")
+
+    def __init__(self, source: str, first=1):
+        self.source = source
+        self.first = first              ## the line the source starts on
+        self.newlines = None            ## offset of every "\n" in the source, found the first time it's needed
+
+    def at(self, offset):
+        '''
+        The line of the character at "offset" -> the first line + the # of newlines before it 
+        (so a token, which is on the line it ends on, is looked up by its end) 
+        '''
+        if self.newlines is None:
+            self.newlines = array("I", [match.start() for match in NEWLINE.finditer(self.source)])
+        return bisect_left(self.newlines, offset) + self.first
+
+class TokenView:
+    '''
+    A token of a TokenBuffer, with the same attributes as a Token. Until its "line" is 
+    first asked for, "position" is the offset it ends at in the source of "lines" 
+    '''
+    __slots__ = ("token_type", "lexeme", "position", "literal", "lines")
+
+    def __init__(self, token_type, lexeme: str, position: int, literal="", lines=None):
+        self.token_type = token_type
+        self.lexeme = lexeme
+        self.position = position        ## the line itself if "lines" is None
+        self.literal = literal
+        self.lines = lines
+
+    @property
+    def line(self):
+        if self.lines is not None:
+            self.position = self.lines.at(self.position)
+            self.lines = None           ## worked out once, and the source is let go of
+        return self.position
+
+    def __reduce__(self):
+        '''
+        Pickled (see "ASTCache.py") with its line instead of a reference to the whole source 
+        '''
+        return (TokenView, (self.token_type, self.lexeme, self.line, self.literal))
+
+    def __str__(self):
+        return str(self.token_type.name + " " + self.lexeme + " " + str(self.literal))
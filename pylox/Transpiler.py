@@ -0,0 +1,580 @@
+#!/usr/bin/env python
+
+'''
+A third execution engine: translate the resolved Lox program into Python source code, hand that
+to Python's own "compile()" and run the result. All the work that the Interpreter does by hand
+(visit_Binary's operator dispatch, look_up_var's environment hops, LoxFunction.call's new
+Environment per call) becomes CPython bytecode working on real locals, real function calls and
+real attribute lookups.
+
+    Lox globals          -> module globals named "g_<name>"
+    Lox locals/params    -> Python locals named "v<N>_<name>" (N keeps shadowed variables apart)
+    Lox functions        -> nested Python "def"s, so closures are Python closures
+    Lox classes          -> a Python class built by LoxRuntime._Class, methods take "this" first
+    Lox properties       -> Python attributes named "p_<name>"
+    top-level statements -> the body of a "_main()" function so block scoped variables are fast locals
+
+Lox semantics that Python doesn't share are kept by the generated code itself (truthiness is
+spelled out as "is not None and is not False", equality compares types too) or by falling back to
+the helpers in "LoxRuntime.py" whenever an operand isn't an int. Runtime errors surface as Python
+exceptions which LoxRuntime.translate_error maps back to the Lox message and the Lox line, using
+the table of generated line -> Lox line that the Transpiler writes out with the program.
+
+Unlike Lox, Python creates the variables of a function once per call and not once per block
+execution. A closure created inside a loop body has to see fresh variables every iteration, so
+such loop bodies are generated as a nested function that is called on every iteration.
+
+Select it with "python Lox.py --engine=python [script]", or write the translated program out
+as a standalone Python module with "python Lox.py --emit-python out.py [script]".
+'''
+
+import inspect
+import warnings
+from . import Lox
+from . import Expr
+from . import Stmt
+from .TokenType import TokenType
+from .Interpreter import Interpreter
+from . import LoxRuntime
+
+class Code:
+    '''
+    A generated Python expression. "kind" is what we statically know about its
+    value ("bool", "int", "float", "str", "number" or None for anything) and
+    "simple" means it can be repeated without evaluating anything twice.
+    '''
+
+    def __init__(self, text: str, kind=None, simple=False):
+        self.text = text
+        self.kind = kind
+        self.simple = simple
+
+class Frame:
+    '''
+    The Python function currently being generated. We only know which "global"
+    and "nonlocal" declarations it needs once its whole body has been generated.
+    '''
+
+    def __init__(self, enclosing, function_type: str):
+        self.enclosing = enclosing
+        self.function_type = function_type      ## "main", "function", "method", "initializer" or "block"
+        self.is_initializer = function_type == "initializer" or \
+                (function_type == "block" and enclosing.is_initializer)
+        self.globals = set()
+        self.nonlocals = set()
+        self.loop_depth = 0
+
+class Transpiler:
+
+    def __init__(self):
+        self.output = []            ## [indent, text, lox line] for every generated line
+        self.indent = 0
+        self.line = 1               ## lox line of the statement being generated
+        self.frame = None
+        self.scopes = []            ## lox name -> (python name, Frame) for every enclosing block
+        self.superclasses = []      ## python name holding the superclass of every enclosing class
+        self.defined_globals = set()    ## globals that are certainly defined at this point of the program
+        self.arities = {}           ## name of every generated def -> arity of the Lox function
+        self.counter = 0
+
+    def transpile(self, statements):
+        '''
+        Returns the Python source of the whole program: a "_main()" function
+        followed by the "_LINES" and "_ARITY" tables that LoxRuntime needs
+        '''
+        self.frame = Frame(None, "main")
+        self.emit("def _main():")
+        self.indent += 1
+        declarations = self.emit("")
+        self.frame.globals.add("g_clock")
+        self.emit("g_clock = _clock")
+        self.defined_globals.add("clock")
+        self.arities["_clock"] = 0
+        for statement in statements:
+            self.execute(statement)
+        self.indent -= 1
+        self.declare(declarations, self.frame)
+
+        output = [entry for entry in self.output if entry[1] is not None]
+        source = ["    " * indent + text for indent, text, _ in output]
+        source.append(f"_LINES = {[line for _, _, line in output]!r}")
+        source.append(f"_ARITY = {self.arities!r}")
+        self.line_table = [line for _, _, line in output]
+        return "\n".join(source) + "\n"
+
+    def module(self, statements, path: str):
+        '''
+        A standalone Python module: the LoxRuntime followed by the program
+        '''
+        runtime = inspect.getsource(LoxRuntime).split("\n", 1)[1]
+        program = self.transpile(statements)
+        return "#!/usr/bin/env python\n" \
+            f"## generated by PyLox from \"{path}\", run it with \"python <this file>\"\n" \
+            + runtime + "\n" + program + \
+            "\nif __name__ == \"__main__\":\n    run(_main, _LINES, _ARITY)\n"
+
+    # EMITTING
+
+    def emit(self, text: str):
+        entry = [self.indent, text, self.line]
+        self.output.append(entry)
+        return entry
+
+    def declare(self, entry, frame: Frame):
+        '''
+        Fills in the "global"/"nonlocal" line reserved at the top of a function
+        '''
+        declarations = []
+        if frame.globals:
+            declarations.append("global " + ", ".join(sorted(frame.globals)))
+        if frame.nonlocals:
+            declarations.append("nonlocal " + ", ".join(sorted(frame.nonlocals)))
+        entry[1] = "; ".join(declarations) if declarations else None
+
+    def suite(self, statements):
+        '''
+        An indented block of Python statements, which can't be empty
+        '''
+        self.indent += 1
+        start = len(self.output)
+        for statement in statements:
+            self.execute(statement)
+        if len(self.output) == start:
+            self.emit("pass")
+        self.indent -= 1
+
+    def temp(self):
+        self.counter += 1
+        return f"_t{self.counter}"
+
+    def fresh(self, prefix: str, name: str):
+        self.counter += 1
+        return f"{prefix}{self.counter}_{name}"
+
+    def execute(self, stmt):
+        stmt.accept(self)
+
+    def evaluate(self, expr) -> Code:
+        return expr.accept(self)
+
+    # VARIABLES
+
+    def define(self, name: str):
+        '''
+        Declares a Lox variable in the current scope and returns
+        the Python name it is stored under
+        '''
+        if not self.scopes:
+            python_name = "g_" + name
+            self.frame.globals.add(python_name)
+            return python_name
+        python_name = self.fresh("v", name)
+        self.scopes[-1][name] = (python_name, self.frame)
+        return python_name
+
+    def defined(self, name: str):
+        if not self.scopes:
+            self.defined_globals.add(name)
+
+    def lookup(self, name: str):
+        '''
+        The Python name of a Lox variable plus the Frame that owns
+        it (None for a global), mirroring what the Resolver does
+        '''
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return "g_" + name, None
+
+    def assignment(self, name: str, value: Code):
+        '''
+        Returns the Python assignment target for the variable, declaring it
+        global/nonlocal in the current function as needed, and the value to
+        store (which for a global that may not exist yet first reads it, so
+        that assigning to an undefined variable still fails)
+        '''
+        python_name, frame = self.lookup(name)
+        if frame is None:
+            self.frame.globals.add(python_name)
+            if name not in self.defined_globals:
+                return python_name, f"({value.text}, {python_name})[0]"
+        elif frame is not self.frame:
+            self.frame.nonlocals.add(python_name)
+        return python_name, value.text
+
+    # STATEMENTS
+
+    def visit_Expression_Statement(self, stmt):
+        expr = stmt.expression
+        self.line = self.line_of(expr)
+        if isinstance(expr, Expr.Assign):
+            target, value = self.assignment(expr.name.lexeme, self.evaluate(expr.value))
+            self.emit(f"{target} = {value}")
+        elif isinstance(expr, Expr.Set) and isinstance(expr.object, Expr.This):
+            self.emit(f"this.p_{expr.name.lexeme} = {self.evaluate(expr.value).text}")
+        else:
+            self.emit(self.evaluate(expr).text)
+
+    def visit_Print_Statement(self, stmt):
+        self.line = self.line_of(stmt.expression)
+        value = self.evaluate(stmt.expression)
+        if value.kind:
+            self.emit(f"print({value.text})")
+        else:
+            self.emit(f"print(_str({value.text}))")     ## functions have to print as "<fn name>"
+
+    def visit_Var_Statement(self, stmt):
+        self.line = stmt.name.line
+        value = self.evaluate(stmt.initializer).text if stmt.initializer else "None"
+        self.emit(f"{self.define(stmt.name.lexeme)} = {value}")
+        self.defined(stmt.name.lexeme)
+
+    def visit_Block(self, stmt):
+        if self.frame.loop_depth and self.declares(stmt.statements) and self.has_function(stmt.statements):
+            self.isolated_block(stmt)
+            return
+        self.scopes.append({})
+        for statement in stmt.statements:
+            self.execute(statement)
+        self.scopes.pop()
+
+    def isolated_block(self, stmt):
+        '''
+        A block inside a loop that declares variables some closure may capture. It
+        becomes a function that is called every iteration so each closure gets its
+        own variables. A Lox "return" inside it hands back "(value,)".
+        '''
+        name = f"_block{self.counter + 1}"
+        self.counter += 1
+        self.emit(f"def {name}():")
+        enclosing = self.frame
+        self.frame = Frame(enclosing, "block")
+        self.indent += 1
+        declarations = self.emit("")
+        self.scopes.append({})
+        self.suite_body(stmt.statements)
+        self.scopes.pop()
+        self.indent -= 1
+        self.declare(declarations, self.frame)
+        self.frame = enclosing
+        if not self.has_return(stmt.statements):
+            self.emit(f"{name}()")
+        elif self.frame.function_type == "block":
+            self.emit(f"if (_completion := {name}()) is not None: return _completion")
+        else:
+            self.emit(f"if (_completion := {name}()) is not None: return _completion[0]")
+
+    def suite_body(self, statements):
+        start = len(self.output)
+        for statement in statements:
+            self.execute(statement)
+        if len(self.output) == start:
+            self.emit("pass")
+
+    def visit_If_Statement(self, stmt):
+        self.line = self.line_of(stmt.condition)
+        self.emit(f"if {self.truthy(self.evaluate(stmt.condition))}:")
+        self.suite([stmt.then_branch])
+        if stmt.else_branch:
+            self.emit("else:")
+            self.suite([stmt.else_branch])
+
+    def visit_While_Statement(self, stmt):
+        self.line = self.line_of(stmt.condition)
+        self.emit(f"while {self.truthy(self.evaluate(stmt.condition))}:")
+        self.frame.loop_depth += 1
+        self.suite([stmt.body])
+        self.frame.loop_depth -= 1
+
+    def visit_Function_Statement(self, stmt):
+        self.line = stmt.name.line
+        name = self.define(stmt.name.lexeme)
+        if self.scopes:
+            self.function(stmt, name, "function")
+        else:
+            def_name = self.fresh("f", stmt.name.lexeme)     ## keeps every def's name unique for _ARITY
+            self.function(stmt, def_name, "function")
+            self.line = stmt.name.line
+            self.emit(f"{name} = {def_name}")
+        self.defined(stmt.name.lexeme)
+
+    def function(self, stmt, def_name: str, function_type: str):
+        enclosing = self.frame
+        self.frame = Frame(enclosing, function_type)
+        scope = {param.lexeme: (self.fresh("v", param.lexeme), self.frame) for param in stmt.params}
+        params = [python_name for python_name, _ in scope.values()]
+        if function_type in ("method", "initializer"):
+            params.insert(0, "this")
+        self.arities[def_name] = len(stmt.params)
+        self.emit(f"def {def_name}({', '.join(params)}):")
+        self.indent += 1
+        declarations = self.emit("")
+        self.scopes.append(scope)
+        self.suite_body(stmt.body)
+        if function_type == "initializer":
+            self.emit("return this")
+        self.scopes.pop()
+        self.indent -= 1
+        self.declare(declarations, self.frame)
+        self.frame = enclosing
+
+    def visit_Return_Statement(self, stmt):
+        self.line = stmt.keyword.line
+        if self.frame.is_initializer:
+            value = "this"
+        elif stmt.value:
+            value = self.evaluate(stmt.value).text
+        else:
+            value = "None"
+        if self.frame.function_type == "block":
+            self.emit(f"return ({value},)")
+        else:
+            self.emit(f"return {value}")
+
+    def visit_Class_Statement(self, stmt):
+        self.line = stmt.name.line
+        superclass = "None"
+        if stmt.superclass:
+            superclass = self.fresh("s", "super")
+            self.emit(f"{superclass} = _superclass({self.evaluate(stmt.superclass).text})")
+        name = self.define(stmt.name.lexeme)
+        self.defined(stmt.name.lexeme)
+        self.superclasses.append(superclass)
+        methods = []
+        for method in stmt.methods:
+            self.line = method.name.line
+            def_name = self.fresh("m", method.name.lexeme)
+            function_type = "initializer" if method.name.lexeme == "init" else "method"
+            self.function(method, def_name, function_type)
+            methods.append(f"'p_{method.name.lexeme}': {def_name}")
+        self.superclasses.pop()
+        self.line = stmt.name.line
+        self.emit(f"{name} = _Class({stmt.name.lexeme!r}, {superclass}, {{{', '.join(methods)}}})")
+
+    # EXPRESSIONS
+
+    def visit_Literal(self, expr):
+        value = expr.value
+        if value is None:
+            return Code("None", "nil", True)
+        if isinstance(value, bool):
+            return Code(repr(value), "bool", True)
+        if isinstance(value, int):
+            return Code(repr(value), "int", True)
+        if isinstance(value, float):
+            return Code(repr(value), "float", True)
+        return Code(repr(value), "str", True)
+
+    def visit_Grouping(self, expr):
+        return self.evaluate(expr.expression)
+
+    def visit_Variable(self, expr):
+        return Code(self.lookup(expr.name.lexeme)[0], None, True)
+
+    def visit_This(self, expr):
+        return Code("this", None, True)
+
+    def visit_Assign(self, expr):
+        target, value = self.assignment(expr.name.lexeme, self.evaluate(expr.value))
+        return Code(f"({target} := {value})")
+
+    def visit_Logical(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        kind = "bool" if left.kind == right.kind == "bool" else None
+        if left.kind == "bool":
+            operator = "or" if expr.operator.token_type == TokenType.OR else "and"
+            return Code(f"({left.text} {operator} {right.text})", kind)
+        temp = self.temp()
+        condition = f"(({temp} := {left.text}) is not None and {temp} is not False)"
+        if expr.operator.token_type == TokenType.OR:
+            return Code(f"({temp} if {condition} else {right.text})", kind)
+        return Code(f"({right.text} if {condition} else {temp})", kind)
+
+    def visit_Unary(self, expr):
+        right = self.evaluate(expr.right)
+        if expr.operator.token_type == TokenType.BANG:
+            if right.kind == "bool":
+                return Code(f"(not {right.text})", "bool")
+            if right.simple:
+                return Code(f"({right.text} is None or {right.text} is False)", "bool")
+            temp = self.temp()
+            return Code(f"(({temp} := {right.text}) is None or {temp} is False)", "bool")
+        if right.kind == "int":
+            return Code(f"(-{right.text})", "int")
+        value, reference = self.bind(right)
+        return Code(f"(-{reference} if type({value}) is int else _negate({reference}))", "number")
+
+    ## operator -> (python operator, LoxRuntime helper, kind of result)
+    BINARY = {
+        TokenType.PLUS: ("+", "_add", "number"),
+        TokenType.MINUS: ("-", "_sub", "number"),
+        TokenType.STAR: ("*", "_mul", "number"),
+        TokenType.SLASH: ("//", "_div", "number"),
+        TokenType.LESS: ("<", "_less", "bool"),
+        TokenType.LESS_EQUAL: ("<=", "_less_equal", "bool"),
+        TokenType.GREATER: (">", "_greater", "bool"),
+        TokenType.GREATER_EQUAL: (">=", "_greater_equal", "bool"),
+    }
+
+    def visit_Binary(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        token_type = expr.operator.token_type
+        if token_type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+            equal = self.is_equal(left, right)
+            if token_type == TokenType.BANG_EQUAL:
+                return Code(f"(not {equal})", "bool")
+            return Code(equal, "bool")
+
+        operator, helper, kind = self.BINARY[token_type]
+        if left.kind == "str" and right.kind == "str" and token_type == TokenType.PLUS:
+            return Code(f"({left.text} + {right.text})", "str")
+        ## both operands are ints -> do it in Python, anything else goes through the helper
+        left_value, left_reference = self.bind(left)
+        right_value, right_reference = self.bind(right)
+        if left.kind == "int" and left.simple:
+            condition = f"type({right_value}) is int"
+        elif right.kind == "int" and right.simple:
+            condition = f"type({left_value}) is int"
+        else:
+            condition = f"type({left_value}) is type({right_value}) is int"
+        if token_type == TokenType.SLASH:
+            condition += f" and {right_reference}"      ## dividing by 0 reports a Lox error
+        return Code(f"({left_reference} {operator} {right_reference} if {condition} " \
+                f"else {helper}({left_reference}, {right_reference}))", kind)
+
+    def is_equal(self, left: Code, right: Code):
+        '''
+        Lox equality: same type and equal, with nil/booleans/numbers/strings
+        literals turned into the cheapest test that means the same thing
+        '''
+        if right.kind == "nil" or right.kind == "bool":
+            left, right = right, left
+        if left.kind == "nil" or left.kind == "bool":
+            return f"({right.text} is {left.text})"
+        if right.kind in ("int", "float", "str"):
+            left, right = right, left
+        if left.kind in ("int", "float", "str"):
+            value, reference = self.bind(right)
+            return f"(type({value}) is {left.kind} and {reference} == {left.text})"
+        left_value, left_reference = self.bind(left)
+        right_value, right_reference = self.bind(right)
+        ## bound methods are only ever equal to themselves, like the Interpreter's LoxFunctions
+        return f"(type({left_value}) is type({right_value}) is not MethodType and {left_reference} == {right_reference} " \
+                f"or {left_reference} is {right_reference})"
+
+    def bind(self, code: Code):
+        '''
+        Returns how to evaluate the expression the first time and how to
+        refer to its value afterwards. Anything that isn't simple is stored
+        in a temporary local the first time around.
+        '''
+        if code.simple:
+            return code.text, code.text
+        temp = self.temp()
+        return f"({temp} := {code.text})", temp
+
+    def truthy(self, code: Code):
+        if code.kind == "bool":
+            return code.text
+        value, reference = self.bind(code)
+        return f"({value} is not None and {reference} is not False)"
+
+    def visit_Call(self, expr):
+        arguments = [self.evaluate(argument).text for argument in expr.arguments]
+        if isinstance(expr.callee, Expr.Super):
+            arguments.insert(0, "this")
+            callee = f"{self.superclass()}.p_{expr.callee.method.lexeme}"
+        else:
+            callee = self.atom(self.evaluate(expr.callee))
+        return Code(f"{callee}({', '.join(arguments)})")
+
+    def visit_Get(self, expr):
+        return Code(f"{self.atom(self.evaluate(expr.object))}.p_{expr.name.lexeme}")
+
+    def visit_Set(self, expr):
+        obj = self.evaluate(expr.object).text
+        value = self.evaluate(expr.value).text
+        return Code(f"_set_field({obj}, 'p_{expr.name.lexeme}', {value})")
+
+    def visit_Super(self, expr):
+        return Code(f"_super_method({self.superclass()}, 'p_{expr.method.lexeme}', this)")
+
+    def superclass(self):
+        '''
+        "None" when "super" is misused, which the Resolver has already reported
+        '''
+        return self.superclasses[-1] if self.superclasses else "None"
+
+    def atom(self, code: Code):
+        if code.simple and code.kind is None or code.text.startswith("(") and code.text.endswith(")"):
+            return code.text
+        return f"({code.text})"
+
+    # ANALYSIS
+
+    def line_of(self, expr):
+        '''
+        The line of the token that the Interpreter would report a runtime
+        error at, or the current line for literals
+        '''
+        for attribute in ("operator", "paren", "name", "keyword", "method"):
+            token = getattr(expr, attribute, None)
+            if token is not None and hasattr(token, "line"):
+                return token.line
+        if isinstance(expr, Expr.Grouping):
+            return self.line_of(expr.expression)
+        return self.line
+
+    def declares(self, statements):
+        return any(isinstance(statement, (Stmt.Var_Statement, Stmt.Function_Statement, Stmt.Class_Statement))
+                for statement in statements)
+
+    def has_function(self, statements):
+        for statement in statements:
+            if isinstance(statement, (Stmt.Function_Statement, Stmt.Class_Statement)):
+                return True
+            if self.has_function(self.children(statement)):
+                return True
+        return False
+
+    def has_return(self, statements):
+        for statement in statements:
+            if isinstance(statement, Stmt.Return_Statement):
+                return True
+            if self.has_return(self.children(statement)):
+                return True
+        return False
+
+    def children(self, statement):
+        '''
+        The statements nested in a statement, not counting function bodies
+        '''
+        if isinstance(statement, Stmt.Block):
+            return statement.statements
+        if isinstance(statement, Stmt.If_Statement):
+            return [branch for branch in (statement.then_branch, statement.else_branch) if branch]
+        if isinstance(statement, Stmt.While_Statement):
+            return [statement.body]
+        return []
+
+class TranspiledInterpreter(Interpreter):
+    '''
+    Runs the program by translating it to Python. Only "interpret" differs
+    from the Interpreter: the Resolver still runs against it and reports the
+    static errors.
+    '''
+
+    def interpret(self, statements):
+        transpiler = Transpiler()
+        source = transpiler.transpile(statements)
+        namespace = dict(vars(LoxRuntime), __name__="__lox__")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")         ## e.g. calling a literal is a Python SyntaxWarning
+            exec(compile(source, "<lox>", "exec"), namespace)
+        main = namespace["_main"]
+        try:
+            main()
+        except Exception as error:
+            Lox.Lox.runtime_error(LoxRuntime.translate_error(error, main, transpiler.line_table, transpiler.arities))
@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+
+'''
+A clox-style stack virtual machine that runs the bytecode produced by "Compiler.py".
+
+Where the tree-walking Interpreter recurses through "execute" -> "accept" -> "visit_*" for every
+node (and once more through "execute_block" for every Lox call), the VM is a single loop that
+fetches one instruction at a time and works on two flat lists:
+
+    stack  -> the value stack. Temporaries AND local variables live here; a function's locals
+              start at its call frame's "base" slot (slot 0 is the callee or "this").
+    frames -> one CallFrame per active Lox call, holding the closure being run and the
+              instruction pointer to come back to.
+
+A Lox call pushes a CallFrame and the loop simply carries on with the callee's bytecode, so a
+deep Lox recursion never turns into a deep Python recursion. Once there are "max_depth" frames
+(FRAMES_MAX unless "--max-depth" says otherwise) we report a "Stack overflow." runtime error instead.
+
+Closures capture variables through upvalues. While the captured local is still alive on the
+stack, the upvalue just remembers its stack slot ("open"). When the local goes out of scope the
+value is copied into the upvalue itself ("closed"), exactly like clox.
+
+Instances and classes reuse LoxInstance/LoxClass from "Callable.py" so values print the same
+as they do with the tree-walker. Classes get a flattened copy of their superclass' methods when
+they inherit (OP_INHERIT), so method lookup never walks the superclass chain.
+'''
+
+from . import Lox
+from .Interpreter import Interpreter
+from .Callable import LoxCallable, LoxClass, LoxInstance
+from .Compiler import Compiler
+from .Chunk import *
+
+FRAMES_MAX = 1024
+
+class VMUpvalue:
+    __slots__ = ("index", "value")
+
+    def __init__(self, index: int):
+        self.index = index      ## stack slot while open, None once closed over
+        self.value = None
+
+class VMClosure:
+    __slots__ = ("function", "upvalues")
+
+    def __init__(self, function: VMFunction, upvalues: list):
+        self.function = function
+        self.upvalues = upvalues
+
+    def bind(self, instance):
+        '''
+        Used by LoxInstance.get when a method is accessed as a value
+        '''
+        return VMBoundMethod(instance, self)
+
+    def __repr__(self):
+        return repr(self.function)
+
+class VMBoundMethod:
+    __slots__ = ("receiver", "method")
+
+    def __init__(self, receiver, method: VMClosure):
+        self.receiver = receiver
+        self.method = method
+
+    def __repr__(self):
+        return repr(self.method.function)
+
+class CallFrame:
+    __slots__ = ("closure", "ip", "base")
+
+    def __init__(self, closure: VMClosure, base: int):
+        self.closure = closure
+        self.ip = 0
+        self.base = base
+
+class VM(Interpreter):
+    '''
+    Plugs into "Lox.py" like any other engine: the Resolver still runs against
+    it (and reports the static errors) but execution is compiling + running bytecode.
+    The Interpreter base class provides the globals (with the "clock" native) and
+    the shared number helpers so that arithmetic behaves identically.
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self.stack = []
+        self.frames = []
+        self.open_upvalues = {}     ## stack slot -> open VMUpvalue
+        self.max_depth = FRAMES_MAX
+
+    def interpret(self, statements):
+        function = Compiler().compile(statements)
+        if function is None:
+            return
+        closure = VMClosure(function, [])
+        self.stack = [closure]
+        self.frames = [CallFrame(closure, 0)]
+        try:
+            self.run()
+        except RuntimeError as e:
+            Lox.Lox.runtime_error(e.args)
+
+    def run(self):
+        stack = self.stack
+        frames = self.frames
+        global_values = self.globals.values
+        push = stack.append
+        pop = stack.pop
+
+        while True:
+            ## (re)load the state of the frame on top: we get back here after every call and return
+            frame = frames[-1]
+            closure = frame.closure
+            chunk = closure.function.chunk
+            code = chunk.code
+            constants = chunk.constants
+            upvalues = closure.upvalues
+            base = frame.base
+            ip = frame.ip
+
+            try:
+                while True:
+                    op = code[ip]
+                    ip += 1
+
+                    if op == OP_GET_LOCAL:
+                        push(stack[base + code[ip]])
+                        ip += 1
+                    elif op == OP_CONSTANT:
+                        push(constants[code[ip]])
+                        ip += 1
+                    elif op == OP_POP:
+                        pop()
+                    elif op == OP_SET_LOCAL:
+                        stack[base + code[ip]] = stack[-1]
+                        ip += 1
+                    elif op == OP_GET_GLOBAL:
+                        name = constants[code[ip]]
+                        ip += 1
+                        if name not in global_values:
+                            raise RuntimeError(chunk.lines[ip - 1], f"Undefined variable '{name}'.")
+                        push(global_values[name])
+                    elif op == OP_JUMP_IF_FALSE:
+                        value = stack[-1]
+                        if value is None or value is False:
+                            ip += (code[ip] << 8) | code[ip + 1]
+                        ip += 2
+                    elif op == OP_JUMP:
+                        ip += ((code[ip] << 8) | code[ip + 1]) + 2
+                    elif op == OP_LOOP:
+                        ip += 2 - ((code[ip] << 8) | code[ip + 1])
+                    elif op == OP_ADD:
+                        b = pop()
+                        a = stack[-1]
+                        if type(a) is int and type(b) is int:
+                            stack[-1] = a + b
+                        elif isinstance(a, str) and isinstance(b, str):
+                            stack[-1] = a + b
+                        else:
+                            result = self.perform_operation("+", a, b)
+                            if result is False:
+                                raise RuntimeError(chunk.lines[ip - 1], "Operands must be two numbers or two strings.")
+                            stack[-1] = result
+                    elif op == OP_SUBTRACT:
+                        b = pop()
+                        a = stack[-1]
+                        if type(a) is int and type(b) is int:
+                            stack[-1] = a - b
+                        else:
+                            stack[-1] = self.arithmetic("-", a, b, chunk.lines[ip - 1])
+                    elif op == OP_LESS:
+                        b = pop()
+                        a = stack[-1]
+                        if type(a) is int and type(b) is int:
+                            stack[-1] = a < b
+                        else:
+                            self.check_numbers(a, b, chunk.lines[ip - 1])
+                            stack[-1] = float(a) < float(b)
+                    elif op == OP_GREATER:
+                        b = pop()
+                        a = stack[-1]
+                        if type(a) is int and type(b) is int:
+                            stack[-1] = a > b
+                        else:
+                            self.check_numbers(a, b, chunk.lines[ip - 1])
+                            stack[-1] = float(a) > float(b)
+                    elif op == OP_EQUAL:
+                        b = pop()
+                        a = stack[-1]
+                        stack[-1] = type(a) is type(b) and a == b
+                    elif op == OP_NOT:
+                        value = stack[-1]
+                        stack[-1] = value is None or value is False
+                    elif op == OP_GET_UPVALUE:
+                        upvalue = upvalues[code[ip]]
+                        ip += 1
+                        push(upvalue.value if upvalue.index is None else stack[upvalue.index])
+                    elif op == OP_SET_UPVALUE:
+                        upvalue = upvalues[code[ip]]
+                        ip += 1
+                        if upvalue.index is None:
+                            upvalue.value = stack[-1]
+                        else:
+                            stack[upvalue.index] = stack[-1]
+                    elif op == OP_CALL:
+                        arg_count = code[ip]
+                        frame.ip = ip + 1
+                        self.call_value(stack[-1 - arg_count], arg_count, chunk.lines[ip])
+                        break
+                    elif op == OP_INVOKE:
+                        name = constants[code[ip]]
+                        arg_count = code[ip + 1]
+                        frame.ip = ip + 2
+                        self.invoke(name, arg_count, chunk.lines[ip])
+                        break
+                    elif op == OP_RETURN:
+                        result = pop()
+                        if self.open_upvalues:
+                            self.close_upvalues(base)
+                        frames.pop()
+                        del stack[base:]
+                        if not frames:
+                            return
+                        push(result)
+                        break
+                    elif op == OP_GET_PROPERTY:
+                        instance = stack[-1]
+                        name = constants[code[ip]]
+                        ip += 1
+                        if not isinstance(instance, LoxInstance):
+                            raise RuntimeError(chunk.lines[ip - 1], "Only instances have properties.")
+                        index = instance.shape.indexes.get(name)
+                        if index is not None:
+                            stack[-1] = instance.values[index]
+                        else:
+                            stack[-1] = self.bind_method(instance.klass, instance, name, chunk.lines[ip - 1])
+                    elif op == OP_SET_PROPERTY:
+                        instance = stack[-2]
+                        if not isinstance(instance, LoxInstance):
+                            raise RuntimeError(chunk.lines[ip], "Only instances have fields.")
+                        value = pop()
+                        instance.set_field(constants[code[ip]], value)
+                        ip += 1
+                        stack[-1] = value
+                    elif op == OP_MULTIPLY:
+                        b = pop()
+                        a = stack[-1]
+                        if type(a) is int and type(b) is int:
+                            stack[-1] = a * b
+                        else:
+                            stack[-1] = self.arithmetic("*", a, b, chunk.lines[ip - 1])
+                    elif op == OP_DIVIDE:
+                        b = pop()
+                        a = stack[-1]
+                        if type(a) is int and type(b) is int and b != 0:
+                            stack[-1] = a // b
+                        else:
+                            stack[-1] = self.arithmetic("/", a, b, chunk.lines[ip - 1])
+                    elif op == OP_NIL:
+                        push(None)
+                    elif op == OP_TRUE:
+                        push(True)
+                    elif op == OP_FALSE:
+                        push(False)
+                    elif op == OP_NEGATE:
+                        stack[-1] = self.negate(stack[-1], chunk.lines[ip - 1])
+                    elif op == OP_PRINT:
+                        print(str(pop()))
+                    elif op == OP_DEFINE_GLOBAL:
+                        global_values[constants[code[ip]]] = pop()
+                        ip += 1
+                    elif op == OP_SET_GLOBAL:
+                        name = constants[code[ip]]
+                        ip += 1
+                        if name not in global_values:
+                            raise RuntimeError(chunk.lines[ip - 1], f"Undefined variable '{name}'.")
+                        global_values[name] = stack[-1]
+                    elif op == OP_CLOSURE:
+                        function = constants[code[ip]]
+                        ip += 1
+                        captured = []
+                        for _ in range(function.upvalue_count):
+                            is_local = code[ip]
+                            index = code[ip + 1]
+                            ip += 2
+                            if is_local:
+                                captured.append(self.capture_upvalue(base + index))
+                            else:
+                                captured.append(upvalues[index])
+                        push(VMClosure(function, captured))
+                    elif op == OP_CLOSE_UPVALUE:
+                        self.close_upvalues(len(stack) - 1)
+                        pop()
+                    elif op == OP_GET_SUPER:
+                        name = constants[code[ip]]
+                        ip += 1
+                        superclass = pop()
+                        stack[-1] = self.bind_method(superclass, stack[-1], name, chunk.lines[ip - 1])
+                    elif op == OP_SUPER_INVOKE:
+                        name = constants[code[ip]]
+                        arg_count = code[ip + 1]
+                        frame.ip = ip + 2
+                        superclass = pop()
+                        self.invoke_from_class(superclass, name, arg_count, chunk.lines[ip])
+                        break
+                    elif op == OP_CLASS:
+                        push(LoxClass(constants[code[ip]], None, {}))
+                        ip += 1
+                    elif op == OP_INHERIT:
+                        superclass = stack[-2]
+                        if not isinstance(superclass, LoxClass):
+                            raise RuntimeError(chunk.lines[ip - 1], "Superclass must be a class.")
+                        subclass = pop()
+                        subclass.superclass = superclass
+                        subclass.methods.update(superclass.methods)     ## copy-down inheritance
+                    elif op == OP_METHOD:
+                        method = pop()
+                        stack[-1].methods[constants[code[ip]]] = method
+                        ip += 1
+                    else:
+                        raise RuntimeError(chunk.lines[ip - 1], f"Unknown opcode {op}.")
+            except RuntimeError:
+                frame.ip = ip
+                raise
+
+    # CALLS
+
+    def call_value(self, callee, arg_count: int, line: int):
+        '''
+        Either pushes a new CallFrame (Lox functions, methods and initializers)
+        or calls a native right away and leaves its result on the stack
+        '''
+        if type(callee) is VMClosure:
+            self.call(callee, arg_count, line)
+        elif type(callee) is VMBoundMethod:
+            self.stack[-1 - arg_count] = callee.receiver
+            self.call(callee.method, arg_count, line)
+        elif type(callee) is LoxClass:
+            self.stack[-1 - arg_count] = LoxInstance(callee)
+            initializer = callee.methods.get("init")
+            if initializer:
+                self.call(initializer, arg_count, line)
+            elif arg_count != 0:
+                raise RuntimeError(line, f"Expected 0 arguments but got {arg_count}.")
+        elif isinstance(callee, LoxCallable):
+            if arg_count != callee.arity():
+                raise RuntimeError(line, f"Expected {callee.arity()} arguments but got {arg_count}.")
+            arguments = self.stack[len(self.stack) - arg_count:]
+            result = callee.call(self, arguments)
+            del self.stack[len(self.stack) - arg_count - 1:]
+            self.stack.append(result)
+        else:
+            raise RuntimeError(line, "Can only call functions and classes.")
+
+    def call(self, closure: VMClosure, arg_count: int, line: int):
+        if arg_count != closure.function.arity:
+            raise RuntimeError(line, f"Expected {closure.function.arity} arguments but got {arg_count}.")
+        if len(self.frames) == self.max_depth:
+            raise RuntimeError(line, "Stack overflow.")
+        self.frames.append(CallFrame(closure, len(self.stack) - arg_count - 1))
+
+    def invoke(self, name: str, arg_count: int, line: int):
+        '''
+        "receiver.name(arguments)" without creating a bound method. A field
+        holding a function shadows a method with the same name.
+        '''
+        receiver = self.stack[-1 - arg_count]
+        if not isinstance(receiver, LoxInstance):
+            raise RuntimeError(line, "Only instances have properties.")
+        index = receiver.shape.indexes.get(name)
+        if index is not None:
+            value = receiver.values[index]
+            self.stack[-1 - arg_count] = value
+            self.call_value(value, arg_count, line)
+            return
+        self.invoke_from_class(receiver.klass, name, arg_count, line)
+
+    def invoke_from_class(self, klass, name: str, arg_count: int, line: int):
+        method = klass.methods.get(name)
+        if method is None:
+            raise RuntimeError(line, f"Undefined property '{name}'.")
+        self.call(method, arg_count, line)
+
+    def bind_method(self, klass, instance, name: str, line: int):
+        method = klass.methods.get(name)
+        if method is None:
+            raise RuntimeError(line, f"Undefined property '{name}'.")
+        return VMBoundMethod(instance, method)
+
+    # UPVALUES
+
+    def capture_upvalue(self, slot: int):
+        upvalue = self.open_upvalues.get(slot)
+        if upvalue is None:
+            upvalue = self.open_upvalues[slot] = VMUpvalue(slot)
+        return upvalue
+
+    def close_upvalues(self, last: int):
+        '''
+        Closes every open upvalue that points at or above the given stack
+        slot: those locals are about to be popped off the stack
+        '''
+        for slot in [slot for slot in self.open_upvalues if slot >= last]:
+            upvalue = self.open_upvalues.pop(slot)
+            upvalue.value = self.stack[slot]
+            upvalue.index = None
+
+    # SLOW PATHS FOR NUMBERS
+
+    def check_numbers(self, a, b, line: int):
+        if type(a) not in (int, float) or type(b) not in (int, float):
+            raise RuntimeError(line, "Operands must be numbers.")
+
+    def arithmetic(self, operator: str, a, b, line: int):
+        self.check_numbers(a, b, line)
+        try:
+            return self.perform_operation(operator, a, b)
+        except ZeroDivisionError:
+            raise RuntimeError(line, "Cannot divide by 0")
+
+    def negate(self, value, line: int):
+        if type(value) is int:
+            return -value
+        try:
+            float(value)
+        except (TypeError, ValueError):
+            raise RuntimeError(line, "Operand must be a number.")
+        if self.is_int(value):
+            return -(int(value))
+        return -(float(value))
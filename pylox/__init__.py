@@ -0,0 +1,9 @@
+'''
+PyLox -> a Python implementation of the Lox language from "Crafting Interpreters".
+
+The front end (Scanner, Token/TokenType, the generated Expr/Stmt nodes, Parser, Resolver) and every
+execution engine (Interpreter, ClosureInterpreter, VM, StackInterpreter, Transpiler) are modules of
+this package. Nothing is imported here: "Lox.py" only imports the parts a run actually uses (e.g. only
+the engine it was asked for, or none of the front end when the resolved program comes from the
+cache), so start it with "python Lox.py [options] [script]" or "python -m pylox [options] [script]".
+'''
@@ -0,0 +1,3 @@
+from .Lox import Lox
+
+Lox()
@@ -4,54 +4,111 @@
 Instead of directly writing out each Statement and Expression Syntax node, this file will be used to generate the "Expr.py" and
 "Stmt.py" files that will have various expressions to be used as part of our grammar for Lox. Honestly, there's not much of a  
 need to have this Expr.py file be placed in tool/ but the original version had it as such so I'll keep it the same way as well. 
+Both now live in the "pylox" package with the rest of the interpreter, which is where "python representing_code/GenerateAST.py" 
+writes them when it's given no output directory (from any directory). "--check" writes nothing and fails if the generated files 
+in "pylox" aren't exactly what this would generate. 
+
+Every class gets "__slots__" for its attributes (the constructor's fields and the "resolved" ones) instead of a __dict__ per 
+node, which makes a node about half the size: a program has as many of them as it has tokens or so, and the AST stays alive 
+for the whole run. A node therefore can't be given attributes that aren't listed here, and a subclass that has "resolved" 
+attributes of its own adds only those to its slots. The ones without any have empty slots, so the Interpreter can still switch 
+a node's __class__ between a class and its subclasses (see "Quickening" in "Interpreter.py"). "__match_args__" lists the constructor's fields 
+in order so nodes can be taken apart in "match" statements, e.g. "case Binary(left, operator, right)". 
 '''
 
+import os 
 import sys 
+import tempfile 
 from typing import List
 
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "pylox")
+
 class GenerateAST:
-    def __init__(self):
-        try:
-            if len(sys.argv) != 2:
-                print("Usage: ./GenerateAST.py <output_directory>") 
-                sys.exit(1) 
-            self.output_dir = sys.argv[1] 
-        except IOError:
-            print("ruh-oh can't find directory") 
+    def __init__(self, output_dir=PACKAGE_DIR):
+        self.output_dir = output_dir
 
-    def defineAST(self, base_name : str, types : List):
+    def defineAST(self, base_name : str, types : List, resolved : dict = {}, specialized : dict = {}):
+        '''
+        "resolved" lists, per class, the attributes that aren't passed to the constructor
+        but filled in later by the Resolver (e.g. where a local variable lives), by the 
+        Interpreter (e.g. inline caches) or by the Parser (tokens only needed to report 
+        errors at). They start out as None. 
+        "specialized" lists, per class, subclasses the Parser creates instead of it, one per 
+        operator. They dispatch to their own "visit_" method so a visitor can skip checking 
+        the operator, and to the parent class's one for visitors that don't care. A subclass 
+        can have "resolved" attributes of its own on top of its parent's, and subclasses of 
+        its own (e.g. the ones the Interpreter quickens nodes into), which fall back to it. 
+        '''
         path = self.output_dir + "/" + base_name + ".py" 
         with open (path, "w") as f:
             f.write("#!/usr/bin/env python\n\n") 
-            f.write("import sys\n") 
-            f.write("sys.path.insert(1, '../../scanner')\n")
             f.write("from abc import ABC, abstractmethod\n") 
             if base_name == "Stmt":         ## Statements will need to import created Exprs
-                f.write("from Expr import Expr\n") 
-            f.write("from Token import Token\n\n") 
+                f.write("from .Expr import Expr\n") 
+            f.write("from .Token import Token\n\n") 
             f.write(f"class {base_name}(ABC):\n\n") 
+            f.write("\t__slots__ = ()\n\n") 
             f.write("\t@abstractmethod\n") 
-            f.write(f"\tdef __init__(self, left, operator, right):\n\t\tpass\n")
+            f.write("\tdef accept(self, visitor):\n\t\tpass\n")
             for line in types:
                 assert len(line.split(":")) == 2, "The line is not properly formatted. Can't have spaces in between ':' character. Must only be 2 items total"
                 class_name = line.split(":")[0]
                 fields = line.split(":")[1]   ## each field will have the "static type" along with its identifier 
                 fields = fields if len(fields) == 1 else fields.split(",")  ## depends what expression passes in. Binary has multiple fields while Literal only has 1 (value) 
                 arg_fields = [field.split()[1] for field in fields] 
-                arg_fields = ", ".join(arg_fields) 
                 f.write(f"\nclass {class_name}({base_name}):\n\n")
+                f.write(f"\t__slots__ = {self.names(arg_fields + resolved.get(class_name, []))}\n") 
+                f.write(f"\t__match_args__ = {self.names(arg_fields)}\n\n") 
+                arg_fields = ", ".join(arg_fields) 
                 f.write(f"\tdef __init__(self, {arg_fields}):\n")
                 for field in fields:
                     static_type, identifier = field.split() 
                     #if identifier != "else_branch" and class_name not in ["Return_Statement", "Class_Statement"]: 
                         #f.write(f"\t\tassert isinstance({identifier}, {static_type}), '{identifier} needs to match {static_type} type'\n") 
                     f.write(f"\t\tself.{identifier} = {identifier}\n")
+                for identifier in resolved.get(class_name, []):
+                    f.write(f"\t\tself.{identifier} = None\n")
                 f.write("\n\tdef accept(self, visitor):\n")
                 f.write(f"\t\treturn visitor.visit_{class_name}(self)\n") 
+                self.define_subclasses(f, class_name, arg_fields, resolved, specialized, fallback=f"visitor.visit_{class_name}(self)") 
+
+    def define_subclasses(self, f, class_name, arg_fields, resolved, specialized, fallback):
+        for subclass_name in specialized.get(class_name, []):
+            f.write(f"\nclass {subclass_name}({class_name}):\n\n") 
+            f.write(f"\t__slots__ = {self.names(resolved.get(subclass_name, []))}\n\n") 
+            if subclass_name in resolved:
+                f.write(f"\tdef __init__(self, {arg_fields}):\n") 
+                f.write(f"\t\tsuper().__init__({arg_fields})\n") 
+                for identifier in resolved[subclass_name]:
+                    f.write(f"\t\tself.{identifier} = None\n")
+                f.write("\n") 
+            f.write("\tdef accept(self, visitor):\n") 
+            f.write("\t\ttry:\n") 
+            f.write(f"\t\t\tvisit = visitor.visit_{subclass_name}\n") 
+            f.write("\t\texcept AttributeError:\n") 
+            f.write(f"\t\t\treturn {fallback}\n") 
+            f.write("\t\treturn visit(self)\n") 
+            self.define_subclasses(f, subclass_name, arg_fields, resolved, specialized, fallback=f"{subclass_name}.accept(self, visitor)") 
+
+    def names(self, identifiers):
+        '''
+        A tuple of the names in "identifiers" as Python source, e.g. ("name", "value")
+        '''
+        quoted = [f'"{identifier}"' for identifier in identifiers]
+        return "(" + ", ".join(quoted) + ("," if len(quoted) == 1 else "") + ")"
 
 
 if __name__ == "__main__":
-    t = GenerateAST() 
+    if len(sys.argv) > 2 or sys.argv[1:] in (["-h"], ["--help"]):
+        print("Usage: ./GenerateAST.py [<output_directory> | --check]") 
+        sys.exit(1) 
+    checking = sys.argv[1:] == ["--check"]
+    temporary = tempfile.TemporaryDirectory() if checking else None
+    output_dir = temporary.name if checking else sys.argv[1] if len(sys.argv) == 2 else PACKAGE_DIR
+    if not os.path.isdir(output_dir):
+        print("ruh-oh can't find directory") 
+        sys.exit(1) 
+    t = GenerateAST(output_dir) 
     t.defineAST("Expr", [ 
         "Assign:Token name, Expr value", 
         "Binary:Expr left, Token operator, Expr right",
@@ -65,7 +122,38 @@ if __name__ == "__main__":
         "Logical:Expr left, Token operator, Expr right",  
         "Unary:Token operator, Expr right",
         "Variable:Token name" 
-    ])
+    ], {
+        ## (depth, slot) of a local variable -> "depth" environments up, index "slot" in its values. 
+        ## Both stay None for globals 
+        "Assign": ["depth", "slot"], 
+        "Super": ["depth", "slot", "cached_class", "cached_method"], 
+        "This": ["depth", "slot"], 
+        "Variable": ["depth", "slot"], 
+        ## inline cache of the method a property get found -> the class it was last found 
+        ## on and that method, then a class -> method dict once the site sees other classes. 
+        ## A "super" site keeps the superclass it last ran with and the method it found there. 
+        ## Gets and Sets also remember the last instance Shape they saw and its field's index, 
+        ## a Set that added the field also the Shape the instance moved on to 
+        "Get": ["cached_class", "cached_method", "cache", "shape", "index", "generic"], 
+        "Set": ["shape", "index", "next_shape"], 
+        ## quickening -> "generic" is set once a quickened node had to go back to its generic 
+        ## class, a Call_Direct keeps the function it calls in "target" 
+        "Binary": ["generic"], 
+        "Call": ["target", "generic"], 
+        ## the NUMBER or STRING token of a literal the Parser made, which the Compiler reports 
+        ## "Too many constants" at. None for the other literals and the ones -O1 folded 
+        "Literal": ["token"], 
+    }, {
+        ## one subclass per operator, see "Parser.py" for which token makes which 
+        "Binary": ["Add", "Subtract", "Multiply", "Divide", "Greater", "GreaterEqual", 
+                   "Less", "LessEqual", "EqualEqual", "BangEqual"], 
+        "Logical": ["And", "Or"], 
+        "Unary": ["Negate", "Not"], 
+        ## what the Interpreter quickens nodes into once it has seen them run 
+        "Add": ["Add_Int", "Add_String"], 
+        "Get": ["Get_Field"], 
+        "Call": ["Call_Direct"], 
+    })
     t.defineAST("Stmt", [
         "Block:list statements", 
         "Class_Statement:Token name, Expr superclass, list methods", 
@@ -76,4 +164,32 @@ if __name__ == "__main__":
         "Return_Statement:Token keyword, Expr value", 
         "Var_Statement:Token name, Expr initializer",
         "While_Statement:Expr condition, Stmt body" 
-    ])
+    ], {
+        ## "slot" of a local declaration (None for globals) and "scope_size" -> # of slots the 
+        ## Environment of a block or of a function call needs. "first_param" is the slot of 
+        ## the first parameter: 1 in methods, which keep "this" in slot 0, 0 otherwise. 
+        ## "tail_call" is set on a "return f(...)" so the call can reuse the returning frame 
+        "Block": ["scope_size"], 
+        "Class_Statement": ["slot"], 
+        "Function_Statement": ["slot", "scope_size", "first_param"], 
+        "Return_Statement": ["tail_call"], 
+        "Var_Statement": ["slot"], 
+        ## the JIT's bookkeeping for a loop -> iterations taken so far, its specialized function 
+        ## (False once it can't be compiled) and how often it was specialized again. "end" is the 
+        ## last token of its body, which the Compiler reports "Loop body too large" at 
+        "While_Statement": ["back_edges", "specialized", "respecializations", "end"], 
+        ## a "for" loop the Resolver proved is counted -> the slot of its counter, the number 
+        ## the increment adds to it each time and the increment's statement. "counter" stays 
+        ## None for every other loop 
+        "For_Statement": ["counter", "step", "increment"], 
+    }, {
+        ## what the Parser turns a "for" loop into, so engines can spot counted ones 
+        "While_Statement": ["For_Statement"], 
+    })
+    if checking:
+        stale = [name for name in ("Expr.py", "Stmt.py") 
+                 if open(os.path.join(output_dir, name)).read() != open(os.path.join(PACKAGE_DIR, name)).read()]
+        temporary.cleanup()
+        if stale:
+            print("out of date, regenerate with \"python representing_code/GenerateAST.py\": " + ", ".join(stale)) 
+            sys.exit(1) 